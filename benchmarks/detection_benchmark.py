@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Language detection benchmark
+Runs every detection stage over labeled Odoo strings and reports accuracy,
+confusion matrices, throughput, latency and memory as JSON
+
+Usage:
+    python benchmarks/detection_benchmark.py --output before.json
+    python benchmarks/detection_benchmark.py --compare before.json
+"""
+import argparse
+import hashlib
+import json
+import logging
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / 'src'))
+
+from po_translator.utils import detector_models, language, ngram_detector  # noqa: E402
+
+DEFAULT_DATASET = Path(__file__).resolve().parent / "data" / "odoo_strings.tsv"
+# Detected language of texts a stage left open
+UNDECIDED = "none"
+# Bump when the report layout changes
+REPORT_VERSION = 1
+
+
+# ==========================================================
+# Labeled cases
+# ==========================================================
+def load_cases(path) -> List[Tuple[str, str]]:
+    """
+    Read labeled strings, one ``<language>\\t<text>`` per line ('#' starts a comment)
+
+    Returns:
+        list: (language_code, text)
+    """
+    cases = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        lang, _sep, text = line.partition("\t")
+        if text.strip():
+            cases.append((lang.strip(), text))
+    return cases
+
+
+def cases_from_po_files(paths: Iterable, msgid_language: Optional[str] = None) -> List[Tuple[str, str]]:
+    """
+    Label the translated msgstrs of PO files with their catalog language
+
+    Args:
+        paths: PO files (language from the Language header or file name)
+        msgid_language: Also label msgids with this language
+
+    Returns:
+        list: (language_code, text)
+    """
+    samples = ngram_detector.corpus_from_po_files(paths, msgid_language or "")
+    return [(lang, text) for lang, texts in sorted(samples.items()) if lang for text in texts]
+
+
+# ==========================================================
+# Measurements
+# ==========================================================
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered), max(1, math.ceil(fraction * len(ordered))))
+    return ordered[rank - 1]
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Peak resident memory of the process (includes native detector models)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def confusion_matrix(labels: Sequence[str], detected: Sequence[str]) -> Dict[str, Dict[str, int]]:
+    """
+    Count detections per expected language
+
+    Returns:
+        dict: {expected: {detected or 'none': count}}
+    """
+    matrix: Dict[str, Dict[str, int]] = {}
+    for expected, lang in zip(labels, detected):
+        row = matrix.setdefault(expected, {})
+        row[lang] = row.get(lang, 0) + 1
+    return {expected: dict(sorted(row.items())) for expected, row in sorted(matrix.items())}
+
+
+def benchmark_stage(
+    detect: Callable,
+    cases: Sequence[Tuple[str, str]],
+    expected_language: Optional[str] = None,
+    repeat: int = 3,
+    latency_samples: Optional[int] = None
+) -> Dict[str, object]:
+    """
+    Measure one detection stage
+
+    Args:
+        detect: fn(texts, expected_language) -> (language_code, confidence) or None per text
+        cases: (language_code, text) pairs
+        expected_language: Hint passed to the stage
+        repeat: Batch runs; the fastest one is reported
+        latency_samples: Texts timed one call at a time (default: all)
+
+    Returns:
+        dict: accuracy, coverage, confusion matrix, throughput, latency and memory
+    """
+    labels = [lang for lang, _text in cases]
+    texts = [text.replace("\n", " ").strip() for _lang, text in cases]
+
+    # First call loads models: timed separately
+    rss_before = peak_rss_kb()
+    started = time.perf_counter()
+    detect(texts[:1], expected_language)
+    load_seconds = time.perf_counter() - started
+
+    batch_seconds = []
+    results = []
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        results = detect(texts, expected_language)
+        batch_seconds.append(time.perf_counter() - started)
+
+    # Python allocations of one batch (tracing slows the run, so it is not timed)
+    tracemalloc.start()
+    detect(texts, expected_language)
+    _current, peak_python = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = []
+    for text in texts[:latency_samples] if latency_samples else texts:
+        started = time.perf_counter()
+        detect([text], expected_language)
+        latencies.append((time.perf_counter() - started) * 1000)
+    rss_after = peak_rss_kb()
+
+    detected = [result[0] if result else UNDECIDED for result in results]
+    decided = sum(1 for lang in detected if lang != UNDECIDED)
+    correct = sum(1 for expected, lang in zip(labels, detected) if expected == lang)
+    per_language = {}
+    for lang in sorted(set(labels)):
+        total = labels.count(lang)
+        hits = sum(1 for expected, found in zip(labels, detected) if expected == lang == found)
+        claimed = detected.count(lang)
+        per_language[lang] = {
+            "cases": total,
+            "recall": round(hits / total, 4),
+            "precision": round(hits / claimed, 4) if claimed else None,
+        }
+
+    best = min(batch_seconds)
+    return {
+        "cases": len(cases),
+        "decided": decided,
+        "correct": correct,
+        "coverage": round(decided / len(cases), 4) if cases else 0.0,
+        "accuracy": round(correct / len(cases), 4) if cases else 0.0,
+        "precision": round(correct / decided, 4) if decided else None,
+        "strings_per_second": round(len(cases) / best, 1) if best > 0 else None,
+        "batch_seconds": round(best, 6),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 4),
+            "p99": round(percentile(latencies, 0.99), 4),
+            "mean": round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+        },
+        "memory_kb": {
+            "python_peak": peak_python // 1024,
+            "rss_growth": (rss_after - rss_before) if rss_before is not None else None,
+        },
+        "load_seconds": round(load_seconds, 4),
+        "per_language": per_language,
+        "confusion": confusion_matrix(labels, detected),
+    }
+
+
+def run_benchmark(
+    cases: Sequence[Tuple[str, str]],
+    stages: Optional[Dict[str, Callable]] = None,
+    expected_language: Optional[str] = None,
+    repeat: int = 3,
+    latency_samples: Optional[int] = None,
+    dataset: str = ""
+) -> Dict[str, object]:
+    """
+    Benchmark every stage over the same cases
+
+    Args:
+        cases: (language_code, text) pairs
+        stages: {name: detector} (default: language.detection_stages())
+        expected_language: Hint passed to every stage
+        repeat: Batch runs per stage
+        latency_samples: Texts timed one call at a time per stage
+        dataset: Name recorded in the report
+
+    Returns:
+        dict: JSON-serializable report
+    """
+    if stages is None:
+        stages = language.detection_stages()
+    digest = hashlib.sha1("\n".join(f"{lang}\t{text}" for lang, text in cases).encode("utf-8")).hexdigest()
+    return {
+        "report_version": REPORT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "detector_version": language.detector_version(),
+        "expected_language": expected_language,
+        "dataset": {"name": dataset, "cases": len(cases), "sha1": digest[:12]},
+        "peak_rss_kb": peak_rss_kb(),
+        "stages": {
+            name: benchmark_stage(detect, cases, expected_language, repeat, latency_samples)
+            for name, detect in stages.items()
+        },
+    }
+
+
+# ==========================================================
+# Reports
+# ==========================================================
+def format_report(report: Dict[str, object]) -> str:
+    """Summary table of a report"""
+    lines = [
+        f"Dataset: {report['dataset']['name']} ({report['dataset']['cases']} strings)   "
+        f"Detector: {report['detector_version']}",
+        f"{'stage':<12}{'coverage':>9}{'accuracy':>9}{'precision':>10}{'str/s':>11}{'p50 ms':>9}{'p99 ms':>9}"
+        f"{'py KB':>8}",
+    ]
+    for name, stage in report["stages"].items():
+        precision = f"{stage['precision']:.1%}" if stage["precision"] is not None else "-"
+        rate = f"{stage['strings_per_second']:.0f}" if stage["strings_per_second"] else "-"
+        lines.append(
+            f"{name:<12}{stage['coverage']:>9.1%}{stage['accuracy']:>9.1%}{precision:>10}{rate:>11}"
+            f"{stage['latency_ms']['p50']:>9.3f}{stage['latency_ms']['p99']:>9.3f}"
+            f"{stage['memory_kb']['python_peak']:>8}"
+        )
+    return "\n".join(lines)
+
+
+def format_confusion(name: str, stage: Dict[str, object]) -> str:
+    """Confusion matrix of one stage (rows: expected, columns: detected)"""
+    columns = sorted({lang for row in stage["confusion"].values() for lang in row} - {UNDECIDED}) + [UNDECIDED]
+    lines = [f"{name}: expected \\ detected", "      " + "".join(f"{lang:>6}" for lang in columns)]
+    for expected, row in stage["confusion"].items():
+        lines.append(f"{expected:<6}" + "".join(f"{row.get(lang, 0):>6}" for lang in columns))
+    return "\n".join(lines)
+
+
+def compare_reports(current: Dict[str, object], baseline: Dict[str, object]) -> List[str]:
+    """
+    Differences between two reports
+
+    Returns:
+        list: One line per stage present in both reports
+    """
+    lines = []
+    if current["dataset"]["sha1"] != baseline["dataset"]["sha1"]:
+        lines.append("Warning: the reports were produced on different datasets")
+    for name, stage in current["stages"].items():
+        before = baseline["stages"].get(name)
+        if before is None:
+            lines.append(f"{name}: new stage")
+            continue
+        speed = (
+            f"{stage['strings_per_second'] / before['strings_per_second']:.2f}x"
+            if stage["strings_per_second"] and before["strings_per_second"] else "-"
+        )
+        lines.append(
+            f"{name}: accuracy {before['accuracy']:.1%} -> {stage['accuracy']:.1%}, "
+            f"coverage {before['coverage']:.1%} -> {stage['coverage']:.1%}, throughput {speed}, "
+            f"p99 {before['latency_ms']['p99']:.3f} -> {stage['latency_ms']['p99']:.3f} ms"
+        )
+    return lines
+
+
+def build_parser():
+    """Create the argument parser"""
+    parser = argparse.ArgumentParser(description="Benchmark the language detection stages")
+    parser.add_argument("--dataset", default=str(DEFAULT_DATASET),
+                        help="Labeled strings, one '<language>\\t<text>' per line")
+    parser.add_argument("--po", nargs="+", default=[], metavar="FILE",
+                        help="Also label the translated msgstrs of these PO files with their language")
+    parser.add_argument("--msgid-language", help="Also label the msgids of --po files with this language")
+    parser.add_argument("--stages", help="Comma-separated stages to run (default: all available)")
+    parser.add_argument("--expected", help="Expected language hint passed to every stage")
+    parser.add_argument("--repeat", type=int, default=3, help="Batch runs per stage (default: 3)")
+    parser.add_argument("--latency-samples", type=int, help="Strings timed one call at a time (default: all)")
+    parser.add_argument("--ngram-model", help="N-gram model file, or 'none'")
+    parser.add_argument("--fasttext-model", help="FastText model file, or 'none'")
+    parser.add_argument("--confusion", action="store_true", help="Print the confusion matrix of every stage")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Compare with a previous JSON report")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # Undecided strings are part of the measurement, not worth a warning each
+    logging.getLogger("po_translator").setLevel(logging.ERROR)
+    if args.ngram_model:
+        ngram_detector.configure_model_path(args.ngram_model)
+    if args.fasttext_model:
+        detector_models.configure_model_path(args.fasttext_model)
+    language.reset_detectors()
+
+    cases = load_cases(args.dataset)
+    if args.po:
+        cases += cases_from_po_files(args.po, args.msgid_language)
+    if not cases:
+        print("No labeled strings to benchmark", file=sys.stderr)
+        return 1
+
+    stages = language.detection_stages()
+    if args.stages:
+        wanted = [name.strip() for name in args.stages.split(",") if name.strip()]
+        unknown = [name for name in wanted if name not in stages]
+        if unknown:
+            print(f"Unavailable stages: {', '.join(unknown)} (available: {', '.join(stages)})", file=sys.stderr)
+            return 1
+        stages = {name: stages[name] for name in wanted}
+
+    report = run_benchmark(
+        cases, stages, args.expected, args.repeat, args.latency_samples,
+        dataset=Path(args.dataset).name + (f" + {len(args.po)} PO files" if args.po else ""),
+    )
+    print(format_report(report))
+    if args.confusion:
+        for name, stage in report["stages"].items():
+            print()
+            print(format_confusion(name, stage))
+    if args.compare:
+        print()
+        print("\n".join(compare_reports(report, json.loads(Path(args.compare).read_text(encoding="utf-8")))))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Merge memory benchmark
+Measures the memory a POMerger keeps after importing a set of addons (merged
+entries, module index and parsed-file cache), with and without shared
+strings, occurrences and flags.
+
+Usage:
+    python benchmarks/merge_memory_benchmark.py
+    python benchmarks/merge_memory_benchmark.py --addons odoo/addons --lang fr --output memory.json
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / 'src'))
+
+from po_translator.core.merger import POMerger  # noqa: E402
+
+# Bump when the report layout changes
+REPORT_VERSION = 1
+
+
+def synthetic_addons(directory: Path, modules: int, entries: int) -> List[Path]:
+    """
+    Write ``addons/<module>/i18n/fr.po`` catalogs the way Odoo exports them:
+    a third of the terms (field labels, buttons) recur in every addon, code
+    occurrences repeat within a module
+
+    Returns:
+        list: Paths of the written files
+    """
+    paths = []
+    for module_index in range(modules):
+        module = f"addon_{module_index}"
+        lines = [
+            '# Translation of Odoo Server.', 'msgid ""', 'msgstr ""',
+            '"Project-Id-Version: Odoo Server 17.0\\n"', '"Language: fr\\n"',
+            '"Content-Type: text/plain; charset=UTF-8\\n"', '',
+        ]
+        for index in range(entries):
+            lines.append(f"#. module: {module}")
+            if index % 3 == 0:
+                term = index % 300
+                lines += [
+                    f"#: code:addons/{module}/models/models.py:0",
+                    f"#: model:ir.model.fields,field_description:{module}.field_{module}_record__common_{term}",
+                    f'msgid "Common term {term}"', f'msgstr "Terme commun {term}"',
+                ]
+            else:
+                lines += [
+                    f"#: model:ir.model.fields,field_description:{module}.field_{module}_record__field_{index}",
+                    f'msgid "{module} label {index}"', f'msgstr "{module} libellé {index}"',
+                ]
+            if index % 5 == 0:
+                lines.insert(-2, "#, python-format")
+            lines.append('')
+        path = directory / "addons" / module / "i18n" / "fr.po"
+        path.parent.mkdir(parents=True)
+        path.write_text("\n".join(lines), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def measure(paths: Sequence[Path], share_strings: bool) -> Dict[str, object]:
+    """Memory held by a merger after importing the files"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    merger = POMerger(workers=1, share_strings=share_strings)
+    merger.merge_files([str(path) for path in paths])
+    seconds = time.perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    merged = len(merger.merged_entries)
+    return {
+        "share_strings": share_strings,
+        "entries_read": merger.merge_stats["read"],
+        "entries_merged": merged,
+        "retained_bytes": retained,
+        "peak_bytes": peak,
+        "bytes_per_merged_entry": round(retained / merged, 1) if merged else 0.0,
+        "seconds": round(seconds, 3),
+    }
+
+
+def run_benchmark(paths: Sequence[Path]) -> Dict[str, object]:
+    """
+    Import the files with and without sharing
+
+    Returns:
+        dict: JSON-serializable report
+    """
+    paths = [Path(path) for path in paths]
+    plain = measure(paths, share_strings=False)
+    shared = measure(paths, share_strings=True)
+    saved = plain["retained_bytes"] - shared["retained_bytes"]
+    return {
+        "report_version": REPORT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "files": len(paths),
+        "bytes": sum(path.stat().st_size for path in paths),
+        "runs": {"plain": plain, "shared": shared},
+        "saved_bytes": saved,
+        "saved_percent": round(100.0 * saved / plain["retained_bytes"], 1) if plain["retained_bytes"] else 0.0,
+    }
+
+
+def format_report(report: Dict[str, object]) -> str:
+    """Summary table of a report"""
+    lines = [
+        f"Files: {report['files']}  Size: {report['bytes'] / 1e6:.2f} MB",
+        f"{'run':<10}{'read':>10}{'merged':>10}{'retained MB':>14}{'peak MB':>10}{'B/entry':>10}{'seconds':>10}",
+    ]
+    for name, run in report["runs"].items():
+        lines.append(
+            f"{name:<10}{run['entries_read']:>10}{run['entries_merged']:>10}{run['retained_bytes'] / 1e6:>14.2f}"
+            f"{run['peak_bytes'] / 1e6:>10.2f}{run['bytes_per_merged_entry']:>10.0f}{run['seconds']:>10.2f}"
+        )
+    lines.append(f"Saved: {report['saved_bytes'] / 1e6:.2f} MB ({report['saved_percent']}%)")
+    return "\n".join(lines)
+
+
+def build_parser():
+    """Create the argument parser"""
+    parser = argparse.ArgumentParser(description="Measure the memory kept by a merge, with and without sharing")
+    parser.add_argument("--po", nargs="+", default=[], metavar="FILE", help="PO files to import")
+    parser.add_argument("--addons", help="Addons directory: imports <addons>/*/i18n/<lang>.po")
+    parser.add_argument("--lang", default="fr", help="Language of the catalogs under --addons (default: fr)")
+    parser.add_argument("--modules", type=int, default=40,
+                        help="Addons of the synthetic import (default: 40)")
+    parser.add_argument("--entries", type=int, default=1000,
+                        help="Entries per synthetic addon (default: 1000)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="merge_memory_benchmark_") as tmpdir:
+        paths: List[Path] = [Path(path) for path in args.po]
+        if args.addons:
+            paths += sorted(Path(args.addons).glob(f"*/i18n/{args.lang}.po"))
+        if not paths:
+            paths = synthetic_addons(Path(tmpdir), args.modules, args.entries)
+        report = run_benchmark(paths)
+    print(format_report(report))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
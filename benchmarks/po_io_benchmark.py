@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+PO reader/writer benchmark
+Measures parse and write throughput (MB/s) of polib, the streaming reader and
+the fast reader/writer, and checks that the fast round trip is byte-identical.
+'fast_unchanged' writes catalogs as read (entries copied from their source),
+'fast_rendered' catalogs built in memory (every entry laid out like polib)
+
+Usage:
+    python benchmarks/po_io_benchmark.py
+    python benchmarks/po_io_benchmark.py --po addons/*/i18n/fr.po --output po_io.json
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+import polib
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / 'src'))
+
+from po_translator.core import po_format  # noqa: E402
+from po_translator.core.po_stream import POStreamReader  # noqa: E402
+
+# Bump when the report layout changes
+REPORT_VERSION = 1
+
+
+def synthetic_catalog(path: Path, entries: int) -> Path:
+    """
+    Write an Odoo-like catalog (module comments, model occurrences, placeholders, escapes)
+
+    Returns:
+        Path of the written file
+    """
+    lines = [
+        '# Translation of Odoo Server.', '#', 'msgid ""', 'msgstr ""',
+        '"Project-Id-Version: Odoo Server 17.0\\n"', '"Language: fr\\n"',
+        '"Content-Type: text/plain; charset=UTF-8\\n"', '',
+    ]
+    for index in range(entries):
+        module = f"module_{index % 50}"
+        lines += [
+            f"#. module: {module}",
+            f"#: model:ir.model.fields,field_description:{module}.field_record__name_{index}",
+            f'msgid "Record name {index} with a %(value)s placeholder"',
+            f'msgstr "Nom de l\'enregistrement {index} avec \\"%(value)s\\""',
+            '',
+        ]
+        if index % 10 == 0:
+            lines[-1:] = [
+                'msgid ""', f'"A longer help text number {index} that is wrapped over "',
+                '"several lines, as Odoo exports them.\\n"', 'msgstr ""', '',
+            ]
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return path
+
+
+def best_time(run: Callable[[], object], repeat: int) -> float:
+    """Fastest of ``repeat`` runs, in seconds"""
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(paths: Sequence[Path], repeat: int = 3) -> Dict[str, object]:
+    """
+    Time every reader and writer over the files
+
+    Returns:
+        dict: JSON-serializable report
+    """
+    paths = [Path(path) for path in paths]
+    total_bytes = sum(path.stat().st_size for path in paths)
+    megabytes = total_bytes / 1e6
+
+    polib_files = [polib.pofile(str(path)) for path in paths]
+    catalogs = [po_format.read_po(path) for path in paths]
+    # Built in memory: no source text, every entry is rendered
+    built = [po_format.Catalog.from_polib(po_file) for po_file in polib_files]
+
+    readers = {
+        "polib": lambda: [polib.pofile(str(path)) for path in paths],
+        "stream": lambda: [list(POStreamReader(path)) for path in paths],
+        "fast": lambda: [po_format.read_po(path) for path in paths],
+        "fast_no_source": lambda: [po_format.read_po(path, keep_source=False) for path in paths],
+    }
+    writers = {
+        "polib": lambda: [str(po_file) for po_file in polib_files],
+        "fast_unchanged": lambda: [po_format.render_po(catalog) for catalog in catalogs],
+        "fast_rendered": lambda: [po_format.render_po(catalog) for catalog in built],
+    }
+    stages = {}
+    for name, run in readers.items():
+        seconds = best_time(run, repeat)
+        stages[f"read_{name}"] = {"seconds": round(seconds, 4), "mb_per_second": round(megabytes / seconds, 2)}
+    for name, run in writers.items():
+        seconds = best_time(run, repeat)
+        stages[f"write_{name}"] = {"seconds": round(seconds, 4), "mb_per_second": round(megabytes / seconds, 2)}
+
+    identical = [
+        po_format.render_po(catalog).encode(catalog.encoding) == path.read_bytes()
+        for path, catalog in zip(paths, catalogs)
+    ]
+    return {
+        "report_version": REPORT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "polib": polib.__version__,
+        "files": len(paths),
+        "bytes": total_bytes,
+        "entries": sum(len(catalog) for catalog in catalogs),
+        "round_trip_identical": all(identical),
+        "stages": stages,
+    }
+
+
+def format_report(report: Dict[str, object]) -> str:
+    """Summary table of a report"""
+    lines = [
+        f"Files: {report['files']}  Size: {report['bytes'] / 1e6:.2f} MB  Entries: {report['entries']}  "
+        f"Byte-identical round trip: {'yes' if report['round_trip_identical'] else 'NO'}",
+        f"{'stage':<22}{'seconds':>10}{'MB/s':>10}",
+    ]
+    for name, stage in report["stages"].items():
+        lines.append(f"{name:<22}{stage['seconds']:>10.3f}{stage['mb_per_second']:>10.1f}")
+    return "\n".join(lines)
+
+
+def build_parser():
+    """Create the argument parser"""
+    parser = argparse.ArgumentParser(description="Benchmark PO parsing and writing throughput")
+    parser.add_argument("--po", nargs="+", default=[], metavar="FILE",
+                        help="PO files to measure (default: a synthetic Odoo-like catalog)")
+    parser.add_argument("--entries", type=int, default=20000,
+                        help="Entries of the synthetic catalog (default: 20000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage, the fastest counts (default: 3)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="po_io_benchmark_") as tmpdir:
+        paths: List[Path] = [Path(path) for path in args.po]
+        if not paths:
+            paths = [synthetic_catalog(Path(tmpdir) / "synthetic.po", args.entries)]
+        report = run_benchmark(paths, args.repeat)
+    print(format_report(report))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nReport written to {args.output}")
+    return 0 if report["round_trip_identical"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
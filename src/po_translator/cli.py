@@ -0,0 +1,361 @@
+"""
+Command-line interface
+Unattended translation of PO files using the same rules as the GUI
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+import polib
+
+from po_translator.core.indexer import ModuleIndexer
+from po_translator.core.journal import TranslationJournal
+from po_translator.core.mo_format import compile_po_files, verify_mo
+from po_translator.core.usage import TokenBudget
+from po_translator.translator import CancelToken, Translator
+from po_translator.utils import detector_models, ngram_detector
+from po_translator.utils.language import (
+    detection_cache_stats, detection_tier_stats, detector_status, is_untranslated, reset_detectors
+)
+
+
+def build_parser():
+    """Create the argument parser"""
+    parser = argparse.ArgumentParser(prog="po-translator", description="Translate Odoo PO files")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    options = argparse.ArgumentParser(add_help=False)
+    options.add_argument("files", nargs="+", help="PO files to translate")
+    options.add_argument("--source", default="en", help="Source language code (default: en)")
+    options.add_argument("--target", default="fr", help="Target language code (default: fr)")
+    options.add_argument("--api-key", help="Gemini API key (defaults to $GEMINI_API_KEY)")
+    options.add_argument("--no-auto-detect", action="store_true", help="Disable source language auto-detection")
+    options.add_argument("--force", action="store_true", help="Retranslate entries that already have a translation")
+    options.add_argument("--include-obsolete", action="store_true", help="Also translate obsolete entries")
+    options.add_argument("--in-place", action="store_true", help="Overwrite the input files")
+    options.add_argument("--output-dir", help="Directory for translated files (default: next to the input)")
+    options.add_argument("--suffix", help="Suffix added to output file names (default: .<target>)")
+    options.add_argument("--dry-run", action="store_true", help="Validate files without translating or writing")
+    options.add_argument("--workers", type=int, default=4, help="Parallel API batches (default: 4)")
+    options.add_argument("--ndjson", action="store_true", help="Stream one JSON object per result on stdout")
+    options.add_argument("--save-every", type=int, default=0, metavar="N",
+                         help="Write partial output after every N translated entries")
+    options.add_argument("--journal-dir", help="Directory for job journals (default: ~/.po_translator/jobs)")
+    options.add_argument("--max-tokens", type=int,
+                         help="Pause each job once it used this many tokens (default: $PO_TRANSLATOR_MAX_TOKENS)")
+    options.add_argument("--max-cost", type=float,
+                         help="Pause each job once it cost this many USD (default: $PO_TRANSLATOR_MAX_COST)")
+    options.add_argument("--memory", action="append", default=[], metavar="MO_FILE",
+                         help="Compiled catalog (msgids in the source language) answering cache misses; repeatable")
+    options.add_argument("--fasttext-model", metavar="PATH",
+                         help="FastText model file, or 'none' to disable the fallback "
+                              "(default: $PO_TRANSLATOR_FASTTEXT_MODEL or ~/.po_translator/lid.176.{bin,ftz})")
+    options.add_argument("--ngram-model", metavar="PATH",
+                         help="Trained n-gram model, or 'none' to disable the n-gram tier "
+                              "(default: $PO_TRANSLATOR_NGRAM_MODEL or ~/.po_translator/ngram_model.npz)")
+
+    translate = commands.add_parser("translate", parents=[options], help="Translate one or more PO files")
+    translate.add_argument("--resume", action="store_true", help="Continue an interrupted job from its journal")
+    commands.add_parser("resume", parents=[options], help="Continue interrupted translate jobs")
+
+    compile_mo = commands.add_parser("compile", help="Compile PO files (e.g. one per language) to .mo files")
+    compile_mo.add_argument("files", nargs="+", help="PO files to compile")
+    compile_mo.add_argument("--output-dir", help="Directory for the .mo files (default: next to each PO file)")
+    compile_mo.add_argument("--workers", type=int, help="Processes compiling in parallel (default: CPU count)")
+    compile_mo.add_argument("--hash-size", type=int, metavar="SLOTS",
+                            help="Hash table slots, rounded up to a prime (default: 4/3 of the messages, "
+                                 "0 leaves the table out)")
+    compile_mo.add_argument("--ndjson", action="store_true", help="Print one JSON object per compiled file")
+
+    verify = commands.add_parser("verify-mo", help="Check .mo files and report their lookup statistics")
+    verify.add_argument("files", nargs="+", help="MO files to check")
+    verify.add_argument("--ndjson", action="store_true", help="Print one JSON object per file")
+
+    model = commands.add_parser("model", help="Manage the language detection models")
+    model.add_argument("action", choices=["status", "download", "train-ngram"],
+                       help="Show detector status, download the FastText model or train the n-gram model")
+    model.add_argument("corpus", nargs="*", help="PO files to train the n-gram model from (train-ngram)")
+    model.add_argument("--variant", choices=sorted(detector_models.MODEL_VARIANTS), default="ftz",
+                       help="Model to download: compressed 'ftz' (~1 MB) or full 'bin' (~130 MB) (default: ftz)")
+    model.add_argument("--path", help="Where to store the model (default: ~/.po_translator/)")
+    model.add_argument("--source-language", default="en", help="Language of the corpus msgids (default: en)")
+    model.add_argument("--ndjson", action="store_true", help="Print the result as JSON")
+    return parser
+
+
+def output_path(filepath, args):
+    """Resolve where a translated file is written"""
+    path = Path(filepath)
+    if args.in_place:
+        return path
+    suffix = args.suffix if args.suffix is not None else f".{args.target}"
+    directory = Path(args.output_dir) if args.output_dir else path.parent
+    return directory / f"{path.stem}{suffix}{path.suffix}"
+
+
+def emit(args, event, **data):
+    """Print a progress event (NDJSON or human-readable)"""
+    if args.ndjson:
+        print(json.dumps({"event": event, **data}, ensure_ascii=False), flush=True)
+    elif event == "file":
+        print(
+            f"{data['file']}: {data['translated']} translated, {data['skipped']} skipped, "
+            f"{data['failed']} failed" + (f" → {data['output']}" if data.get('output') else "")
+        )
+    elif event == "resume":
+        print(f"{data['file']}: resuming, {data['restored']} restored, {data['remaining']} remaining")
+    elif event == "estimate":
+        print(
+            f"{data['file']}: {data['unique']} unique texts ({data['cached']} cached), ~{data['requests']} requests, "
+            f"~{data['input_tokens'] + data['output_tokens']:,} tokens (~${data['cost']:.4f}), "
+            f"~{data['seconds']:.0f}s"
+        )
+    elif event == "cancelled":
+        print(f"{data['file']}: interrupted, partial output saved (continue with 'resume')", file=sys.stderr)
+    elif event == "paused":
+        print(f"{data['file']}: budget of {data['budget']} reached, job paused (continue with 'resume')",
+              file=sys.stderr)
+    elif event == "error":
+        print(f"Error: {data['message']}", file=sys.stderr)
+
+
+def translate_file(translator, filepath, args):
+    """Translate a single PO file, returning its result counts"""
+    po_file = polib.pofile(filepath)
+    entries = [entry for entry in po_file if args.include_obsolete or not entry.obsolete]
+    pending = [entry for entry in entries if args.force or is_untranslated(entry.msgid, entry.msgstr)]
+    counts = {"total": len(entries), "translated": 0, "skipped": 0, "failed": 0}
+
+    indexer = ModuleIndexer()
+    for entry in pending:
+        indexer.index_entry(entry.msgid, str(filepath), entry)
+
+    if args.dry_run:
+        counts["skipped"] = len(entries) - len(pending)
+        estimate = translator.estimate_job(pending, force=args.force, indexer=indexer, max_workers=args.workers)
+        emit(args, "estimate", file=str(filepath), **estimate)
+        emit(args, "file", file=str(filepath), output=None, pending=len(pending), **counts)
+        return counts
+
+    journal = TranslationJournal.for_job([filepath], args.source, args.target, args.journal_dir)
+    if args.resume and journal.is_resumable():
+        restored, pending = journal.resume(entries)
+        journal.reopen()
+        emit(args, "resume", file=str(filepath), restored=restored, remaining=len(pending))
+    else:
+        if args.resume:
+            emit(args, "resume", file=str(filepath), restored=0, remaining=len(pending))
+        journal.start(pending, files=[str(filepath)], source=args.source, target=args.target)
+
+    target = output_path(filepath, args)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    since_save = 0
+
+    def handle(result):
+        nonlocal since_save
+        counts[result.status] += 1
+        if args.ndjson:
+            emit(args, "result", file=str(filepath), **result.to_dict())
+        if result.status == "translated" and args.save_every:
+            since_save += 1
+            if since_save >= args.save_every:
+                po_file.save(str(target))
+                since_save = 0
+
+    cancel = CancelToken()
+    results = translator.iter_translate(
+        pending, force=args.force, indexer=indexer, max_workers=args.workers, journal=journal, cancel=cancel
+    )
+    try:
+        for result in results:
+            handle(result)
+    except KeyboardInterrupt:
+        # Stop dispatching and report the batches already applied
+        cancel.cancel()
+        for result in results:
+            handle(result)
+
+    counts["skipped"] += len(entries) - len(pending)
+    po_file.save(str(target))
+    if cancel.cancelled:
+        journal.close()
+        counts["cancelled"] = True
+        emit(args, "cancelled", file=str(filepath))
+    elif translator.budget_paused:
+        # Leave the journal open-ended so the job can be resumed
+        journal.close()
+        counts["paused"] = True
+        emit(args, "paused", file=str(filepath), budget=translator.budget.describe(),
+             usage=translator.usage.job_totals(translator.job_id))
+    else:
+        journal.complete()
+    emit(args, "file", file=str(filepath), output=str(target), **counts)
+    return counts
+
+
+def run_compile(args):
+    """Handle the ``compile`` command"""
+    try:
+        targets = compile_po_files(args.files, args.output_dir, args.workers, args.hash_size)
+    except (OSError, IOError, ValueError) as e:
+        emit(args, "error", message=f"Compilation failed: {e}")
+        return 1
+    for source, target in zip(args.files, targets):
+        if args.ndjson:
+            emit(args, "compiled", file=source, output=str(target))
+        else:
+            print(f"{source} → {target}")
+    return 0
+
+
+def run_verify_mo(args):
+    """Handle the ``verify-mo`` command"""
+    status = 0
+    for path in args.files:
+        try:
+            report = verify_mo(path)
+        except (OSError, ValueError) as e:
+            emit(args, "error", message=f"{path}: {e}")
+            status = 1
+            continue
+        if not report["valid"]:
+            status = 1
+        if args.ndjson:
+            emit(args, "mo", **report)
+            continue
+        if report["hash_size"]:
+            lookups = (f"hash table of {report['hash_size']} slots (load {report['load_factor']:.2f}), "
+                       f"{report['average_probes'] or 0:.2f} probes on average, {report['max_probes'] or 0} at most "
+                       f"(binary search: {report['binary_search_steps']} steps)")
+        else:
+            lookups = f"no hash table, binary search in {report['binary_search_steps']} steps"
+        print(f"{path}: {report['messages']} messages, {lookups}")
+        for error in report["errors"]:
+            print(f"  error: {error}")
+    return status
+
+
+def run_model(args):
+    """Handle the ``model`` command"""
+    if args.action == "download":
+        try:
+            path = detector_models.download_model(args.variant, args.path)
+        except (OSError, ValueError) as e:
+            emit(args, "error", message=f"Model download failed: {e}")
+            return 1
+        if args.path:
+            detector_models.configure_model_path(path)
+        reset_detectors()
+        if not args.ndjson:
+            print(f"Downloaded {path}")
+            if args.path:
+                print(f"Select it with --fasttext-model {path} or {detector_models.MODEL_ENV}={path}")
+
+    if args.action == "train-ngram":
+        if not args.corpus:
+            emit(args, "error", message="No PO files given to train the n-gram model")
+            return 1
+        if not ngram_detector.numpy_available():
+            emit(args, "error", message="NumPy is required to train the n-gram model")
+            return 1
+        try:
+            samples = ngram_detector.corpus_from_po_files(args.corpus, args.source_language)
+            detector = ngram_detector.NgramDetector.train(samples)
+            path = detector.save(args.path or ngram_detector.default_model_path())
+        except (OSError, ValueError) as e:
+            emit(args, "error", message=f"N-gram training failed: {e}")
+            return 1
+        if args.path:
+            ngram_detector.configure_model_path(path)
+        reset_detectors()
+        if not args.ndjson:
+            sizes = ", ".join(f"{lang}: {len(texts)}" for lang, texts in sorted(samples.items()))
+            print(f"Trained {path} ({sizes})")
+            if args.path:
+                print(f"Select it with --ngram-model {path} or {ngram_detector.MODEL_ENV}={path}")
+
+    status = detector_status()
+    if args.ndjson:
+        emit(args, "model", **status)
+    else:
+        print(f"Lingua:   {'ready' if status['lingua'] else 'not installed'}")
+        print(f"FastText: {status['fasttext']}" + (f" ({status['fasttext_path']})" if status['fasttext_path'] else ""))
+        print(f"N-gram:   {status['ngram']}" + (f" ({status['ngram_path']})" if status['ngram_path'] else ""))
+        if not status["available"]:
+            print("No detector available: only script, dictionary and stopword rules apply")
+    return 0
+
+
+def run_translate(args):
+    """Handle the ``translate`` command"""
+    if args.fasttext_model:
+        detector_models.configure_model_path(args.fasttext_model)
+    if args.ngram_model:
+        ngram_detector.configure_model_path(args.ngram_model)
+    translator = Translator()
+    translator.configure_languages(source=args.source, target=args.target, auto_detect=not args.no_auto_detect)
+    if args.max_tokens is not None or args.max_cost is not None:
+        translator.budget = TokenBudget(
+            args.max_tokens if args.max_tokens is not None else translator.budget.max_tokens,
+            args.max_cost if args.max_cost is not None else translator.budget.max_cost,
+        )
+
+    for path in args.memory:
+        try:
+            translator.add_translation_memory(path, from_lang=args.source)
+        except (OSError, ValueError) as e:
+            emit(args, "error", message=f"Translation memory {path}: {e}")
+            return 1
+
+    api_key = args.api_key or os.environ.get("GEMINI_API_KEY")
+    if not args.dry_run:
+        if api_key:
+            translator.set_api_key(api_key)
+        if not translator.model:
+            emit(args, "error", message="A Gemini API key is required (use --api-key or GEMINI_API_KEY)")
+            return 1
+
+    totals = {"total": 0, "translated": 0, "skipped": 0, "failed": 0}
+    exit_code = 0
+    for filepath in args.files:
+        try:
+            counts = translate_file(translator, filepath, args)
+        except (OSError, IOError, ValueError) as e:
+            emit(args, "error", file=str(filepath), message=f"{filepath}: {e}")
+            exit_code = 1
+            continue
+        for key in totals:
+            totals[key] += counts[key]
+        if counts.get("cancelled"):
+            exit_code = 130
+            break
+        if counts.get("paused"):
+            exit_code = 3
+            break
+
+    if args.ndjson:
+        emit(args, "summary", **totals, stats=translator.get_stats(), usage=translator.usage.report(),
+             detection_cache=detection_cache_stats(), detection_tiers=detection_tier_stats())
+    return exit_code
+
+
+def main(argv=None):
+    """CLI entry point"""
+    args = build_parser().parse_args(argv)
+    if args.command == "resume":
+        args.resume = True
+    if args.command in ("translate", "resume"):
+        return run_translate(args)
+    if args.command == "compile":
+        return run_compile(args)
+    if args.command == "verify-mo":
+        return run_verify_mo(args)
+    if args.command == "model":
+        return run_model(args)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
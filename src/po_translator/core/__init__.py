@@ -1,8 +1,20 @@
 """Core business logic modules"""
 
 from .merger import POMerger
+from .po_stream import POStreamReader, iter_po_entries
+from .po_format import Catalog, CatalogEntry, read_po, write_po
 from .cleaner import POCleaner
 from .indexer import ModuleIndexer
+from .journal import TranslationJournal
+from .language_analysis import (
+    EntryLanguageStatus, ProcessPoolDetector, analyze_languages, estimate_catalog_priors, iter_language_analysis
+)
+from .usage import TokenBudget, UsageLedger
 
-__all__ = ['POMerger', 'POCleaner', 'ModuleIndexer']
+__all__ = [
+    'POMerger', 'POCleaner', 'ModuleIndexer', 'TranslationJournal', 'TokenBudget', 'UsageLedger',
+    'POStreamReader', 'iter_po_entries', 'Catalog', 'CatalogEntry', 'read_po', 'write_po',
+    'EntryLanguageStatus', 'ProcessPoolDetector', 'analyze_languages', 'estimate_catalog_priors',
+    'iter_language_analysis',
+]
 
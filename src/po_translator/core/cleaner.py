@@ -9,6 +9,38 @@ class POCleaner:
     def __init__(self):
         self.seen_msgids = set()
     
+    def reset(self):
+        """Forget the msgids seen so far (start of a new merge)"""
+        self.seen_msgids.clear()
+    
+    def clean_entry(self, entry):
+        """
+        Clean a single entry, dropping it if its msgid was already seen
+        
+        Args:
+            entry: polib.POEntry object
+            
+        Returns:
+            POEntry: Cleaned entry, or None if invalid or duplicate
+        """
+        if not validate_po_entry(entry):
+            return None
+        
+        msgid = sanitize_text(entry.msgid)
+        
+        if not msgid:
+            return None
+        
+        if msgid in self.seen_msgids:
+            return None
+        
+        self.seen_msgids.add(msgid)
+        
+        entry.msgid = msgid
+        entry.msgstr = sanitize_text(entry.msgstr)
+        
+        return entry
+    
     def clean_entries(self, entries):
         """
         Clean and deduplicate list of PO entries
@@ -19,29 +51,9 @@ class POCleaner:
         Returns:
             list: Cleaned and deduplicated entries
         """
-        cleaned = []
-        self.seen_msgids.clear()
-        
-        for entry in entries:
-            if not validate_po_entry(entry):
-                continue
-            
-            msgid = sanitize_text(entry.msgid)
-            
-            if not msgid:
-                continue
-            
-            if msgid in self.seen_msgids:
-                continue
-            
-            self.seen_msgids.add(msgid)
-            
-            entry.msgid = msgid
-            entry.msgstr = sanitize_text(entry.msgstr)
-            
-            cleaned.append(entry)
-        
-        return cleaned
+        self.reset()
+        cleaned = (self.clean_entry(entry) for entry in entries)
+        return [entry for entry in cleaned if entry is not None]
     
     def merge_entries(self, entry1, entry2):
         """
@@ -52,7 +64,7 @@ class POCleaner:
             entry2: Second POEntry
             
         Returns:
-            POEntry: Merged entry (prefers non-empty msgstr)
+            POEntry: Merged entry (prefers non-empty msgstr, occurrences listed once)
         """
         if entry2.msgstr and not entry1.msgstr:
             entry1.msgstr = entry2.msgstr
@@ -63,7 +75,12 @@ class POCleaner:
         if hasattr(entry2, 'occurrences') and entry2.occurrences:
             if not hasattr(entry1, 'occurrences'):
                 entry1.occurrences = []
-            entry1.occurrences.extend(entry2.occurrences)
+            # Lists (polib) or tuples (merged CatalogEntry), so build a new sequence
+            known = set(entry1.occurrences)
+            added = [occurrence for occurrence in entry2.occurrences
+                     if occurrence not in known and not known.add(occurrence)]
+            if added:
+                entry1.occurrences = entry1.occurrences + type(entry1.occurrences)(added)
         
         return entry1
     
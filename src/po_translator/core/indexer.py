@@ -1,5 +1,10 @@
 """Module indexer for linking PO entries to their source modules"""
-from po_translator.utils.file_utils import extract_module_name
+import re
+import sys
+
+from po_translator.utils.file_utils import extract_module_name, sanitize_text
+
+_MODULE_COMMENT = re.compile(r'module:\s*(\w+)')
 
 
 class ModuleIndexer:
@@ -11,6 +16,7 @@ class ModuleIndexer:
         self.entry_to_field = {}  # Store full field path (e.g., test_module.field_sale_order__name)
         self.entry_to_occurrence = {}  # Store full occurrence string
         self.module_to_entries = {}
+        self._module_members = {}  # Sets mirroring module_to_entries, for membership tests
     
     def index_entry(self, entry_id, filepath, entry=None):
         """
@@ -21,21 +27,9 @@ class ModuleIndexer:
             filepath: Path to source .po file
             entry: POEntry object (optional, to extract module/model from metadata)
         """
-        # Try to extract module from entry comment first
-        module_name = 'unknown'
+        module_name = self.module_of(filepath, getattr(entry, 'comment', '') if entry else '')
         model_info = None
         
-        if entry and hasattr(entry, 'comment') and entry.comment:
-            # Look for "module: module_name" in comment
-            import re
-            match = re.search(r'module:\s*(\w+)', entry.comment)
-            if match:
-                module_name = match.group(1)
-        
-        # Fallback to filepath extraction
-        if module_name == 'unknown':
-            module_name = extract_module_name(filepath)
-        
         # Extract model and field information from occurrences
         if entry and hasattr(entry, 'occurrences') and entry.occurrences:
             for occ_file, occ_line in entry.occurrences:
@@ -49,7 +43,7 @@ class ModuleIndexer:
                         # Extract model (e.g., "ir.model.fields")
                         model_parts = parts[1].split(',')
                         if model_parts:
-                            model_info = model_parts[0]
+                            model_info = sys.intern(model_parts[0])
                     
                     # Extract field path if present
                     if len(parts) >= 3:
@@ -65,10 +59,30 @@ class ModuleIndexer:
         
         if module_name not in self.module_to_entries:
             self.module_to_entries[module_name] = []
+            self._module_members[module_name] = set()
         
-        if entry_id not in self.module_to_entries[module_name]:
+        if entry_id not in self._module_members[module_name]:
+            self._module_members[module_name].add(entry_id)
             self.module_to_entries[module_name].append(entry_id)
     
+    @staticmethod
+    def module_of(filepath, comment=''):
+        """
+        Module of an entry: from its "module: name" comment, else from the file path
+        
+        Args:
+            filepath: Path to source .po file
+            comment: Extracted comment of the entry
+            
+        Returns:
+            str: Module name (interned: thousands of entries share it) or 'unknown'
+        """
+        if comment:
+            match = _MODULE_COMMENT.search(comment)
+            if match:
+                return sys.intern(match.group(1))
+        return sys.intern(extract_module_name(filepath))
+    
     def get_module(self, entry_id):
         """
         Get module name for an entry
@@ -165,6 +179,37 @@ class ModuleIndexer:
         """
         return self.module_to_entries.get(module_name, [])
     
+    def group_by_module(self, entries):
+        """
+        Group PO entries by their indexed module
+
+        Args:
+            entries: Iterable of POEntry objects
+
+        Returns:
+            list: [(module_name, [entries])] in module order, unindexed
+                  entries added to the 'unknown' group
+        """
+        # Entries may come cleaned or raw: match msgids without surrounding whitespace
+        by_msgid = {}
+        for entry in entries:
+            by_msgid.setdefault(sanitize_text(entry.msgid), []).append(entry)
+
+        groups = {}
+        for module_name in self.get_all_modules():
+            group = []
+            for entry_id in self.module_to_entries[module_name]:
+                key = sanitize_text(entry_id)
+                if key in by_msgid and self.entry_to_module.get(entry_id) == module_name:
+                    group.extend(by_msgid.pop(key))
+            if group:
+                groups[module_name] = group
+
+        leftovers = [entry for group in by_msgid.values() for entry in group]
+        if leftovers:
+            groups.setdefault('unknown', []).extend(leftovers)
+        return list(groups.items())
+
     def get_all_modules(self):
         """
         Get list of all indexed modules
@@ -174,6 +219,35 @@ class ModuleIndexer:
         """
         return sorted(self.module_to_entries.keys())
     
+    def remove_entries(self, entry_ids):
+        """
+        Drop entries from the index, e.g. before re-indexing them
+        
+        Args:
+            entry_ids: Iterable of entry identifiers (msgid)
+        """
+        entry_ids = set(entry_ids)
+        if not entry_ids:
+            return
+        for entry_id in entry_ids:
+            self.entry_to_module.pop(entry_id, None)
+            self.entry_to_model.pop(entry_id, None)
+            self.entry_to_field.pop(entry_id, None)
+            self.entry_to_occurrence.pop(entry_id, None)
+        # An entry found in several modules is listed under each of them
+        for module_name in list(self.module_to_entries):
+            members = self._module_members[module_name]
+            if members.isdisjoint(entry_ids):
+                continue
+            members.difference_update(entry_ids)
+            if members:
+                self.module_to_entries[module_name] = [
+                    entry_id for entry_id in self.module_to_entries[module_name] if entry_id in members
+                ]
+            else:
+                del self.module_to_entries[module_name]
+                del self._module_members[module_name]
+    
     def clear(self):
         """Clear all indexed data"""
         self.entry_to_module.clear()
@@ -181,4 +255,5 @@ class ModuleIndexer:
         self.entry_to_field.clear()
         self.entry_to_occurrence.clear()
         self.module_to_entries.clear()
+        self._module_members.clear()
 
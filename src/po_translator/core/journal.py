@@ -0,0 +1,225 @@
+"""Append-only journal of translation job progress for crash-safe resume"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from po_translator.utils.logger import get_logger
+
+
+class TranslationJournal:
+    """Record per-entry translation outcomes in a JSON-lines file
+
+    Every outcome is appended and flushed as soon as it is known, so a job
+    interrupted by a crash, a network outage or a closed window can resume
+    from the last recorded entry instead of starting over.
+    """
+
+    # Outcomes that do not need to be redone on resume
+    COMPLETED_STATUSES = ('translated', 'skipped')
+
+    def __init__(self, path):
+        """
+        Initialize journal
+
+        Args:
+            path: Path to the .jsonl journal file
+        """
+        self.path = Path(path)
+        self.logger = get_logger('po_translator.journal')
+        self._handle = None
+
+    @staticmethod
+    def default_dir():
+        """Directory holding job journals (next to the translation cache)"""
+        return Path.home() / ".po_translator" / "jobs"
+
+    @classmethod
+    def job_id(cls, files, source, target):
+        """
+        Stable identifier for a job
+
+        Args:
+            files: Source .po file paths
+            source: Source language code
+            target: Target language code
+
+        Returns:
+            str: Hex digest identifying the file set and language pair
+        """
+        paths = sorted(os.path.abspath(str(f)) for f in files)
+        key = json.dumps([paths, source, target])
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+    @classmethod
+    def for_job(cls, files, source, target, journal_dir=None):
+        """
+        Get the journal for a file set and language pair
+
+        Args:
+            files: Source .po file paths
+            source: Source language code
+            target: Target language code
+            journal_dir: Directory for journals (optional)
+
+        Returns:
+            TranslationJournal: Journal (the file may not exist yet)
+        """
+        directory = Path(journal_dir) if journal_dir else cls.default_dir()
+        return cls(directory / f"{cls.job_id(files, source, target)}.jsonl")
+
+    @staticmethod
+    def entry_key(entry):
+        """Key identifying an entry across runs"""
+        return entry.msgid, getattr(entry, 'msgctxt', None) or None
+
+    # ------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------
+    def start(self, entries, **info):
+        """
+        Start a new job, discarding any previous journal
+
+        Args:
+            entries: Entries the job will translate
+            **info: Extra job details stored in the header (files, languages...)
+        """
+        self.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = open(self.path, 'w', encoding='utf-8')
+        self._write({
+            'event': 'start',
+            'time': time.time(),
+            'entries': [list(self.entry_key(entry)) for entry in entries],
+            **info,
+        })
+
+    def reopen(self):
+        """Continue appending to an existing journal"""
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = open(self.path, 'a', encoding='utf-8')
+
+    def record(self, result):
+        """
+        Append the outcome of one entry
+
+        Args:
+            result: TranslationResult
+        """
+        if self._handle is None:
+            self.reopen()
+        self._write({'event': 'entry', **result.to_dict()})
+
+    def record_usage(self, usage):
+        """
+        Append the job's cumulative token usage
+
+        Args:
+            usage: Usage dict as returned by UsageLedger.job_totals()
+        """
+        if self._handle is None:
+            self.reopen()
+        self._write({'event': 'usage', **usage})
+
+    def complete(self):
+        """Mark the job as finished"""
+        if self._handle is None:
+            self.reopen()
+        self._write({'event': 'complete', 'time': time.time()})
+        self.close()
+
+    def close(self):
+        """Close the journal file"""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def discard(self):
+        """Delete the journal"""
+        self.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _write(self, record):
+        self._handle.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._handle.flush()
+
+    # ------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------
+    def read(self):
+        """
+        Read the journal
+
+        Returns:
+            dict: {
+                'header': start record or None,
+                'outcomes': {(msgid, msgctxt): last entry record},
+                'usage': last cumulative usage record or None,
+                'complete': bool
+            }
+        """
+        state = {'header': None, 'outcomes': {}, 'usage': None, 'complete': False}
+        if not self.path.exists():
+            return state
+
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A crash can leave a truncated last line
+                    self.logger.debug(f"Ignoring unreadable journal line in {self.path}")
+                    continue
+                event = record.get('event')
+                if event == 'start':
+                    state['header'] = record
+                elif event == 'entry':
+                    state['outcomes'][(record['msgid'], record.get('msgctxt'))] = record
+                elif event == 'usage':
+                    state['usage'] = {k: v for k, v in record.items() if k != 'event'}
+                elif event == 'complete':
+                    state['complete'] = True
+        return state
+
+    def is_resumable(self):
+        """Check whether an unfinished job is recorded"""
+        state = self.read()
+        return state['header'] is not None and not state['complete']
+
+    def resume(self, entries):
+        """
+        Restore recorded translations and find the entries still to do
+
+        Args:
+            entries: Currently loaded entries
+
+        Returns:
+            tuple: (restored_count, remaining_entries) where remaining entries
+                   are the job's entries without a completed outcome
+        """
+        state = self.read()
+        header = state['header'] or {}
+        job_keys = {tuple(key) for key in header.get('entries', [])}
+
+        restored = 0
+        remaining = []
+        for entry in entries:
+            key = self.entry_key(entry)
+            if job_keys and key not in job_keys:
+                continue
+            outcome = state['outcomes'].get(key)
+            if outcome and outcome.get('status') in self.COMPLETED_STATUSES:
+                if outcome.get('status') == 'translated' and outcome.get('translation'):
+                    if entry.msgstr != outcome['translation']:
+                        entry.msgstr = outcome['translation']
+                        restored += 1
+                continue
+            remaining.append(entry)
+
+        self.logger.info(f"Resuming job {self.path.stem}: restored {restored}, {len(remaining)} remaining")
+        return restored, remaining
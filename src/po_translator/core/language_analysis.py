@@ -0,0 +1,366 @@
+"""
+Catalog language analysis
+Detects every string of a catalog once, then derives the context-aware
+decisions from a sliding window over the file order
+"""
+import concurrent.futures
+import multiprocessing
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from po_translator.utils import detector_models, ngram_detector
+from po_translator.utils.language import (
+    CONTEXT_SKIP_CONFIDENCE,
+    combine_context_votes,
+    configure_detection_cache,
+    detect_languages,
+    detect_uncached,
+    detector_version,
+    estimate_language_prior,
+    glossary_terms,
+    is_untranslated,
+    register_glossary_terms,
+    warm_up_detectors,
+)
+
+# Entries before/after an entry whose msgids form its context
+CONTEXT_BEFORE = 3
+CONTEXT_AFTER = 3
+# Neighbours voting on a msgid, and on a msgstr (next to its own msgid)
+SOURCE_CONTEXT_SIZE = 5
+TRANSLATION_CONTEXT_SIZE = 4
+
+# Texts per task sent to a detection worker process
+SHARD_SIZE = 250
+
+
+@dataclass(frozen=True)
+class EntryLanguageStatus:
+    """Language analysis for a PO entry."""
+
+    source_lang: Optional[str]
+    source_confidence: float
+    translation_lang: Optional[str]
+    translation_confidence: float
+    source_matches: Optional[bool]
+    translation_matches: Optional[bool]
+    missing_translation: bool
+
+
+def _has_text(text) -> bool:
+    return bool(text and text.strip())
+
+
+def iter_context_windows(catalog: Sequence) -> Iterator[Tuple[int, List[int]]]:
+    """
+    Walk a catalog once, maintaining the window of neighbouring msgids
+
+    Args:
+        catalog: Entries in file order
+
+    Yields:
+        (index, neighbour indexes) where neighbours are the entries with a
+        non-empty msgid in [index - 3, index + 3], excluding the entry itself,
+        capped at SOURCE_CONTEXT_SIZE
+    """
+    window = deque()
+    next_index = 0
+    for index in range(len(catalog)):
+        # Slide the window: admit entries up to index + CONTEXT_AFTER ...
+        while next_index < min(len(catalog), index + CONTEXT_AFTER + 1):
+            if _has_text(catalog[next_index].msgid):
+                window.append(next_index)
+            next_index += 1
+        # ... and drop those before index - CONTEXT_BEFORE
+        while window and window[0] < index - CONTEXT_BEFORE:
+            window.popleft()
+        yield index, [position for position in window if position != index][:SOURCE_CONTEXT_SIZE]
+
+
+def estimate_catalog_priors(catalog: Sequence) -> Tuple[Optional[Dict[str, float]], Optional[Dict[str, float]]]:
+    """
+    Language distributions of a catalog's msgids and translated msgstrs
+
+    Args:
+        catalog: Entries of the imported files
+
+    Returns:
+        (source_prior, target_prior) as returned by estimate_language_prior()
+    """
+    source_prior = estimate_language_prior([entry.msgid for entry in catalog])
+    target_prior = estimate_language_prior([
+        entry.msgstr for entry in catalog if not is_untranslated(entry.msgid, entry.msgstr)
+    ])
+    return source_prior, target_prior
+
+
+def analyze_languages(
+    entries: Iterable,
+    expected_source: str,
+    expected_target: str,
+    catalog: Optional[Sequence] = None,
+    source_prior: Optional[Dict[str, float]] = None,
+    target_prior: Optional[Dict[str, float]] = None,
+    backend: Optional[Callable] = None,
+) -> List[EntryLanguageStatus]:
+    """
+    Analyze the languages of entries in one pass
+
+    Decisions are the same as running detect_language_with_context() on every
+    msgid (with up to 5 neighbouring msgids as context) and msgstr (with its
+    msgid and up to 4 neighbours), but every distinct string is detected once
+    and all detections go through a few batch calls.
+
+    Args:
+        entries: Entries to analyze
+        expected_source: Expected msgid language
+        expected_target: Expected msgstr language
+        catalog: Full file-ordered entry list providing the context
+                 (default: the analyzed entries)
+        source_prior: Catalog prior applied to detections made with expected_source
+        target_prior: Catalog prior applied to detections made with expected_target
+        backend: Detection backend for uncached strings (e.g. ProcessPoolDetector)
+
+    Returns:
+        list: EntryLanguageStatus per entry, in input order
+    """
+    entries = list(entries)
+    catalog = entries if catalog is None else catalog
+    if not entries:
+        return []
+
+    positions = {id(entry): index for index, entry in enumerate(catalog)}
+    wanted = {positions[id(entry)] for entry in entries if id(entry) in positions}
+    neighbours: Dict[int, List[int]] = {
+        index: window for index, window in iter_context_windows(catalog) if index in wanted
+    }
+
+    msgids = [(entry.msgid or "").strip() for entry in entries]
+    msgstrs = [(entry.msgstr or "").strip() for entry in entries]
+    missing = [is_untranslated(entry.msgid, entry.msgstr) for entry in entries]
+    translated = [not miss and bool(msgstr) for miss, msgstr in zip(missing, msgstrs)]
+    contexts = [neighbours.get(positions.get(id(entry)), []) for entry in entries]
+
+    # Pass 1: every msgid and msgstr once
+    sources = detect_languages(msgids, expected_language=expected_source, prior=source_prior, backend=backend)
+    translations = detect_languages(
+        [msgstr if ok else "" for msgstr, ok in zip(msgstrs, translated)],
+        expected_language=expected_target,
+        prior=target_prior,
+        backend=backend,
+    )
+
+    # Pass 2: context strings of the weak detections only
+    def weak(text, result):
+        return _has_text(text) and result[1] < CONTEXT_SKIP_CONFIDENCE
+
+    source_context_texts = {
+        catalog[position].msgid
+        for text, result, window in zip(msgids, sources, contexts) if weak(text, result)
+        for position in window
+    }
+    translation_context_texts = set()
+    for msgid, msgstr, result, ok, window in zip(msgids, msgstrs, translations, translated, contexts):
+        if ok and weak(msgstr, result):
+            translation_context_texts.add(msgid)
+            translation_context_texts.update(catalog[position].msgid for position in window[:TRANSLATION_CONTEXT_SIZE])
+
+    def detect_all(texts, expected, prior):
+        texts = list(texts)
+        return dict(zip(texts, detect_languages(texts, expected_language=expected, prior=prior, backend=backend)))
+
+    source_votes = detect_all(source_context_texts, expected_source, source_prior)
+    translation_votes = detect_all(translation_context_texts, expected_target, target_prior)
+
+    statuses = []
+    for index, entry in enumerate(entries):
+        window = contexts[index]
+        src_lang, src_conf = sources[index]
+        if weak(msgids[index], sources[index]) and window:
+            src_lang, src_conf = combine_context_votes(
+                sources[index], [source_votes[catalog[position].msgid] for position in window]
+            )
+
+        trans_lang, trans_conf = (None, 0.0)
+        if translated[index]:
+            trans_lang, trans_conf = translations[index]
+            if weak(msgstrs[index], translations[index]):
+                context_texts = [msgids[index]] + [
+                    catalog[position].msgid for position in window[:TRANSLATION_CONTEXT_SIZE]
+                ]
+                trans_lang, trans_conf = combine_context_votes(
+                    translations[index],
+                    [translation_votes[text] for text in context_texts if _has_text(text)],
+                )
+
+        if missing[index]:
+            translation_matches = None
+        elif trans_lang:
+            translation_matches = trans_lang == expected_target
+        else:
+            translation_matches = False
+
+        statuses.append(EntryLanguageStatus(
+            source_lang=src_lang,
+            source_confidence=src_conf,
+            translation_lang=trans_lang,
+            translation_confidence=trans_conf,
+            source_matches=(src_lang == expected_source) if src_lang else None,
+            translation_matches=translation_matches,
+            missing_translation=missing[index],
+        ))
+    return statuses
+
+
+def iter_language_analysis(
+    entries: Iterable,
+    expected_source: str,
+    expected_target: str,
+    catalog: Optional[Sequence] = None,
+    source_prior: Optional[Dict[str, float]] = None,
+    target_prior: Optional[Dict[str, float]] = None,
+    backend: Optional[Callable] = None,
+    block_size: int = 2000,
+) -> Iterator[Tuple[List, List[EntryLanguageStatus]]]:
+    """
+    Analyze entries block by block so results can be shown as they arrive
+
+    Context still comes from the whole catalog, so decisions match a single
+    analyze_languages() call.
+
+    Args:
+        entries: Entries to analyze, in the order results are wanted
+        expected_source: Expected msgid language
+        expected_target: Expected msgstr language
+        catalog: Full file-ordered entry list providing the context
+        source_prior: Catalog prior for msgid detections
+        target_prior: Catalog prior for msgstr detections
+        backend: Detection backend for uncached strings
+        block_size: Entries per yielded block
+
+    Yields:
+        (block entries, EntryLanguageStatus list)
+    """
+    entries = list(entries)
+    catalog = entries if catalog is None else catalog
+    for start in range(0, len(entries), max(1, block_size)):
+        block = entries[start:start + block_size]
+        yield block, analyze_languages(
+            block, expected_source, expected_target, catalog=catalog,
+            source_prior=source_prior, target_prior=target_prior, backend=backend,
+        )
+
+
+# ==========================================================
+# Process pool detection backend
+# ==========================================================
+def _init_detection_worker(model_setting: Optional[str] = None, ngram_setting: Optional[str] = None,
+                           terms: Optional[Dict[str, List[str]]] = None):
+    # One detector thread per process: the pool provides the parallelism
+    os.environ.setdefault("RAYON_NUM_THREADS", "1")
+    # Results are cached by the parent process only
+    configure_detection_cache(enabled=False)
+    if model_setting is not None:
+        detector_models.configure_model_path(model_setting)
+    if ngram_setting is not None:
+        ngram_detector.configure_model_path(ngram_setting)
+    # Spawned workers start with the built-in dictionaries only: add the parent's glossary terms
+    for lang, lang_terms in (terms or {}).items():
+        register_glossary_terms(lang, lang_terms)
+    # FastText is a fallback: each worker loads its own copy only when Lingua leaves texts open
+    warm_up_detectors(background=False, include_fasttext=False)
+
+
+def _detect_shard(texts: List[str], expected_language: Optional[str]) -> List[Tuple[Optional[str], float]]:
+    return detect_uncached(texts, expected_language)
+
+
+class ProcessPoolDetector:
+    """Detection backend sharding texts across worker processes"""
+
+    def __init__(self, workers: Optional[int] = None, shard_size: int = SHARD_SIZE,
+                 on_progress: Optional[Callable[[int, int], None]] = None):
+        """
+        Initialize detector
+
+        Args:
+            workers: Worker processes (default: one per CPU core)
+            shard_size: Texts per worker task; smaller inputs are detected in-process
+            on_progress: Called with (texts done, texts total) as shards complete
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.shard_size = max(1, shard_size)
+        self.on_progress = on_progress
+        self._executor = None
+        self._executor_version = None
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        """Texts keeping every worker busy for one round"""
+        return self.workers * self.shard_size
+
+    def _get_executor(self):
+        version = detector_version()
+        with self._lock:
+            if self._executor is not None and self._executor_version != version:
+                # Glossary terms or models changed since the workers started: their
+                # results would not match the version they are cached under
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            if self._executor is None:
+                # Spawned workers: forking a process running Tk and worker threads is unsafe
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_detection_worker,
+                    initargs=(detector_models.configured_model_setting(),
+                              ngram_detector.configured_model_setting(),
+                              glossary_terms()),
+                )
+                self._executor_version = version
+            return self._executor
+
+    def __call__(self, texts: List[str], expected_language: Optional[str] = None) -> List[Tuple[Optional[str], float]]:
+        """
+        Detect texts, in parallel when there is more than one shard
+
+        Args:
+            texts: Texts to detect
+            expected_language: Expected language as hint for tiebreaking
+
+        Returns:
+            list: (language_code, confidence) per input text, in input order
+        """
+        texts = list(texts)
+        if self.workers == 1 or len(texts) <= self.shard_size:
+            results = detect_uncached(texts, expected_language)
+            if self.on_progress and texts:
+                self.on_progress(len(texts), len(texts))
+            return results
+
+        executor = self._get_executor()
+        futures = {
+            executor.submit(_detect_shard, texts[start:start + self.shard_size], expected_language): start
+            for start in range(0, len(texts), self.shard_size)
+        }
+        results: List[Tuple[Optional[str], float]] = [(None, 0.0)] * len(texts)
+        done = 0
+        for future in concurrent.futures.as_completed(futures):
+            start = futures[future]
+            shard = future.result()
+            results[start:start + len(shard)] = shard
+            done += len(shard)
+            if self.on_progress:
+                self.on_progress(done, len(texts))
+        return results
+
+    def close(self) -> None:
+        """Stop the worker processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -1,19 +1,217 @@
 """PO file merger for combining multiple .po files"""
+import concurrent.futures
+import hashlib
+import multiprocessing
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
 import polib
 from po_translator.core.cleaner import POCleaner
 from po_translator.core.indexer import ModuleIndexer
+from po_translator.core.mo_format import MOCatalog, compile_po_file, write_mo
+from po_translator.core.po_format import Catalog, CatalogEntry, CatalogReader, write_po
+from po_translator.core.po_stream import entry_to_tuple
+from po_translator.utils.file_utils import extract_module_name, sanitize_text
 from po_translator.utils.logger import get_logger
 
+# Below this many bytes in total, starting worker processes costs more than it saves
+PARALLEL_MIN_BYTES = 4 << 20
+
+# Flag combinations seen so far (a handful: python-format, fuzzy, ...)
+_SHARED_FLAGS = {}
+
+# Metadata of exports when no merged file had any
+DEFAULT_METADATA = {
+    'Project-Id-Version': 'Odoo Server 17.0',
+    'Report-Msgid-Bugs-To': '',
+    'POT-Creation-Date': '',
+    'PO-Revision-Date': '',
+    'Language-Team': '',
+    'MIME-Version': '1.0',
+    'Content-Type': 'text/plain; charset=UTF-8',
+    'Content-Transfer-Encoding': '',
+    'Plural-Forms': '',
+    'Language': 'fr',
+}
+
+# "#. module: sale" (or "#. modules: sale, stock" in multi-module exports)
+_MODULE_COMMENT = re.compile(r'^modules?:.*$', re.MULTILINE)
+
+
+def _file_fingerprint(filepath, previous=None):
+    """
+    Fingerprint a file as (mtime_ns, size, sha1 of the content)
+    
+    The content is only hashed again when the modification time or size
+    differ from ``previous``.
+    
+    Returns:
+        tuple: Fingerprint, or None if the file cannot be read
+    """
+    try:
+        stat = os.stat(filepath)
+        if previous and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+            return previous
+        digest = hashlib.sha1()
+        with open(filepath, 'rb') as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b''):
+                digest.update(chunk)
+        return stat.st_mtime_ns, stat.st_size, digest.hexdigest()
+    except OSError:
+        return None
+
+
+def _share_row(row, shared, merged=None):
+    """
+    Point the repeated parts of a packed entry to one shared instance
+    
+    Module comments and flags repeat across addons and are interned. Code
+    occurrences repeat within a file: ``shared`` (one dict per file, so
+    unique model occurrences cost nothing once the file is read) maps each
+    occurrence to its first instance. An msgid already in ``merged`` (the
+    same term in another addon) reuses the strings of the merged entry; other
+    msgids and translations are mostly unique and left alone. The line
+    number, unused once merged, is dropped.
+    
+    Returns:
+        tuple: Equal row, without line number
+    """
+    msgid, msgstr = row[:2]
+    winner = merged.get(msgid) if merged else None
+    if winner is not None:
+        msgid = winner.msgid
+        if winner.msgstr == msgstr:
+            msgstr = winner.msgstr
+    occurrences, flags, comment = row[5:8]
+    if occurrences:
+        occurrences = tuple([shared.setdefault(occurrence, occurrence) for occurrence in occurrences])
+    if flags:
+        flags = _SHARED_FLAGS.get(flags) or _SHARED_FLAGS.setdefault(flags, tuple(map(sys.intern, flags)))
+    return (msgid, msgstr) + row[2:5] + (occurrences, flags, sys.intern(comment)) + row[8:13] + (None,)
+
+
+def _open_catalog(filepath, on_progress=None):
+    """Entry reader of a PO file, or of a compiled .mo catalog (memory-mapped)"""
+    if str(filepath).lower().endswith('.mo'):
+        return MOCatalog(filepath, on_progress=on_progress)
+    return CatalogReader(filepath, on_progress=on_progress)
+
+
+def _occurrence_module(occurrence):
+    """Module an occurrence belongs to (code:addons/<module>/..., model:...:<module>.<xmlid>), or None"""
+    match = re.search(r'addons/([^/]+)/', occurrence)
+    if match:
+        return match.group(1)
+    if occurrence.startswith(('model:', 'model_terms:')):
+        xmlid = occurrence.rsplit(':', 1)[-1]
+        if '.' in xmlid:
+            return xmlid.split('.', 1)[0]
+    return None
+
+
+def _module_entry(entry, module, row=None):
+    """
+    Copy of a merged entry for one module's file
+    
+    The translation comes from the merged entry. Comments and occurrences
+    come from ``row``, the entry as the module's own file had it; without one,
+    the merged occurrences are narrowed to those of the module (all of them
+    when none can be told apart) and the module comment names this module.
+    
+    Returns:
+        CatalogEntry
+    """
+    if row is not None:
+        occurrences, comment, tcomment = list(row[5]), row[7], row[8]
+    else:
+        occurrences = [occurrence for occurrence in entry.occurrences
+                       if _occurrence_module(occurrence[0]) in (module, None)] or list(entry.occurrences)
+        comment = _MODULE_COMMENT.sub(f'module: {module}', entry.comment) if entry.comment else entry.comment
+        tcomment = entry.tcomment
+    return CatalogEntry(
+        msgid=entry.msgid, msgstr=entry.msgstr, msgctxt=entry.msgctxt, msgid_plural=entry.msgid_plural,
+        msgstr_plural=dict(entry.msgstr_plural), occurrences=occurrences, flags=list(entry.flags),
+        comment=comment, tcomment=tcomment, obsolete=entry.obsolete, previous_msgid=entry.previous_msgid,
+        previous_msgctxt=entry.previous_msgctxt, previous_msgid_plural=entry.previous_msgid_plural,
+    )
+
+
+def _parse_file(filepath, share_strings=False):
+    """
+    Parse one PO file, possibly in a worker process
+    
+    Returns:
+        tuple: (fingerprint, metadata, header, packed non-obsolete entries, error message or None)
+    """
+    # Taken before reading: a concurrent edit makes the next refresh parse again
+    fingerprint = _file_fingerprint(filepath)
+    metadata, header, rows = {}, '', []
+    try:
+        reader = _open_catalog(filepath)
+        rows = [entry_to_tuple(entry) for entry in reader if not entry.obsolete]
+        if share_strings:
+            # Shared objects are pickled once
+            shared = {}
+            rows = [_share_row(row, shared) for row in rows]
+        metadata, header = reader.metadata, reader.header
+        return fingerprint, metadata, header, rows, None
+    except Exception as e:
+        # Entries read before the error are kept, as in a sequential merge
+        return fingerprint, metadata, header, rows, str(e)
+
+
+@dataclass
+class _ParsedFile:
+    """What is kept of one parsed file, reused while the file is unchanged"""
+    fingerprint: Optional[tuple]  # None when parsing failed: never reused
+    metadata: dict = field(default_factory=dict)
+    header: str = ''
+    rows: Optional[list] = None  # Packed non-obsolete entries in file order, with POMerger(keep_rows=True)
+    row_count: int = 0  # Non-obsolete entries
+    keyed_count: int = 0  # Non-obsolete entries with a non-empty msgid
+    keys: dict = field(default_factory=dict)  # Cleaned msgid -> signature of the file's entries with it
+    
+    def add_row(self, row):
+        """Count a packed entry and fold it into the signature of its msgid"""
+        self.row_count += 1
+        key = sanitize_text(row[0])
+        if key:
+            self.keyed_count += 1
+            # Line numbers move with any edit above the entry
+            self.keys[key] = hash((self.keys.get(key), row[:-1]))
+        if self.rows is not None:
+            self.rows.append(row)
+
 
 class POMerger:
     """Merge multiple PO files into one"""
     
-    def __init__(self):
+    def __init__(self, workers=None, share_strings=True, keep_rows=False):
+        """
+        Initialize merger
+        
+        Args:
+            workers: Processes parsing files in parallel (default: CPU count, 1 disables)
+            share_strings: Intern repeated strings and share repeated occurrences/flags
+                           (disable only to measure the savings)
+            keep_rows: Keep the entries of every parsed file, so merging unchanged files
+                       again does not read them (memory grows with the files); by
+                       default only a summary is kept and files are read again when needed
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.share_strings = share_strings
+        self.keep_rows = keep_rows
         self.cleaner = POCleaner()
         self.indexer = ModuleIndexer()
         self.merged_entries = {}
+        self.loaded_files = []  # Paths of the last merge, identifies translation jobs
         self.original_metadata = None  # Store original file metadata
         self.original_header = None  # Store original file header comment
+        self.merge_stats = {'read': 0, 'cleaned': 0, 'duplicates': 0}
+        self._file_cache = {}  # Path -> _ParsedFile of the files parsed so far
         self.logger = get_logger('po_translator.merger')
     
     def load_po_file(self, filepath):
@@ -31,15 +229,7 @@ class POMerger:
             po_file = polib.pofile(filepath)
             self.logger.debug(f"  Loaded {len(po_file)} entries from {filepath}")
             
-            # Preserve metadata from first file
-            if self.original_metadata is None and po_file.metadata:
-                self.original_metadata = dict(po_file.metadata)
-                self.logger.debug(f"  Preserved metadata: {len(self.original_metadata)} fields")
-            
-            # Preserve header comment from first file
-            if self.original_header is None and po_file.header:
-                self.original_header = po_file.header
-                self.logger.debug(f"  Preserved header comment")
+            self._preserve_metadata(po_file.metadata, po_file.header)
             
             return po_file
         except Exception as e:
@@ -47,65 +237,388 @@ class POMerger:
             print(f"Error loading {filepath}: {e}")
             return None
     
-    def merge_files(self, filepaths):
+    def _preserve_metadata(self, metadata, header):
+        """Keep the metadata and header comment of the first file that has them"""
+        if self.original_metadata is None and metadata:
+            self.original_metadata = dict(metadata)
+            self.logger.debug(f"  Preserved metadata: {len(self.original_metadata)} fields")
+        
+        if self.original_header is None and header:
+            self.original_header = header
+            self.logger.debug(f"  Preserved header comment")
+    
+    def iter_merge_files(self, filepaths, on_progress=None):
         """
-        Merge multiple PO files
+        Merge multiple PO files, streaming them entry by entry
+        
+        Each entry is indexed, cleaned and merged as soon as it is read, and
+        yielded if it is new. Merged entries are CatalogEntry objects. A single
+        file, or a small set, is read in blocks of lines and parsed entry by
+        entry in this process; larger sets are parsed by a process pool (one
+        file per task) and merged here in file order, so the result
+        is the same either way. Files unchanged since they were last parsed
+        by this merger are not parsed again.
         
         Args:
-            filepaths: List of paths to .po files
+            filepaths: List of paths to .po files (or compiled .mo catalogs)
+            on_progress: Optional callback(bytes_done, total_bytes) over all files
             
-        Returns:
-            dict: Dictionary of merged entries {msgid: POEntry}
+        Yields:
+            CatalogEntry: Each new unique entry, in merge order
         """
         self.logger.info(f"Starting merge of {len(filepaths)} files")
         self.merged_entries.clear()
         self.indexer.clear()
+        self.cleaner.reset()
+        self.loaded_files = list(filepaths)
+        self.original_metadata = None
+        self.original_header = None
+        self.merge_stats = {'read': 0, 'cleaned': 0, 'duplicates': 0}
         
-        all_entries = []
-        
-        for filepath in filepaths:
-            po_file = self.load_po_file(filepath)
-            if not po_file:
-                continue
-            
+        for filepath, rows in self._iter_file_entries(list(filepaths), on_progress):
             entry_count = 0
-            for entry in po_file:
-                if entry.obsolete:
-                    continue
+            for row in rows:
+                entry = CatalogEntry.from_row(row)
                 
-                # Pass entry object to extract module from comment
-                self.indexer.index_entry(entry.msgid, filepath, entry)
-                all_entries.append(entry)
+                # Pass entry object to extract module from comment; indexed
+                # under the msgid the entry is merged with
+                self.indexer.index_entry(sanitize_text(entry.msgid), filepath, entry)
                 entry_count += 1
+                
+                merged = self._merge_entry(entry)
+                if merged is not None:
+                    yield merged
             
             self.logger.debug(f"  Added {entry_count} entries from {filepath}")
         
-        self.logger.info(f"Total entries before cleaning: {len(all_entries)}")
-        cleaned_entries = self.cleaner.clean_entries(all_entries)
-        self.logger.info(f"Total entries after cleaning: {len(cleaned_entries)}")
+        stats = self.merge_stats
+        self.logger.info(f"Total entries before cleaning: {stats['read']}")
+        self.logger.info(f"Total entries after cleaning: {stats['cleaned']}")
+        self.logger.info(
+            f"Merged entries: {len(self.merged_entries)} unique (removed {stats['duplicates']} duplicates)"
+        )
+    
+    def _iter_file_entries(self, filepaths, on_progress=None):
+        """Yield (filepath, packed non-obsolete entries) per file in order, parsing only files not cached"""
+        sizes = [os.path.getsize(path) if os.path.isfile(path) else 0 for path in filepaths]
+        total_bytes = sum(sizes)
+        # Without their entries, unchanged files are read again
+        records = [self._cached_record(path) if self.keep_rows else None for path in filepaths]
+        stale = [path for path, record in zip(filepaths, records) if record is None]
+        if len(stale) < len(filepaths):
+            self.logger.info(f"Reusing {len(filepaths) - len(stale)} unchanged files")
         
-        duplicates = 0
-        for entry in cleaned_entries:
-            msgid = entry.msgid
-            
-            if msgid in self.merged_entries:
-                self.merged_entries[msgid] = self.cleaner.merge_entries(
-                    self.merged_entries[msgid], 
-                    entry
-                )
-                duplicates += 1
-            else:
-                self.merged_entries[msgid] = entry
+        workers = self._pool_workers(stale)
+        parsed = self._parse_files(stale, workers) if workers > 1 else None
+        try:
+            done_bytes = 0
+            for filepath, size, record in zip(filepaths, sizes, records):
+                self.logger.info(f"Loading PO file: {filepath}")
+                error = None
+                rows = record.rows if record is not None else None
+                if record is None and parsed is not None:
+                    _path, record, rows, error = next(parsed)
+                
+                if record is None:
+                    progress = None
+                    if on_progress:
+                        progress = lambda read, _size, base=done_bytes: on_progress(base + read, total_bytes)
+                    yield filepath, self._stream_file(filepath, progress)
+                else:
+                    self._preserve_metadata(record.metadata, record.header)
+                    yield filepath, rows
+                    if error:
+                        self._report_load_error(filepath, error)
+                    if on_progress:
+                        on_progress(done_bytes + size, total_bytes)
+                done_bytes += size
+        finally:
+            if parsed is not None:
+                parsed.close()
+    
+    def _pool_workers(self, filepaths):
+        """Number of processes worth parsing these files with (1: parse in process)"""
+        workers = min(self.workers, len(filepaths))
+        if workers > 1 and sum(os.path.getsize(path) for path in filepaths if os.path.isfile(path)) >= PARALLEL_MIN_BYTES:
+            return workers
+        return 1
+    
+    def _parse_files(self, filepaths, workers):
+        """Parse and cache files, yielding (filepath, record, packed entries, error) in file order"""
+        if workers <= 1:
+            for filepath in filepaths:
+                yield (filepath, *self._store_parsed(filepath, _parse_file(filepath)))
+            return
+        
+        self.logger.info(f"Parsing {len(filepaths)} files with {workers} processes")
+        # Spawned workers: forking a process running Tk and worker threads is unsafe
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = [executor.submit(_parse_file, path, self.share_strings) for path in filepaths]
+            for index, filepath in enumerate(filepaths):
+                try:
+                    result = futures[index].result()
+                except concurrent.futures.process.BrokenProcessPool as e:
+                    self.logger.warning(f"Worker process failed ({e}), parsing {filepath} in process")
+                    result = _parse_file(filepath)
+                futures[index] = None
+                yield (filepath, *self._store_parsed(filepath, result))
+    
+    def _store_parsed(self, filepath, result):
+        """Cache the result of _parse_file, returning (record, packed entries, error)"""
+        fingerprint, metadata, header, rows, error = result
+        if self.share_strings:
+            # Comments and flags unpickled from a worker are interned again here
+            shared = {}
+            rows = [_share_row(row, shared, self.merged_entries) for row in rows]
+        record = _ParsedFile(None if error else fingerprint, metadata, header, [] if self.keep_rows else None)
+        for row in rows:
+            record.add_row(row)
+        self._file_cache[filepath] = record
+        return record, rows, error
+    
+    def _cached_record(self, filepath):
+        """Cached parse of a file if its content is unchanged, else None"""
+        record = self._file_cache.get(filepath)
+        if record is None or record.fingerprint is None:
+            return None
+        fingerprint = _file_fingerprint(filepath, record.fingerprint)
+        # Touched but identical files only cost a hash
+        if fingerprint is None or fingerprint[2] != record.fingerprint[2]:
+            return None
+        record.fingerprint = fingerprint
+        return record
+    
+    def clear_file_cache(self):
+        """Forget the parsed files, so the next merge parses every file again"""
+        self._file_cache.clear()
+    
+    def _stream_file(self, filepath, on_progress=None):
+        """Yield the packed non-obsolete entries of one file as they are parsed, caching the file and logging parse errors"""
+        record = _ParsedFile(_file_fingerprint(filepath), rows=[] if self.keep_rows else None)
+        reader = None
+        shared = {}
+        try:
+            reader = _open_catalog(filepath, on_progress)
+            for entry in reader:
+                # The header precedes the first entry
+                self._preserve_metadata(reader.metadata, reader.header)
+                if not entry.obsolete:
+                    row = entry_to_tuple(entry)
+                    if self.share_strings:
+                        row = _share_row(row, shared, self.merged_entries)
+                    record.add_row(row)
+                    yield row
+            self._preserve_metadata(reader.metadata, reader.header)
+        except Exception as e:
+            # Entries read before the error stay merged
+            self._report_load_error(filepath, e)
+            record.fingerprint = None
+        if reader is not None:
+            record.metadata, record.header = reader.metadata, reader.header
+        self._file_cache[filepath] = record
+    
+    def _read_rows(self, filepath):
+        """Yield the packed non-obsolete entries of a cached file, read again when their rows are not kept"""
+        record = self._file_cache[filepath]
+        if record.rows is not None:
+            yield from record.rows
+            return
+        shared = {}
+        try:
+            for entry in _open_catalog(filepath):
+                if not entry.obsolete:
+                    row = entry_to_tuple(entry)
+                    yield _share_row(row, shared, self.merged_entries) if self.share_strings else row
+        except Exception as e:
+            self._report_load_error(filepath, e)
+    
+    def _report_load_error(self, filepath, error):
+        self.logger.error(f"Error loading {filepath}: {error}")
+        print(f"Error loading {filepath}: {error}")
+    
+    def _merge_entry(self, entry):
+        """Clean one entry and merge it, returning it if its msgid is new"""
+        self.merge_stats['read'] += 1
+        # The cleaner drops msgids it has seen: combine a repeated one first
+        merged = self.merged_entries.get(sanitize_text(entry.msgid))
+        if merged is not None:
+            self._merge_duplicate(merged, entry)
+            self.merge_stats['duplicates'] += 1
+            return None
         
-        self.logger.info(f"Merged entries: {len(self.merged_entries)} unique (removed {duplicates} duplicates)")
+        entry = self.cleaner.clean_entry(entry)
+        if entry is None:
+            return None
+        self.merge_stats['cleaned'] += 1
+        self.merged_entries[entry.msgid] = entry
+        return entry
+    
+    def _merge_duplicate(self, merged, entry):
+        """Combine an entry whose msgid is already merged (translation if missing, occurrences)"""
+        entry.msgstr = sanitize_text(entry.msgstr)
+        self.cleaner.merge_entries(merged, entry)
+    
+    def merge_files(self, filepaths, on_progress=None):
+        """
+        Merge multiple PO files
+        
+        Args:
+            filepaths: List of paths to .po files (or compiled .mo catalogs)
+            on_progress: Optional callback(bytes_done, total_bytes) over all files
+            
+        Returns:
+            dict: Dictionary of merged entries {msgid: CatalogEntry}
+        """
+        for _entry in self.iter_merge_files(filepaths, on_progress):
+            pass
         return self.merged_entries
     
+    def refresh_files(self, filepaths=None, on_progress=None):
+        """
+        Bring the merge up to date with the files on disk
+        
+        Only files whose content changed since they were parsed are parsed
+        again. The merged view and the indexer are patched for the msgids
+        those files held before and after the change, reading again the
+        unchanged files that hold them; every other entry is left as it is,
+        edits included. Entries new to the merge are appended.
+        Without a previous merge, or when the file order changed, this is a
+        full merge (still reusing the unchanged files).
+        
+        Args:
+            filepaths: List of paths to .po files (default: the files of the last merge)
+            on_progress: Optional callback(bytes_done, total_bytes) over the re-parsed files
+            
+        Returns:
+            dict: {'changed_files', 'removed_files': lists of paths,
+                   'added', 'updated', 'deleted': merged entry counts,
+                   'full_merge': bool}
+        """
+        filepaths = list(self.loaded_files if filepaths is None else filepaths)
+        previous_files = self.loaded_files
+        kept, previous_set = set(filepaths), set(previous_files)
+        previous = {path: self._file_cache.get(path) for path in previous_files}
+        report = {'changed_files': [], 'removed_files': [], 'added': 0, 'updated': 0, 'deleted': 0,
+                  'full_merge': False}
+        
+        # Winners depend on the file order, and a file missing from the cache
+        # (cache cleared) no longer tells which entries it contributed
+        if (not previous_files or len(kept) != len(filepaths) or None in previous.values()
+                or [path for path in previous_files if path in kept] != [path for path in filepaths if path in previous_set]):
+            report['changed_files'] = [path for path in filepaths if self._cached_record(path) is None]
+            report['full_merge'] = True
+            self.merge_files(filepaths, on_progress)
+            report['added'] = len(self.merged_entries)
+            return report
+        
+        changed = [path for path in filepaths if self._cached_record(path) is None]
+        removed = [path for path in previous_files if path not in kept]
+        report['changed_files'], report['removed_files'] = changed, removed
+        if not changed and not removed:
+            self.logger.info("Refresh: no file changed on disk")
+            return report
+        self.logger.info(f"Refreshing merge: {len(changed)} changed, {len(removed)} removed files")
+        
+        # Every msgid read from an affected file, before or after the change
+        affected = set()
+        for path in changed + removed:
+            if path in previous:
+                affected.update(previous[path].keys)
+        sizes = {path: os.path.getsize(path) if os.path.isfile(path) else 0 for path in changed}
+        total_bytes = sum(sizes.values())
+        done_bytes = 0
+        changed_rows = {}  # Entries of the changed files, only until the merge is patched
+        for path, record, rows, error in self._parse_files(changed, self._pool_workers(changed)):
+            if error:
+                self._report_load_error(path, error)
+            affected.update(record.keys)
+            changed_rows[path] = rows
+            done_bytes += sizes[path]
+            if on_progress:
+                on_progress(done_bytes, total_bytes)
+        for path in removed:
+            self._file_cache.pop(path, None)
+        
+        self.loaded_files = filepaths
+        self._patch_merge(previous_files, previous, affected, changed_rows, report)
+        
+        self.original_metadata = None
+        self.original_header = None
+        for path in filepaths:
+            self._preserve_metadata(self._file_cache[path].metadata, self._file_cache[path].header)
+        self.merge_stats['read'] = sum(self._file_cache[path].row_count for path in filepaths)
+        self.merge_stats['cleaned'] = len(self.merged_entries)
+        self.merge_stats['duplicates'] = sum(
+            self._file_cache[path].keyed_count for path in filepaths
+        ) - len(self.merged_entries)
+        self.logger.info(
+            f"Refreshed merge: {report['added']} added, {report['updated']} updated, "
+            f"{report['deleted']} deleted entries"
+        )
+        return report
+    
+    def _patch_merge(self, previous_files, previous, affected, changed_rows, report):
+        """Re-index and re-merge the affected msgids, reading again the unchanged files holding them"""
+        keys = {sanitize_text(msgid) for msgid in affected}
+        keys.discard('')
+        
+        # The last file indexing an msgid wins: replay them all in file order
+        self.indexer.remove_entries(keys)
+        new_rows = {}  # Cleaned msgid -> [(filepath, row)] in file order
+        for path in self.loaded_files:
+            if keys.isdisjoint(self._file_cache[path].keys):
+                continue
+            rows = changed_rows[path] if path in changed_rows else self._read_rows(path)
+            for row in rows:
+                key = sanitize_text(row[0])
+                if key in keys:
+                    self.indexer.index_entry(key, path, CatalogEntry.from_row(row))
+                    new_rows.setdefault(key, []).append((path, row))
+        
+        old_signatures = self._signatures_by_msgid(previous_files, previous, keys)
+        new_signatures = self._signatures_by_msgid(self.loaded_files, self._file_cache, keys)
+        for key in keys:
+            rows = new_rows.get(key)
+            current = self.merged_entries.get(key)
+            if rows is None:
+                if current is not None:
+                    del self.merged_entries[key]
+                    self.cleaner.seen_msgids.discard(key)
+                    report['deleted'] += 1
+                continue
+            
+            if current is not None and key in old_signatures and old_signatures[key] == new_signatures[key]:
+                continue
+            # The first file wins, the others are combined into it as in a full merge
+            entry = CatalogEntry.from_row(rows[0][1])
+            entry.msgid = key
+            entry.msgstr = sanitize_text(entry.msgstr)
+            for _path, row in rows[1:]:
+                self._merge_duplicate(entry, CatalogEntry.from_row(row))
+            self.merged_entries[key] = entry
+            self.cleaner.seen_msgids.add(key)
+            report['added' if current is None else 'updated'] += 1
+    
+    @staticmethod
+    def _signatures_by_msgid(filepaths, records, keys):
+        """Entry signatures per cleaned msgid in keys, in file order, as {msgid: [(filepath, signature)]}"""
+        found = {}
+        for path in filepaths:
+            record = records.get(path)
+            if record is None:
+                continue
+            for key in keys.intersection(record.keys):
+                found.setdefault(key, []).append((path, record.keys[key]))
+        return found
+    
     def get_entries_list(self):
         """
         Get list of merged entries
         
         Returns:
-            list: List of POEntry objects
+            list: List of CatalogEntry objects
         """
         return list(self.merged_entries.values())
     
@@ -117,7 +630,7 @@ class POMerger:
             msgid: Message ID
             
         Returns:
-            POEntry: Entry or None
+            CatalogEntry: Entry or None
         """
         return self.merged_entries.get(msgid)
     
@@ -151,59 +664,63 @@ class POMerger:
         
         return True
     
-    def export_to_file(self, filepath, metadata=None):
+    def export_to_file(self, filepath, metadata=None, mo_filepath=None, parallel=False, hash_size=None):
         """
         Export merged entries to .po file with full metadata preservation
         
         Args:
             filepath: Output path
             metadata: Optional metadata dict (overrides original)
+            mo_filepath: Also compile the entries to this .mo file, from memory
+            parallel: Write the .mo file in a thread while the PO file is written
+                      (both mostly hold the GIL: only pays off when the disk is slow)
+            hash_size: Slots of the .mo hash table (default: msgfmt's size, 0: none)
             
         Returns:
             bool: True if successful
         """
         self.logger.info(f"Exporting to {filepath}")
         try:
-            po_file = polib.POFile()
+            catalog = Catalog()
             
             # Use provided metadata, or original metadata, or defaults
             if metadata:
-                po_file.metadata = metadata
+                catalog.metadata = metadata
             elif self.original_metadata:
-                po_file.metadata = dict(self.original_metadata)
+                catalog.metadata = dict(self.original_metadata)
                 self.logger.debug(f"  Using original metadata ({len(self.original_metadata)} fields)")
             else:
-                po_file.metadata = {
-                    'Project-Id-Version': 'Odoo Server 17.0',
-                    'Report-Msgid-Bugs-To': '',
-                    'POT-Creation-Date': '',
-                    'PO-Revision-Date': '',
-                    'Language-Team': '',
-                    'MIME-Version': '1.0',
-                    'Content-Type': 'text/plain; charset=UTF-8',
-                    'Content-Transfer-Encoding': '',
-                    'Plural-Forms': '',
-                    'Language': 'fr',
-                }
+                catalog.metadata = dict(DEFAULT_METADATA)
                 self.logger.debug("  Using default metadata")
             
             # Preserve header comment
             if self.original_header:
-                po_file.header = self.original_header
+                catalog.header = self.original_header
                 self.logger.debug("  Preserved header comment")
             
-            # Export entries
-            entries = self.cleaner.sort_entries(self.get_entries_list())
-            self.logger.debug(f"  Exporting {len(entries)} entries")
+            # Merged entries are written as they are, in polib's layout
+            catalog.entries = self.cleaner.sort_entries(self.get_entries_list())
+            self.logger.debug(f"  Exporting {len(catalog)} entries")
             
-            for entry in entries:
-                po_file.append(entry)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                mo_write = None
+                if mo_filepath and parallel:
+                    mo_write = executor.submit(write_mo, catalog.entries, mo_filepath, catalog.metadata,
+                                               hash_size=hash_size)
+                
+                write_po(catalog, filepath)
+                
+                if mo_write is not None:
+                    mo_write.result()
+                elif mo_filepath:
+                    write_mo(catalog.entries, mo_filepath, catalog.metadata, hash_size=hash_size)
             
-            po_file.save(filepath)
             self.logger.info(f"Successfully exported to {filepath}")
-            self.logger.info(f"  Metadata fields: {len(po_file.metadata)}")
-            self.logger.info(f"  Header: {'Yes' if po_file.header else 'No'}")
-            self.logger.info(f"  Entries: {len(po_file)}")
+            if mo_filepath:
+                self.logger.info(f"Compiled {mo_filepath}")
+            self.logger.info(f"  Metadata fields: {len(catalog.metadata)}")
+            self.logger.info(f"  Header: {'Yes' if catalog.header else 'No'}")
+            self.logger.info(f"  Entries: {len(catalog)}")
             
             return True
         except Exception as e:
@@ -211,24 +728,111 @@ class POMerger:
             print(f"Error exporting to {filepath}: {e}")
             return False
     
-    def compile_mo(self, po_filepath, mo_filepath=None):
+    def export_modules(self, output_dir, lang=None, compile_mo=False, workers=None):
+        """
+        Export merged entries back into one PO file per module
+        
+        Each module indexed by the merge gets ``<output_dir>/<module>/i18n/<lang>.po``
+        (the layout of an addons directory) with the entries routed to it by
+        the module indexer, sorted by msgid. An entry found in several modules
+        is written to each of them, with that module's occurrences. A module
+        keeps the header comment and metadata of its own merged file; modules
+        without one get those of the merge. The merged files are read again
+        for the modules' own entries (unless the merger keeps rows), and the
+        module files are written concurrently by a thread pool.
+        
+        Args:
+            output_dir: Root directory, e.g. an addons directory
+            lang: Language of the file names (default: Language of the merged metadata)
+            compile_mo: Also compile each module to ``<lang>.mo`` next to its PO file
+            workers: Writer threads (default: one per module, at most 8)
+            
+        Returns:
+            dict: {module: Path of the PO file}, or None if writing failed
+        """
+        metadata = dict(self.original_metadata or DEFAULT_METADATA)
+        lang = lang or metadata.get('Language') or DEFAULT_METADATA['Language']
+        output_dir = Path(output_dir)
+        self.logger.info(f"Exporting modules to {output_dir} ({lang})")
+        
+        # Header and metadata of each module's own file (first one merged), and
+        # each module's entries as its files had them (the merge keeps the first)
+        sources, module_rows = {}, {}
+        for filepath in self.loaded_files:
+            record = self._file_cache.get(filepath)
+            if record is None:
+                continue
+            file_module = extract_module_name(filepath)
+            if file_module != 'unknown' and record.metadata and file_module not in sources:
+                sources[file_module] = record
+            for row in self._read_rows(filepath):
+                rows = module_rows.setdefault(self.indexer.module_of(filepath, row[7]), {})
+                rows.setdefault(sanitize_text(row[0]), row)
+        
+        catalogs = {}
+        for module in self.indexer.get_all_modules():
+            rows = module_rows.get(module, {})
+            routed = {}  # Merged msgid -> (entry, the module's row)
+            for msgid in self.indexer.get_entries_by_module(module):
+                entry = self.merged_entries.get(msgid)
+                if entry is not None:
+                    routed.setdefault(entry.msgid, (entry, rows.get(msgid)))
+            if module == 'unknown':
+                if routed:
+                    self.logger.warning(f"  {len(routed)} entries of no known module are not exported")
+                continue
+            if not routed:
+                continue
+            source = sources.get(module)
+            entries = self.cleaner.sort_entries([entry for entry, _row in routed.values()])
+            catalogs[module] = Catalog(
+                entries=[_module_entry(entry, module, routed[entry.msgid][1]) for entry in entries],
+                header=source.header if source else (self.original_header or ''),
+                metadata=dict(source.metadata) if source else dict(metadata, Language=lang),
+            )
+        
+        def write_module(module, catalog):
+            target = output_dir / module / 'i18n' / f'{lang}.po'
+            target.parent.mkdir(parents=True, exist_ok=True)
+            write_po(catalog, target)
+            if compile_mo:
+                write_mo(catalog.entries, target.with_suffix('.mo'), catalog.metadata, catalog.encoding)
+            return target
+        
+        try:
+            max_workers = workers or min(8, len(catalogs)) or 1
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {module: executor.submit(write_module, module, catalog)
+                           for module, catalog in catalogs.items()}
+                written = {module: future.result() for module, future in futures.items()}
+        except Exception as e:
+            self.logger.error(f"Error exporting modules to {output_dir}: {e}")
+            print(f"Error exporting modules to {output_dir}: {e}")
+            return None
+        
+        self.logger.info(
+            f"Exported {len(written)} modules "
+            f"({sum(len(catalog) for catalog in catalogs.values())} entries) to {output_dir}"
+        )
+        return written
+    
+    def compile_mo(self, po_filepath, mo_filepath=None, hash_size=None):
         """
         Compile .po to .mo file
         
         Args:
             po_filepath: Path to .po file
             mo_filepath: Output path for .mo (optional, defaults to same name)
+            hash_size: Slots of the hash table (default: msgfmt's size, 0: none)
             
         Returns:
             bool: True if successful
         """
         try:
-            po_file = polib.pofile(po_filepath)
-            
             if mo_filepath is None:
                 mo_filepath = po_filepath.replace('.po', '.mo')
             
-            po_file.save_as_mofile(mo_filepath)
+            compile_po_file(po_filepath, mo_filepath, hash_size)
             
             return True
         except Exception as e:
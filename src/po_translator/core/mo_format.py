@@ -0,0 +1,485 @@
+"""
+MO compiler and reader
+Builds GNU .mo catalogs straight from entries in memory, with the same
+selection and order as polib, so nothing is written to a PO file and parsed
+again just to compile it. Unlike polib, the catalogs carry the GNU hash table
+by default, so gettext finds a message in O(1) probes instead of a binary
+search over the keys. MOCatalog reads compiled catalogs through a memory map.
+"""
+import array
+import concurrent.futures
+import mmap
+import multiprocessing
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from po_translator.core.po_format import (
+    DEFAULT_ENCODING, CatalogEntry, detect_encoding, ordered_metadata, parse_metadata, read_po
+)
+
+MAGIC = 0x950412de
+MAGIC_SWAPPED = 0xde120495
+
+# Magic, revision, message count, key table offset, value table offset, hash table size and offset
+_HEADER = struct.Struct("Iiiiiii")
+
+
+def hash_string(key: bytes) -> int:
+    """GNU gettext's hash (hashpjw) of a key, up to its first NUL"""
+    value = 0
+    for byte in key.split(b"\0", 1)[0]:
+        # 32-bit arithmetic, as in gettext: the shift can carry past bit 31
+        value = ((value << 4) + byte) & 0xffffffff
+        high = value & 0xf0000000
+        if high:
+            value ^= high >> 24
+            value ^= high
+    return value
+
+
+def _next_prime(number: int) -> int:
+    number = max(3, number) | 1
+    while any(number % divisor == 0 for divisor in range(3, int(number ** 0.5) + 1, 2)):
+        number += 2
+    return number
+
+
+def hash_table_size(count: int) -> int:
+    """msgfmt's hash table size for count messages: the first prime from 4/3 of the count"""
+    return _next_prime(count * 4 // 3)
+
+
+def _hash_probes(hash_value: int, size: int):
+    """Slots gettext visits for a hash value: double hashing over a prime-sized table"""
+    slot = hash_value % size
+    step = 1 + hash_value % (size - 2)
+    for _probe in range(size):
+        yield slot
+        slot += step
+        if slot >= size:
+            slot -= size
+
+
+def build_hash_table(keys: Sequence[bytes], size: int) -> array.array:
+    """
+    Fill a GNU hash table: each slot holds a message index + 1, or 0 when empty
+
+    Args:
+        keys: Message keys, in table order
+        size: Number of slots (a prime greater than the number of keys)
+
+    Returns:
+        array: The table as unsigned 32-bit integers
+    """
+    table = array.array("I", bytes(4 * size))
+    for index, key in enumerate(keys):
+        for slot in _hash_probes(hash_string(key), size):
+            if not table[slot]:
+                table[slot] = index + 1
+                break
+    return table
+
+
+def metadata_msgstr(metadata: Dict[str, str]) -> str:
+    """Header translation ('Name: value' lines) of a catalog's metadata"""
+    lines = [f"{name}: {value}" for name, value in ordered_metadata(metadata)]
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def mo_messages(entries: Iterable, metadata: Optional[Dict[str, str]] = None,
+                encoding: str = DEFAULT_ENCODING) -> List[Tuple[bytes, bytes]]:
+    """
+    Encode the translated entries as MO messages
+
+    Like msgfmt and polib, fuzzy, obsolete and untranslated entries are left
+    out, keys are msgctxt EOT msgid (NUL msgid_plural) and plural
+    translations are NUL separated.
+
+    Args:
+        entries: Entries with the polib.POEntry attributes
+        metadata: Catalog metadata, stored as the translation of the empty msgid
+        encoding: Encoding of the strings
+
+    Returns:
+        list: (key, value) byte pairs sorted by key, the header first
+    """
+    messages = []
+    for entry in entries:
+        if not entry.translated():
+            continue
+        key = f"{entry.msgctxt}\x04{entry.msgid}" if entry.msgctxt else entry.msgid
+        if entry.msgid_plural:
+            key = f"{key}\0{entry.msgid_plural}"
+            plurals = entry.msgstr_plural
+            value = "\0".join(plurals[index] for index in sorted(plurals))
+        else:
+            value = entry.msgstr
+        messages.append((key.encode(encoding), value.encode(encoding)))
+    messages.sort(key=lambda message: message[0])
+    return [(b"", metadata_msgstr(metadata or {}).encode(encoding))] + messages
+
+
+def build_mo(messages: Sequence[Tuple[bytes, bytes]], hash_size: Optional[int] = None) -> bytes:
+    """
+    Lay out MO messages: header, key and value tables, hash table, then the strings
+
+    Args:
+        messages: (key, value) byte pairs, sorted by key
+        hash_size: Hash table slots, rounded up to a prime (default: msgfmt's
+                   size, 4/3 of the messages; 0 leaves the table out like polib)
+
+    Returns:
+        bytes: Content of the .mo file
+
+    Raises:
+        ValueError: The hash table has no more slots than there are messages
+    """
+    count = len(messages)
+    if hash_size is None:
+        hash_size = hash_table_size(count)
+    elif hash_size:
+        if hash_size <= count:
+            raise ValueError(f"A hash table for {count} messages needs more than {hash_size} slots")
+        hash_size = _next_prime(hash_size)
+    hash_table = build_hash_table([key for key, _value in messages], hash_size) if hash_size else b""
+    hash_start = _HEADER.size + 16 * count
+    keys_start = hash_start + 4 * hash_size
+    values_start = keys_start + sum(len(key) + 1 for key, _value in messages)
+
+    key_table = array.array("i")
+    value_table = array.array("i")
+    key_offset, value_offset = keys_start, values_start
+    for key, value in messages:
+        key_table.extend((len(key), key_offset))
+        value_table.extend((len(value), value_offset))
+        key_offset += len(key) + 1
+        value_offset += len(value) + 1
+
+    # Without a hash table its offset points where the strings start, as with polib
+    header = _HEADER.pack(MAGIC, 0, count, _HEADER.size, _HEADER.size + 8 * count, hash_size, hash_start)
+    return b"".join([
+        header, key_table.tobytes(), value_table.tobytes(), bytes(hash_table),
+        b"\0".join(key for key, _value in messages), b"\0",
+        b"\0".join(value for _key, value in messages), b"\0",
+    ])
+
+
+def write_mo(entries: Iterable, path, metadata: Optional[Dict[str, str]] = None,
+             encoding: str = DEFAULT_ENCODING, hash_size: Optional[int] = None) -> Path:
+    """
+    Compile entries to a .mo file, atomically
+
+    Args:
+        entries: Entries with the polib.POEntry attributes
+        path: Output path
+        metadata: Catalog metadata
+        encoding: Encoding of the strings
+        hash_size: Hash table slots (see build_mo)
+
+    Returns:
+        Path: The written file
+    """
+    target = Path(path)
+    data = build_mo(mo_messages(entries, metadata, encoding), hash_size)
+    fd, partial = tempfile.mkstemp(prefix=target.name, suffix=".part", dir=target.parent or None)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(partial, target)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return target
+
+
+def compile_po_file(po_path, mo_path=None, hash_size: Optional[int] = None) -> Path:
+    """
+    Compile a PO file (read with the fast reader) to a .mo file
+
+    Args:
+        po_path: Path to .po file
+        mo_path: Output path (default: the PO path with a .mo suffix)
+        hash_size: Hash table slots (see build_mo)
+
+    Returns:
+        Path: The written file
+    """
+    catalog = read_po(po_path, keep_source=False)
+    target = Path(mo_path) if mo_path else Path(po_path).with_suffix(".mo")
+    return write_mo(catalog.entries, target, catalog.metadata, catalog.encoding, hash_size)
+
+
+def compile_po_files(po_paths: Sequence, output_dir=None, workers: Optional[int] = None,
+                     hash_size: Optional[int] = None) -> List[Path]:
+    """
+    Compile many catalogs (e.g. one per language) in one run
+
+    Catalogs are compiled by a process pool, one file per task.
+
+    Args:
+        po_paths: Paths to .po files
+        output_dir: Directory for the .mo files (default: next to each PO file)
+        workers: Processes (default: CPU count, 1 compiles in this process)
+        hash_size: Hash table slots (see build_mo)
+
+    Returns:
+        list: Paths of the written .mo files, in input order
+
+    Raises:
+        ValueError: Two catalogs would be written to the same .mo file
+    """
+    targets = [
+        Path(output_dir) / f"{Path(path).stem}.mo" if output_dir else Path(path).with_suffix(".mo")
+        for path in po_paths
+    ]
+    if len(set(targets)) != len(targets):
+        raise ValueError("Several catalogs would be compiled to the same .mo file")
+    if output_dir:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    workers = min(max(1, workers or os.cpu_count() or 1), len(targets))
+    if workers <= 1:
+        return [compile_po_file(path, target, hash_size) for path, target in zip(po_paths, targets)]
+    # Spawned workers: forking a process running Tk and worker threads is unsafe
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        return list(executor.map(compile_po_file, po_paths, targets, [hash_size] * len(targets)))
+
+
+def _mo_layout(data) -> Tuple[str, Tuple[int, ...]]:
+    """Byte order and header fields of an MO file, checked against its size"""
+    if len(data) < _HEADER.size:
+        raise ValueError("Not an MO file: shorter than the header")
+    magic = struct.unpack_from("<I", data)[0]
+    if magic == MAGIC:
+        order = "<"
+    elif magic == MAGIC_SWAPPED:
+        order = ">"
+    else:
+        raise ValueError(f"Not an MO file: bad magic number {magic:#x}")
+    header = struct.unpack_from(order + "IIIIIII", data)
+    _magic, revision, count, keys_offset, values_offset, hash_size, hash_offset = header
+    if revision >> 16 > 1:
+        raise ValueError(f"Unsupported MO revision {revision >> 16}")
+    tables = [(keys_offset, 8 * count), (values_offset, 8 * count), (hash_offset, 4 * hash_size)]
+    if any(offset + length > len(data) for offset, length in tables):
+        raise ValueError("Truncated MO file: a table lies past the end of the file")
+    return order, header
+
+
+def verify_mo(path) -> Dict[str, object]:
+    """
+    Check an MO file and measure how gettext looks messages up in it
+
+    Every key is looked up through the hash table the way gettext does it, and
+    the keys must be sorted for the binary search used without a table.
+
+    Args:
+        path: Path to .mo file
+
+    Returns:
+        dict: Report with the message count, hash table size and load factor,
+              average/maximum probes per lookup, the binary search steps it
+              replaces, and the errors found ('valid' when there are none)
+
+    Raises:
+        ValueError: The file is not an MO file or is truncated
+    """
+    data = Path(path).read_bytes()
+    order, header = _mo_layout(data)
+    _magic, revision, count, keys_offset, values_offset, hash_size, hash_offset = header
+    errors = []
+
+    def strings(offset):
+        table = struct.unpack_from(f"{order}{2 * count}I", data, offset)
+        for index in range(count):
+            length, start = table[2 * index], table[2 * index + 1]
+            if start + length >= len(data) or data[start + length] != 0:
+                errors.append(f"String {index} is out of bounds or not NUL-terminated")
+                yield b""
+            else:
+                yield data[start:start + length]
+
+    keys = list(strings(keys_offset))
+    list(strings(values_offset))
+    if any(keys[index] >= keys[index + 1] for index in range(count - 1)):
+        errors.append("Keys are not sorted (or repeated): binary search lookups fail")
+
+    probes = []
+    if hash_size:
+        if hash_size <= 2:
+            errors.append(f"Hash table of {hash_size} slots is too small")
+        else:
+            table = struct.unpack_from(f"{order}{hash_size}I", data, hash_offset)
+            if count and all(table):
+                errors.append("Hash table is full: looking up a missing message never ends")
+            for index, key in enumerate(keys):
+                # gettext compares keys up to the first NUL (the msgid of a plural entry)
+                msgid = key.split(b"\0", 1)[0]
+                for probe, slot in enumerate(_hash_probes(hash_string(key), hash_size), 1):
+                    found = table[slot]
+                    if not found or (0 < found <= count and keys[found - 1].split(b"\0", 1)[0] == msgid):
+                        break
+                if found == index + 1:
+                    probes.append(probe)
+                else:
+                    errors.append(f"Message {index} ({msgid[:40]!r}) is not reachable through the hash table")
+
+    return {
+        "file": str(path),
+        "byte_order": "little" if order == "<" else "big",
+        "revision": revision,
+        "messages": count,
+        "hash_size": hash_size,
+        "load_factor": round(count / hash_size, 3) if hash_size else None,
+        "average_probes": round(sum(probes) / len(probes), 3) if probes else None,
+        "max_probes": max(probes, default=None),
+        "first_probe_hits": sum(1 for probe in probes if probe == 1),
+        "binary_search_steps": count.bit_length(),
+        "errors": errors,
+        "valid": not errors,
+    }
+
+
+class MOCatalog:
+    """
+    Read-only view of a compiled catalog through a memory map
+
+    Only the strings listed or looked up are read from the file: a lookup
+    follows the hash table (or binary-searches the sorted keys when there is
+    none) and decodes the few keys it probes, so the catalog is never loaded
+    into Python objects as a whole. Iterating yields CatalogEntry objects
+    (without comments, occurrences or flags, which MO files do not keep).
+    """
+
+    def __init__(self, path, on_progress: Optional[Callable[[int, int], None]] = None):
+        """
+        Map a compiled catalog
+
+        Args:
+            path: Path to .mo file
+            on_progress: Called with (bytes, file size) once iterating is done,
+                         like CatalogReader
+
+        Raises:
+            ValueError: The file is not an MO file or is truncated
+        """
+        self.path = Path(path)
+        self.on_progress = on_progress
+        with open(self.path, "rb") as handle:
+            try:
+                self._data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"Not an MO file: {self.path} is empty") from None
+        try:
+            order, header = _mo_layout(self._data)
+        except ValueError:
+            self._data.close()
+            raise
+        _magic, _revision, self._count, self._keys_offset, self._values_offset, hash_size, self._hash_offset = header
+        # gettext ignores tables too small to probe
+        self._hash_size = hash_size if hash_size > 2 else 0
+        self._pair = struct.Struct(order + "II")
+        self._slot = struct.Struct(order + "I")
+
+        self.header = ''
+        self.metadata: Dict[str, str] = {}
+        self.encoding = DEFAULT_ENCODING
+        self._first = 0
+        if self._count and self._key(0) == b"":
+            value = self._value(0)
+            self.encoding = detect_encoding(value)
+            self.metadata = parse_metadata(value.decode(self.encoding, "replace"))
+            self._first = 1
+
+    def __enter__(self) -> "MOCatalog":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Unmap the file"""
+        self._data.close()
+
+    @property
+    def language(self) -> str:
+        """Language code of the catalog ('fr' for 'fr_FR'), '' when the header has none"""
+        return self.metadata.get("Language", "").split("_")[0].split("-")[0].lower()
+
+    def __len__(self) -> int:
+        return self._count - self._first
+
+    def _string(self, table: int, index: int) -> bytes:
+        length, start = self._pair.unpack_from(self._data, table + 8 * index)
+        return self._data[start:start + length]
+
+    def _key(self, index: int) -> bytes:
+        return self._string(self._keys_offset, index)
+
+    def _value(self, index: int) -> bytes:
+        return self._string(self._values_offset, index)
+
+    def _find(self, msgid: bytes) -> Optional[int]:
+        """Index of the message whose key (up to its first NUL) is msgid"""
+        if self._hash_size:
+            for slot in _hash_probes(hash_string(msgid), self._hash_size):
+                found = self._slot.unpack_from(self._data, self._hash_offset + 4 * slot)[0]
+                if not found:
+                    return None
+                if found <= self._count and self._key(found - 1).split(b"\0", 1)[0] == msgid:
+                    return found - 1
+            return None
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            key = self._key(middle).split(b"\0", 1)[0]
+            if key == msgid:
+                return middle
+            if key < msgid:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def lookup(self, msgid: str, msgctxt: Optional[str] = None) -> Optional[str]:
+        """
+        Translation of a message, as gettext finds it
+
+        Args:
+            msgid: Source string
+            msgctxt: Message context
+
+        Returns:
+            str: The msgstr (first form of a plural entry), or None if absent
+        """
+        if not msgid:
+            return None
+        key = f"{msgctxt}\x04{msgid}" if msgctxt else msgid
+        index = self._find(key.encode(self.encoding))
+        if index is None:
+            return None
+        return self._value(index).split(b"\0", 1)[0].decode(self.encoding)
+
+    def __contains__(self, msgid) -> bool:
+        return self.lookup(msgid) is not None
+
+    def __iter__(self) -> Iterator[CatalogEntry]:
+        for index in range(self._first, self._count):
+            key = self._key(index).decode(self.encoding)
+            value = self._value(index).decode(self.encoding)
+            msgctxt = None
+            if "\x04" in key:
+                msgctxt, key = key.split("\x04", 1)
+            if "\0" in key:
+                msgid, msgid_plural = key.split("\0", 1)
+                yield CatalogEntry(msgid=msgid, msgctxt=msgctxt, msgid_plural=msgid_plural,
+                                   msgstr_plural=dict(enumerate(value.split("\0"))))
+            else:
+                yield CatalogEntry(msgid=key, msgstr=value, msgctxt=msgctxt)
+        if self.on_progress:
+            self.on_progress(len(self._data), len(self._data))
@@ -0,0 +1,774 @@
+"""
+Fast PO reader/writer
+Single-pass parser and polib-compatible writer built on slotted entries.
+Entries keep the source text they were parsed from, so unchanged entries are
+written back verbatim and a read/write round trip is byte-identical
+"""
+import codecs
+import os
+import re
+import tempfile
+import textwrap
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional
+
+import polib
+
+
+DEFAULT_ENCODING = 'utf-8'
+DEFAULT_WRAPWIDTH = 78
+
+_BOM = '\ufeff'
+_CHARSET = re.compile(rb'"?Content-Type:.+? charset=([\w_\-:\.]+)')
+_HEADER_SCAN_BYTES = 1 << 16
+# One non-blank line: keyword[index] "value", "continuation", #comment, or anything else (invalid)
+_LINE = re.compile(
+    r'^[ \t]*(?:(msgctxt|msgid_plural|msgid|msgstr)(?:\[(\d+)\])?[ \t]+"(.*)"'
+    r'|"(.*)"|(#(?:.*\S)?)|(\S(?:.*\S)?))[ \t\r]*$',
+    re.MULTILINE,
+)
+_ESCAPE_SEQUENCE = re.compile(r'\\(\\|n|t|r|v|b|f|")')
+_UNESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'v': '\v', 'b': '\b', 'f': '\f', '\\': '\\', '"': '"'}
+_NEEDS_ESCAPE = re.compile(r'[\\\t\r\n\v\b\f"]')
+_SPECIAL_CHARS = ('\\', '\n', '\r', '\t', '\v', '\b', '\f', '"')
+# Header fields in the order polib writes them, the rest follow sorted
+_METADATA_ORDER = (
+    'Project-Id-Version', 'Report-Msgid-Bugs-To', 'POT-Creation-Date', 'PO-Revision-Date', 'Last-Translator',
+    'Language-Team', 'Language', 'MIME-Version', 'Content-Type', 'Content-Transfer-Encoding', 'Plural-Forms',
+)
+_PREVIOUS_FIELDS = {'msgctxt': 'previous_msgctxt', 'msgid': 'previous_msgid', 'msgid_plural': 'previous_msgid_plural'}
+# Shared by entries built from packed rows without plural translations (assign a dict to set some)
+_NO_PLURALS: Mapping[int, str] = MappingProxyType({})
+
+
+def unescape(text: str) -> str:
+    """Unescape a PO string literal body (same rules as polib)"""
+    if '\\' not in text:
+        return text
+    return _ESCAPE_SEQUENCE.sub(lambda match: _UNESCAPES[match.group(1)], text)
+
+
+def escape(text: str) -> str:
+    """Escape a string for a PO string literal (same rules as polib)"""
+    if not _NEEDS_ESCAPE.search(text):
+        return text
+    return (text.replace('\\', r'\\').replace('\t', r'\t').replace('\r', r'\r').replace('\n', r'\n')
+            .replace('\v', r'\v').replace('\b', r'\b').replace('\f', r'\f').replace('"', r'\"'))
+
+
+# ==========================================================
+# Data model
+# ==========================================================
+class CatalogEntry:
+    """
+    A PO entry with the polib.POEntry attributes, without per-instance dicts
+
+    Entries built by ``from_row`` (the merged entries) share their occurrence
+    and flag tuples with the row: assign a new value instead of mutating them.
+    """
+
+    __slots__ = (
+        'msgid', 'msgstr', 'msgctxt', 'msgid_plural', 'msgstr_plural', 'occurrences', 'flags', 'comment',
+        'tcomment', 'obsolete', 'previous_msgid', 'previous_msgctxt', 'previous_msgid_plural', 'linenum',
+        'source', '_snapshot',
+    )
+
+    def __init__(self, msgid='', msgstr='', msgctxt=None, msgid_plural='', msgstr_plural=None,
+                 occurrences=None, flags=None, comment='', tcomment='', obsolete=0,
+                 previous_msgid=None, previous_msgctxt=None, previous_msgid_plural=None,
+                 linenum=None, source=None):
+        self.msgid = msgid
+        self.msgstr = msgstr
+        self.msgctxt = msgctxt
+        self.msgid_plural = msgid_plural
+        self.msgstr_plural = {} if msgstr_plural is None else msgstr_plural
+        self.occurrences = [] if occurrences is None else occurrences
+        self.flags = [] if flags is None else flags
+        self.comment = comment
+        self.tcomment = tcomment
+        self.obsolete = obsolete
+        self.previous_msgid = previous_msgid
+        self.previous_msgctxt = previous_msgctxt
+        self.previous_msgid_plural = previous_msgid_plural
+        self.linenum = linenum
+        # Text this entry was parsed from, written back as is while the fields match the snapshot
+        self.source = source
+        self._snapshot = self.snapshot() if source is not None else None
+
+    def __repr__(self):
+        return f"CatalogEntry(msgid={self.msgid!r}, msgstr={self.msgstr!r})"
+
+    @property
+    def fuzzy(self) -> bool:
+        return 'fuzzy' in self.flags
+
+    def translated(self) -> bool:
+        """Same rule as polib: not obsolete, not fuzzy and every msgstr filled"""
+        if self.obsolete or self.fuzzy:
+            return False
+        if self.msgstr != '':
+            return True
+        return bool(self.msgstr_plural) and all(self.msgstr_plural.values())
+
+    def snapshot(self) -> tuple:
+        """Current field values (the strings themselves, so comparing is mostly identity checks)"""
+        return (
+            self.msgid, self.msgstr, self.msgctxt, self.msgid_plural, tuple(self.msgstr_plural.items()),
+            tuple(self.occurrences), tuple(self.flags), self.comment, self.tcomment, self.obsolete,
+            self.previous_msgid, self.previous_msgctxt, self.previous_msgid_plural,
+        )
+
+    def modified(self) -> bool:
+        """Whether the entry changed since it was parsed (always True without a source)"""
+        return self._snapshot is None or self._snapshot != self.snapshot()
+
+    def key(self) -> tuple:
+        """Every field except the line number and source, for comparisons"""
+        return (
+            self.msgid, self.msgstr, self.msgctxt, self.msgid_plural, sorted(self.msgstr_plural.items()),
+            list(self.occurrences), list(self.flags), self.comment, self.tcomment, bool(self.obsolete),
+            self.previous_msgid, self.previous_msgctxt, self.previous_msgid_plural,
+        )
+
+    def render(self, wrapwidth: int = DEFAULT_WRAPWIDTH) -> str:
+        """Entry text as polib writes it (ends with a newline)"""
+        return _render_entry(self, wrapwidth)
+
+    @classmethod
+    def from_row(cls, values: tuple) -> 'CatalogEntry':
+        """
+        Build an entry from a tuple packed by ``po_stream.entry_to_tuple``
+
+        The occurrence and flag tuples are shared with the row, not copied,
+        and the line number is not kept.
+        """
+        (msgid, msgstr, msgctxt, msgid_plural, msgstr_plural, occurrences, flags, comment,
+         tcomment, obsolete, previous_msgid, previous_msgctxt, previous_msgid_plural, _linenum) = values
+        entry = cls.__new__(cls)
+        entry.msgid = msgid
+        entry.msgstr = msgstr
+        entry.msgctxt = msgctxt
+        entry.msgid_plural = msgid_plural
+        entry.msgstr_plural = dict(msgstr_plural) if msgstr_plural else _NO_PLURALS
+        entry.occurrences = occurrences
+        entry.flags = flags
+        entry.comment = comment
+        entry.tcomment = tcomment
+        entry.obsolete = obsolete
+        entry.previous_msgid = previous_msgid
+        entry.previous_msgctxt = previous_msgctxt
+        entry.previous_msgid_plural = previous_msgid_plural
+        entry.linenum = None
+        entry.source = None
+        entry._snapshot = None
+        return entry
+
+    @classmethod
+    def from_polib(cls, entry: polib.POEntry) -> 'CatalogEntry':
+        return cls(
+            msgid=entry.msgid, msgstr=entry.msgstr, msgctxt=entry.msgctxt, msgid_plural=entry.msgid_plural,
+            msgstr_plural=dict(entry.msgstr_plural), occurrences=list(entry.occurrences), flags=list(entry.flags),
+            comment=entry.comment, tcomment=entry.tcomment, obsolete=entry.obsolete,
+            previous_msgid=entry.previous_msgid, previous_msgctxt=entry.previous_msgctxt,
+            previous_msgid_plural=entry.previous_msgid_plural, linenum=entry.linenum,
+        )
+
+    def to_polib(self) -> polib.POEntry:
+        return polib.POEntry(
+            msgid=self.msgid, msgstr=self.msgstr, msgctxt=self.msgctxt, msgid_plural=self.msgid_plural,
+            msgstr_plural=dict(self.msgstr_plural), occurrences=list(self.occurrences), flags=list(self.flags),
+            comment=self.comment, tcomment=self.tcomment, obsolete=self.obsolete,
+            previous_msgid=self.previous_msgid, previous_msgctxt=self.previous_msgctxt,
+            previous_msgid_plural=self.previous_msgid_plural, linenum=self.linenum,
+        )
+
+
+def ordered_metadata(metadata: Dict[str, str]) -> List[tuple]:
+    """Metadata items in polib's field order: the standard fields, then the others naturally sorted"""
+    metadata = dict(metadata)
+    ordered = [(name, metadata.pop(name)) for name in _METADATA_ORDER if name in metadata]
+    ordered += [(name, metadata[name]) for name in polib.natural_sort(metadata.keys())]
+    return ordered
+
+
+class Catalog:
+    """Entries, header comment and metadata of a PO file"""
+
+    __slots__ = (
+        'entries', 'header', 'metadata', 'metadata_is_fuzzy', 'encoding', 'wrapwidth',
+        'header_source', 'trailer',
+    )
+
+    def __init__(self, entries=None, header='', metadata=None, metadata_is_fuzzy=None,
+                 encoding=DEFAULT_ENCODING, wrapwidth=DEFAULT_WRAPWIDTH):
+        self.entries: List[CatalogEntry] = [] if entries is None else entries
+        self.header = header
+        self.metadata: Dict[str, str] = {} if metadata is None else metadata
+        self.metadata_is_fuzzy = [] if metadata_is_fuzzy is None else metadata_is_fuzzy
+        self.encoding = encoding
+        self.wrapwidth = wrapwidth
+        # Source text of the header comment and metadata entry, and of what follows the last entry
+        self.header_source: Optional[str] = None
+        self.trailer = ''
+
+    def __iter__(self) -> Iterator[CatalogEntry]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def ordered_metadata(self) -> List[tuple]:
+        """Metadata in polib's field order"""
+        return ordered_metadata(self.metadata)
+
+    def render(self) -> str:
+        return render_po(self)
+
+    @classmethod
+    def from_polib(cls, po_file: polib.POFile) -> 'Catalog':
+        return cls(
+            entries=[CatalogEntry.from_polib(entry) for entry in po_file],
+            header=po_file.header, metadata=dict(po_file.metadata),
+            metadata_is_fuzzy=list(po_file.metadata_is_fuzzy or []),
+            encoding=po_file.encoding or DEFAULT_ENCODING, wrapwidth=po_file.wrapwidth,
+        )
+
+    def to_polib(self) -> polib.POFile:
+        po_file = polib.POFile(wrapwidth=self.wrapwidth, encoding=self.encoding)
+        po_file.header = self.header
+        po_file.metadata = dict(self.metadata)
+        po_file.metadata_is_fuzzy = list(self.metadata_is_fuzzy)
+        for entry in self.entries:
+            po_file.append(entry.to_polib())
+        return po_file
+
+
+# ==========================================================
+# Reading
+# ==========================================================
+def parse_metadata(msgstr: str) -> Dict[str, str]:
+    """
+    Parse the msgstr of a header entry
+
+    Returns:
+        dict: Metadata fields, continuation lines appended to the previous field
+    """
+    metadata: Dict[str, str] = {}
+    key = None
+    for line in msgstr.splitlines():
+        try:
+            key, value = line.split(':', 1)
+            metadata[key] = value.strip()
+        except ValueError:
+            if key is not None:
+                metadata[key] += '\n' + line.strip()
+    return metadata
+
+
+def detect_encoding(data: bytes) -> str:
+    """
+    Charset declared in the Content-Type header
+
+    Returns:
+        str: Codec name, 'utf-8' when missing or unknown
+    """
+    # The header entry comes first; do not scan a whole catalog without one
+    match = _CHARSET.search(data, 0, _HEADER_SCAN_BYTES)
+    if match:
+        encoding = match.group(1).strip().decode('ascii', 'replace')
+        try:
+            codecs.lookup(encoding)
+            return encoding
+        except LookupError:
+            pass
+    return DEFAULT_ENCODING
+
+
+def read_po(path, encoding: Optional[str] = None, keep_source: bool = True) -> Catalog:
+    """
+    Read a PO file
+
+    Args:
+        path: Path to .po file
+        encoding: File encoding (default: charset from the header)
+        keep_source: Keep each entry's source text for a byte-identical write
+
+    Returns:
+        Catalog
+    """
+    data = Path(path).read_bytes()
+    encoding = encoding or detect_encoding(data)
+    catalog = parse_po(data.decode(encoding), keep_source=keep_source, source_name=str(path))
+    catalog.encoding = encoding
+    return catalog
+
+
+class CatalogReader:
+    """
+    Iterate over the entries of a PO file as they are parsed
+
+    Same parser as read_po(), fed one block of lines at a time so memory stays
+    constant whatever the file size (the merger packs each entry into a row).
+    The header comment and metadata are set before the first entry is
+    yielded; the header entry is not yielded.
+    """
+
+    def __init__(self, path, encoding: Optional[str] = None,
+                 on_progress: Optional[Callable[[int, int], None]] = None,
+                 progress_step: int = 1 << 20, chunk_size: int = 1 << 20):
+        """
+        Initialize reader
+
+        Args:
+            path: Path to .po file
+            encoding: File encoding (default: charset from the header)
+            on_progress: Called with (bytes read, file size) every ``progress_step`` bytes
+            progress_step: Bytes between progress reports
+            chunk_size: Bytes read from the file at a time
+        """
+        self.path = Path(path)
+        if encoding is None:
+            with open(self.path, 'rb') as handle:
+                encoding = detect_encoding(handle.read(_HEADER_SCAN_BYTES))
+        self.encoding = encoding
+        self.size = os.path.getsize(self.path)
+        self.on_progress = on_progress
+        self.progress_step = max(1, progress_step)
+        self.chunk_size = max(1, chunk_size)
+        self.bytes_read = 0
+        self.header = ''
+        self.metadata: Dict[str, str] = {}
+        self.metadata_is_fuzzy: List[str] = []
+        self.entry_count = 0
+
+    def _chunks(self) -> Iterator[str]:
+        """Decoded blocks of the file, each ending with a line"""
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        pending = ''
+        reported = 0
+        with open(self.path, 'rb') as handle:
+            while True:
+                data = handle.read(self.chunk_size)
+                if not data:
+                    break
+                first = self.bytes_read == 0
+                self.bytes_read += len(data)
+                if self.on_progress and self.bytes_read - reported >= self.progress_step:
+                    reported = self.bytes_read
+                    self.on_progress(self.bytes_read, self.size)
+                text = pending + decoder.decode(data)
+                if first and text.startswith(_BOM):
+                    text = text[1:]
+                # Keep the unfinished last line for the next block
+                end = text.rfind('\n') + 1
+                pending = text[end:]
+                if end:
+                    yield text[:end]
+        pending += decoder.decode(b'', True)
+        if pending:
+            yield pending
+        if self.on_progress:
+            self.on_progress(self.bytes_read, self.size)
+
+    def __iter__(self) -> Iterator[CatalogEntry]:
+        catalog = Catalog()
+        header_pending = True
+        for entry in _iter_entries(self._chunks(), catalog, False, str(self.path)):
+            self.header = catalog.header
+            if header_pending and entry.msgid == '' and not entry.obsolete:
+                header_pending = False
+                self.metadata_is_fuzzy = entry.flags
+                self.metadata = parse_metadata(entry.msgstr)
+                continue
+            self.entry_count += 1
+            yield entry
+        self.header = catalog.header
+
+
+def parse_po(text: str, keep_source: bool = True, source_name: str = '') -> Catalog:
+    """
+    Parse PO file content
+
+    Args:
+        text: File content
+        keep_source: Keep each entry's source text for a byte-identical write
+        source_name: File name used in syntax errors
+
+    Returns:
+        Catalog
+
+    Raises:
+        IOError: Syntax error (same cases as polib on well-formed input)
+    """
+    catalog = Catalog()
+    bom = ''
+    if text.startswith(_BOM):
+        bom, text = _BOM, text[1:]
+
+    entries = list(_iter_entries((text,), catalog, keep_source, source_name))
+
+    # The first non-obsolete entry with an empty msgid holds the metadata
+    for index, entry in enumerate(entries):
+        if entry.msgid == '' and not entry.obsolete:
+            del entries[index]
+            catalog.metadata_is_fuzzy = entry.flags
+            catalog.metadata = parse_metadata(entry.msgstr)
+            # A metadata entry further down is written back at the top
+            if keep_source and index == 0:
+                catalog.header_source += entry.source
+            break
+    if keep_source:
+        catalog.header_source = bom + catalog.header_source
+    catalog.entries = entries
+    return catalog
+
+
+def _iter_entries(chunks: Iterable[str], catalog: Catalog, keep_source: bool, source_name: str,
+                  in_header: bool = True) -> Iterator[CatalogEntry]:
+    """
+    Single pass over the lines, filling the catalog header and yielding each entry once complete
+
+    ``chunks`` are consecutive pieces of the content, each ending with a
+    line. The header comment is set before the first entry is yielded. With
+    ``keep_source`` the content must be a single chunk: the header source,
+    the entry sources and the trailer are consecutive slices of it, so
+    joining them gives the input back.
+    """
+    header_lines: List[str] = []
+    entry = CatalogEntry(linenum=0)
+    target = None  # Field extended by a continuation line
+    plural_index = 0
+    has_msgid = has_msgstr = False
+    last_is_comment = True  # As in polib, an entry is only closed at the end after a keyword line
+    entry_start = header_end = 0
+    counted = 0  # Line numbers are counted up to here in the chunk, only when needed
+    line_number = 1
+    lines_before = 0  # Lines of the previous chunks
+    text = ''
+
+    def error(position, detail=''):
+        name = f"{source_name} " if source_name else ''
+        line = lines_before + text.count(chr(10), 0, position) + 1
+        return IOError(f"Syntax error in po file {name}(line {line}){detail}")
+
+    for text in chunks:
+        for match in _LINE.finditer(text):
+            keyword, index, value, continuation, comment, invalid = match.groups()
+            line_start = match.start()
+            obsolete = False
+
+            if comment is not None and comment[1:2] == '~':
+                rest = comment[2:]
+                if rest[:1] == '|':
+                    last_is_comment = True
+                    continue
+                if rest[:1] in (' ', '\t') and rest.strip():
+                    keyword, index, value, continuation, comment, invalid = _LINE.match(rest.strip()).groups()
+                    obsolete = True
+
+            if invalid is not None:
+                raise error(line_start)
+
+            if continuation is not None:
+                # Continuation of the last string field
+                if '"' in continuation and continuation.count('"') != continuation.count('\\"'):
+                    raise error(line_start, ': unescaped double quote found')
+                if target is None:
+                    raise error(line_start)
+                if target == 'plural':
+                    entry.msgstr_plural[plural_index] += unescape(continuation)
+                else:
+                    setattr(entry, target, getattr(entry, target) + unescape(continuation))
+                last_is_comment = False
+                continue
+
+            if comment is not None:
+                last_is_comment = True
+                kind = comment[1:2]
+                if kind in (':', ',', '.', '|'):
+                    if comment[2:3] not in (' ', '\t', ''):
+                        raise error(line_start)
+                    if kind != '|' and not comment[2:].strip():
+                        continue
+                elif kind not in (' ', '\t', '', '#'):
+                    raise error(line_start)
+
+                if kind == '|':
+                    previous = comment[2:].lstrip()
+                    if previous[:1] == '"':
+                        if target is None or not target.startswith('previous_'):
+                            raise error(line_start)
+                        setattr(entry, target, getattr(entry, target) + unescape(previous[1:-1]))
+                        continue
+                    previous_match = _LINE.match(previous)
+                    if previous_match is None or previous_match.group(1) not in _PREVIOUS_FIELDS or previous_match.group(2):
+                        raise error(line_start)
+                elif in_header and kind not in (':', ',', '.'):
+                    # Comment lines at the top of the file are the header comment
+                    header_lines.append(comment[2:])
+                    entry_start = header_end = match.end() + 1
+                    continue
+                if in_header:
+                    in_header = False
+                    catalog.header = '\n'.join(header_lines)
+
+                if has_msgstr:
+                    if keep_source:
+                        entry.source = text[entry_start:line_start]
+                        entry._snapshot = entry.snapshot()
+                    yield entry
+                    line_number += text.count('\n', counted, line_start)
+                    counted = line_start
+                    entry = CatalogEntry(linenum=line_number)
+                    entry_start = line_start
+                    has_msgid = has_msgstr = False
+                target = None
+
+                if kind == ':':
+                    occurrences = entry.occurrences
+                    for occurrence in comment[3:].split():
+                        path, separator, number = occurrence.rpartition(':')
+                        if separator and number.isdigit():
+                            occurrences.append((path, number))
+                        else:
+                            occurrences.append((occurrence, ''))
+                elif kind == ',':
+                    entry.flags += [flag.strip() for flag in comment[3:].split(',')]
+                elif kind == '.':
+                    entry.comment = f"{entry.comment}\n{comment[3:]}" if entry.comment else comment[3:]
+                elif kind == '|':
+                    target = _PREVIOUS_FIELDS[previous_match.group(1)]
+                    setattr(entry, target, unescape(previous_match.group(3)))
+                else:
+                    tcomment = comment.lstrip('#')
+                    if tcomment[:1] == ' ':
+                        tcomment = tcomment[1:]
+                    entry.tcomment = f"{entry.tcomment}\n{tcomment}" if entry.tcomment else tcomment
+                continue
+
+            if '"' in value and value.count('"') != value.count('\\"'):
+                raise error(line_start, ': unescaped double quote found')
+            if in_header:
+                in_header = False
+                catalog.header = '\n'.join(header_lines)
+            last_is_comment = False
+
+            if keyword == 'msgstr':
+                if not has_msgid:
+                    raise error(line_start)
+                has_msgstr = True
+                if index is None:
+                    entry.msgstr = unescape(value)
+                    target = 'msgstr'
+                else:
+                    plural_index = int(index)
+                    entry.msgstr_plural[plural_index] = unescape(value)
+                    target = 'plural'
+                continue
+
+            if has_msgstr:
+                if keep_source:
+                    entry.source = text[entry_start:line_start]
+                    entry._snapshot = entry.snapshot()
+                yield entry
+                line_number += text.count('\n', counted, line_start)
+                counted = line_start
+                entry = CatalogEntry(linenum=line_number)
+                entry_start = line_start
+                has_msgid = has_msgstr = False
+            if index is not None or (has_msgid and keyword != 'msgid_plural'):
+                raise error(line_start)
+            if keyword == 'msgid':
+                entry.obsolete = int(obsolete)
+                entry.msgid = unescape(value)
+                has_msgid = True
+            elif keyword == 'msgid_plural' and not has_msgid:
+                raise error(line_start)
+            else:
+                setattr(entry, keyword, unescape(value))
+            target = keyword
+        # Line numbers continue in the next chunk
+        line_number += text.count('\n', counted)
+        lines_before += text.count('\n')
+        counted = 0
+
+    # The last entry ends with the file; trailing comments are not an entry
+    if not last_is_comment:
+        if keep_source:
+            entry.source = text[entry_start:]
+            entry._snapshot = entry.snapshot()
+        entry_start = len(text)
+        yield entry
+
+    catalog.header = '\n'.join(header_lines)
+    if keep_source:
+        catalog.header_source = text[:header_end]
+        catalog.trailer = text[entry_start:]
+
+
+# ==========================================================
+# Writing
+# ==========================================================
+def _render_field(out: List[str], fieldname: str, prefix: str, plural_index: str, value: str, wrapwidth: int):
+    """Append the lines of one string field, wrapped like polib"""
+    lines = value.splitlines(True)
+    if len(lines) > 1:
+        lines = [''] + lines
+    else:
+        # Field name, one space and two quotes, plus the escapes the width ignores
+        room = wrapwidth - len(fieldname) - 3 - len(plural_index)
+        if 0 < wrapwidth and room < len(value) and len(value) > room + sum(map(value.count, _SPECIAL_CHARS)):
+            lines = [''] + [unescape(item) for item in textwrap.wrap(
+                escape(value), wrapwidth - 2, drop_whitespace=False, break_long_words=False
+            )]
+        else:
+            lines = [value]
+    keyword = fieldname[9:] if fieldname.startswith('previous_') else fieldname
+    out.append(f'{prefix}{keyword}{plural_index} "{escape(lines[0])}"')
+    for line in lines[1:]:
+        out.append(f'{prefix}"{escape(line)}"')
+
+
+def _render_entry(entry: CatalogEntry, wrapwidth: int = DEFAULT_WRAPWIDTH) -> str:
+    """Entry text in polib's layout (ends with a newline)"""
+    out: List[str] = []
+    comments = (('tcomment', '# '),) if entry.obsolete else (('tcomment', '# '), ('comment', '#. '))
+    for attribute, prefix in comments:
+        value = getattr(entry, attribute)
+        if not value:
+            continue
+        for comment in value.split('\n'):
+            if wrapwidth > 0 and len(comment) + len(prefix) > wrapwidth:
+                out += textwrap.wrap(comment, wrapwidth, initial_indent=prefix, subsequent_indent=prefix,
+                                     break_long_words=False)
+            else:
+                out.append(prefix + comment)
+
+    if not entry.obsolete and entry.occurrences:
+        files = ' '.join(f"{path}:{line}" if line else path for path, line in entry.occurrences)
+        if wrapwidth > 0 and len(files) + 3 > wrapwidth:
+            # Keep textwrap from splitting file names on hyphens
+            out += [line.replace('*', '-') for line in textwrap.wrap(
+                files.replace('-', '*'), wrapwidth, initial_indent='#: ', subsequent_indent='#: ',
+                break_long_words=False,
+            )]
+        else:
+            out.append('#: ' + files)
+
+    if entry.flags:
+        out.append('#, ' + ', '.join(entry.flags))
+
+    prefix = '#~| ' if entry.obsolete else '#| '
+    for fieldname in ('previous_msgctxt', 'previous_msgid', 'previous_msgid_plural'):
+        value = getattr(entry, fieldname)
+        if value is not None:
+            _render_field(out, fieldname, prefix, '', value, wrapwidth)
+
+    prefix = '#~ ' if entry.obsolete else ''
+    if entry.msgctxt is not None:
+        _render_field(out, 'msgctxt', prefix, '', entry.msgctxt, wrapwidth)
+    _render_field(out, 'msgid', prefix, '', entry.msgid, wrapwidth)
+    if entry.msgid_plural:
+        _render_field(out, 'msgid_plural', prefix, '', entry.msgid_plural, wrapwidth)
+    if entry.msgstr_plural:
+        for index in sorted(entry.msgstr_plural):
+            _render_field(out, 'msgstr', prefix, f'[{index}]', entry.msgstr_plural[index], wrapwidth)
+    else:
+        _render_field(out, 'msgstr', prefix, '', entry.msgstr, wrapwidth)
+    out.append('')
+    return '\n'.join(out)
+
+
+def _render_header(catalog: Catalog) -> str:
+    """Header comment and metadata entry in polib's layout"""
+    lines = []
+    for line in catalog.header.split('\n'):
+        if not line:
+            lines.append('#\n')
+        elif line[:1] in (',', ':'):
+            lines.append(f'#{line}\n')
+        else:
+            lines.append(f'# {line}\n')
+    metadata = CatalogEntry(flags=['fuzzy'] if catalog.metadata_is_fuzzy else [])
+    ordered = catalog.ordered_metadata()
+    if ordered:
+        metadata.msgstr = '\n'.join(f'{name}: {value}' for name, value in ordered) + '\n'
+    return ''.join(lines) + _render_entry(metadata, catalog.wrapwidth)
+
+
+def _header_unchanged(catalog: Catalog) -> bool:
+    if catalog.header_source is None:
+        return False
+    try:
+        parsed = parse_po(catalog.header_source, keep_source=False)
+    except IOError:
+        return False
+    return (parsed.header == catalog.header and parsed.metadata == catalog.metadata
+            and bool(parsed.metadata_is_fuzzy) == bool(catalog.metadata_is_fuzzy) and not parsed.entries)
+
+
+def render_po(catalog: Catalog) -> str:
+    """
+    Render a catalog as PO file content
+
+    Entries (and the header) whose fields still match the source they were
+    read from are written verbatim; the others use polib's layout, so a
+    catalog built in memory renders exactly like polib.POFile.
+
+    Returns:
+        str: File content
+    """
+    wrapwidth = catalog.wrapwidth
+    pieces = []
+    if _header_unchanged(catalog):
+        pieces.append((catalog.header_source, True))
+    else:
+        pieces.append((_render_header(catalog), False))
+    for entry in catalog.entries:
+        if entry.modified():
+            pieces.append((_render_entry(entry, wrapwidth), False))
+        else:
+            pieces.append((entry.source, True))
+
+    out = []
+    last = len(pieces) - 1
+    for position, (text, verbatim) in enumerate(pieces):
+        if not text:
+            continue
+        if out and not out[-1].endswith('\n'):
+            out.append('\n\n')
+        out.append(text)
+        if not verbatim and position < last:
+            # polib separates entries with a blank line
+            out.append('\n')
+    if catalog.trailer:
+        if out and not out[-1].endswith('\n'):
+            out.append('\n')
+        out.append(catalog.trailer)
+    return ''.join(out)
+
+
+def write_po(catalog: Catalog, path, encoding: Optional[str] = None) -> Path:
+    """
+    Write a catalog to a PO file (atomically)
+
+    Args:
+        catalog: Catalog to write
+        path: Destination file
+        encoding: Output encoding (default: the catalog's)
+
+    Returns:
+        Path of the written file
+    """
+    target = Path(path)
+    data = render_po(catalog).encode(encoding or catalog.encoding)
+    fd, partial = tempfile.mkstemp(prefix=target.name, suffix=".part", dir=target.parent or None)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(partial, target)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return target
@@ -0,0 +1,99 @@
+"""
+Streaming PO reader
+Yields the entries of a PO file as polib entries as soon as they are parsed,
+so huge catalogs never sit in memory as a whole
+"""
+from typing import Callable, Iterator, Optional
+
+import polib
+
+from po_translator.core.po_format import CatalogReader, parse_metadata  # noqa: F401 (re-exported)
+
+
+class POStreamReader(CatalogReader):
+    """Iterate over the entries of a PO file with constant memory, as polib entries"""
+
+    def __init__(self, filepath, encoding: Optional[str] = None,
+                 on_progress: Optional[Callable[[int, int], None]] = None,
+                 progress_step: int = 1 << 20, chunk_size: int = 1 << 20):
+        """
+        Initialize reader
+
+        Args:
+            filepath: Path to .po file
+            encoding: File encoding (default: charset from the header)
+            on_progress: Called with (bytes read, file size) every ``progress_step`` bytes
+            progress_step: Bytes between progress reports
+            chunk_size: Bytes read from the file at a time
+        """
+        super().__init__(filepath, encoding, on_progress, progress_step, chunk_size)
+        self.filepath = str(filepath)
+
+    def __iter__(self) -> Iterator[polib.POEntry]:
+        return self.entries()
+
+    def entries(self) -> Iterator[polib.POEntry]:
+        """
+        Parse the file, yielding entries in file order
+
+        The first non-obsolete entry with an empty msgid is the header: it
+        fills ``metadata`` and is not yielded.
+
+        Yields:
+            polib.POEntry
+        """
+        for entry in super().__iter__():
+            yield entry.to_polib()
+
+
+def iter_po_entries(filepath, encoding: Optional[str] = None) -> Iterator[polib.POEntry]:
+    """
+    Stream the entries of a PO file (header excluded)
+
+    Args:
+        filepath: Path to .po file
+        encoding: File encoding (default: from the header)
+
+    Yields:
+        polib.POEntry in file order
+    """
+    return iter(POStreamReader(filepath, encoding))
+
+
+# Compact, picklable form of an entry (for worker processes)
+ENTRY_TUPLE_FIELDS = (
+    'msgid', 'msgstr', 'msgctxt', 'msgid_plural', 'msgstr_plural', 'occurrences', 'flags', 'comment',
+    'tcomment', 'obsolete', 'previous_msgid', 'previous_msgctxt', 'previous_msgid_plural', 'linenum',
+)
+
+
+def entry_to_tuple(entry: polib.POEntry) -> tuple:
+    """
+    Pack an entry into a tuple of plain values
+
+    Returns:
+        tuple: Field values in ``ENTRY_TUPLE_FIELDS`` order
+    """
+    return (
+        entry.msgid, entry.msgstr, entry.msgctxt, entry.msgid_plural,
+        tuple(entry.msgstr_plural.items()), tuple(entry.occurrences), tuple(entry.flags),
+        entry.comment, entry.tcomment, entry.obsolete,
+        entry.previous_msgid, entry.previous_msgctxt, entry.previous_msgid_plural, entry.linenum,
+    )
+
+
+def entry_from_tuple(values: tuple) -> polib.POEntry:
+    """
+    Rebuild an entry packed by ``entry_to_tuple``
+
+    Returns:
+        polib.POEntry
+    """
+    (msgid, msgstr, msgctxt, msgid_plural, msgstr_plural, occurrences, flags, comment,
+     tcomment, obsolete, previous_msgid, previous_msgctxt, previous_msgid_plural, linenum) = values
+    return polib.POEntry(
+        msgid=msgid, msgstr=msgstr, msgctxt=msgctxt, msgid_plural=msgid_plural,
+        msgstr_plural=dict(msgstr_plural), occurrences=list(occurrences), flags=list(flags),
+        comment=comment, tcomment=tcomment, obsolete=obsolete, previous_msgid=previous_msgid,
+        previous_msgctxt=previous_msgctxt, previous_msgid_plural=previous_msgid_plural, linenum=linenum,
+    )
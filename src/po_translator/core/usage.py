@@ -0,0 +1,230 @@
+"""Token usage accounting, cost estimation and budget caps for translation jobs"""
+import json
+import os
+import threading
+from pathlib import Path
+
+# USD per million tokens for Gemini 2.5 Flash-Lite
+DEFAULT_PRICING = {'input': 0.10, 'output': 0.40}
+
+# Used for pre-flight estimates until real throughput has been recorded
+DEFAULT_SECONDS_PER_REQUEST = 2.0
+DEFAULT_OUTPUT_RATIO = 1.2
+
+
+def estimate_tokens(text):
+    """
+    Rough token count used when the API reports no usage
+
+    Args:
+        text: Prompt or response text
+
+    Returns:
+        int: Estimated tokens (~4 characters per token)
+    """
+    if not text:
+        return 0
+    return max(1, (len(text) + 3) // 4)
+
+
+def _empty_usage():
+    return {'requests': 0, 'input_tokens': 0, 'output_tokens': 0, 'estimated_requests': 0, 'cost': 0.0}
+
+
+class UsageLedger:
+    """Aggregate token usage per job, module and language pair"""
+
+    def __init__(self, pricing=None, history_file=None):
+        """
+        Initialize ledger
+
+        Args:
+            pricing: {'input': usd_per_million, 'output': usd_per_million}
+            history_file: JSON file keeping throughput across runs (optional)
+        """
+        self.pricing = dict(pricing or self.pricing_from_env())
+        self.history_file = Path(history_file) if history_file else (
+            Path.home() / ".po_translator" / "usage_history.json"
+        )
+        self._lock = threading.Lock()
+        self.total = _empty_usage()
+        self.by_job = {}
+        self.by_module = {}
+        self.by_pair = {}
+        self.history = self._load_history()
+
+    @staticmethod
+    def pricing_from_env():
+        """Pricing overridable with PO_TRANSLATOR_PRICE_INPUT / PO_TRANSLATOR_PRICE_OUTPUT"""
+        pricing = dict(DEFAULT_PRICING)
+        for key, env in (('input', 'PO_TRANSLATOR_PRICE_INPUT'), ('output', 'PO_TRANSLATOR_PRICE_OUTPUT')):
+            try:
+                pricing[key] = float(os.environ[env])
+            except (KeyError, ValueError):
+                pass
+        return pricing
+
+    def cost(self, input_tokens, output_tokens):
+        """Cost in USD for a token count"""
+        return (input_tokens * self.pricing['input'] + output_tokens * self.pricing['output']) / 1_000_000
+
+    def record(self, input_tokens, output_tokens, module=None, pair=None, job=None,
+               estimated=False, latency=0.0, texts=0, text_tokens=0):
+        """
+        Record one API request
+
+        Args:
+            input_tokens: Prompt tokens
+            output_tokens: Response tokens
+            module: Odoo module of the request
+            pair: Language pair (e.g. 'en→fr')
+            job: Job identifier
+            estimated: True when the API reported no usage metadata
+            latency: Request duration in seconds
+            texts: Number of texts translated by the request
+            text_tokens: Tokens of the source texts alone
+        """
+        cost = self.cost(input_tokens, output_tokens)
+        with self._lock:
+            buckets = [self.total]
+            for table, key in ((self.by_job, job), (self.by_module, module), (self.by_pair, pair)):
+                if key:
+                    buckets.append(table.setdefault(key, _empty_usage()))
+            for usage in buckets:
+                usage['requests'] += 1
+                usage['input_tokens'] += input_tokens
+                usage['output_tokens'] += output_tokens
+                usage['estimated_requests'] += int(estimated)
+                usage['cost'] += cost
+
+            history = self.history
+            history['requests'] += 1
+            history['seconds'] += latency
+            history['texts'] += texts
+            if not estimated:
+                history['text_tokens'] += text_tokens
+                history['output_tokens'] += output_tokens
+
+    def set_job_usage(self, job, usage=None):
+        """Replace a job's totals, e.g. with usage recorded before a resume"""
+        totals = _empty_usage()
+        for key in totals:
+            totals[key] = (usage or {}).get(key, totals[key])
+        with self._lock:
+            self.by_job[job] = totals
+
+    def job_totals(self, job):
+        """Usage of one job"""
+        with self._lock:
+            return dict(self.by_job.get(job, _empty_usage()))
+
+    def report(self):
+        """
+        Get aggregated usage
+
+        Returns:
+            dict: {'total': {...}, 'by_job': {...}, 'by_module': {...}, 'by_pair': {...}}
+        """
+        with self._lock:
+            return {
+                'total': dict(self.total),
+                'by_job': {k: dict(v) for k, v in self.by_job.items()},
+                'by_module': {k: dict(v) for k, v in self.by_module.items()},
+                'by_pair': {k: dict(v) for k, v in self.by_pair.items()},
+            }
+
+    def reset(self):
+        """Clear session totals (history is kept)"""
+        with self._lock:
+            self.total = _empty_usage()
+            self.by_job.clear()
+            self.by_module.clear()
+            self.by_pair.clear()
+
+    # ------------------------------------------------------
+    # Throughput history
+    # ------------------------------------------------------
+    def _load_history(self):
+        history = {'requests': 0, 'seconds': 0.0, 'texts': 0, 'text_tokens': 0, 'output_tokens': 0}
+        try:
+            with open(self.history_file, encoding='utf-8') as f:
+                history.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+        return history
+
+    def save_history(self):
+        """Persist throughput history for future estimates"""
+        try:
+            self.history_file.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock, open(self.history_file, 'w', encoding='utf-8') as f:
+                json.dump(self.history, f, indent=2)
+        except OSError:
+            pass
+
+    def seconds_per_request(self):
+        """Average request latency observed so far"""
+        if self.history['requests']:
+            return self.history['seconds'] / self.history['requests']
+        return DEFAULT_SECONDS_PER_REQUEST
+
+    def output_ratio(self):
+        """Observed output tokens per source text token"""
+        if self.history['text_tokens']:
+            return self.history['output_tokens'] / self.history['text_tokens']
+        return DEFAULT_OUTPUT_RATIO
+
+
+class TokenBudget:
+    """Token and/or cost cap for a translation job"""
+
+    def __init__(self, max_tokens=None, max_cost=None):
+        """
+        Initialize budget
+
+        Args:
+            max_tokens: Maximum input + output tokens (None for no cap)
+            max_cost: Maximum cost in USD (None for no cap)
+        """
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+
+    @classmethod
+    def from_env(cls):
+        """Budget from PO_TRANSLATOR_MAX_TOKENS / PO_TRANSLATOR_MAX_COST"""
+        def read(env, cast):
+            try:
+                return cast(os.environ[env])
+            except (KeyError, ValueError):
+                return None
+        return cls(read('PO_TRANSLATOR_MAX_TOKENS', int), read('PO_TRANSLATOR_MAX_COST', float))
+
+    @property
+    def enabled(self):
+        return self.max_tokens is not None or self.max_cost is not None
+
+    def is_exhausted(self, usage):
+        """
+        Check a job's usage against the cap
+
+        Args:
+            usage: Usage dict as returned by UsageLedger.job_totals()
+
+        Returns:
+            bool: True once the budget is reached
+        """
+        if self.max_tokens is not None:
+            if usage['input_tokens'] + usage['output_tokens'] >= self.max_tokens:
+                return True
+        if self.max_cost is not None and usage['cost'] >= self.max_cost:
+            return True
+        return False
+
+    def describe(self):
+        """Human-readable budget"""
+        parts = []
+        if self.max_tokens is not None:
+            parts.append(f"{self.max_tokens:,} tokens")
+        if self.max_cost is not None:
+            parts.append(f"${self.max_cost:.2f}")
+        return " / ".join(parts) if parts else "unlimited"
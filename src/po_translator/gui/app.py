@@ -5,8 +5,6 @@ Orchestrates all GUI components and business logic
 import math
 import os
 import threading
-from collections import Counter
-from dataclasses import dataclass
 from typing import Dict, Iterable, List, Optional, Tuple
 from tkinter import filedialog, messagebox
 
@@ -16,10 +14,22 @@ except ImportError:
     print("Error: Install dependencies with: pip install -r requirements.txt")
     exit(1)
 
+from po_translator.core.journal import TranslationJournal
+from po_translator.core.language_analysis import (
+    EntryLanguageStatus,
+    ProcessPoolDetector,
+    analyze_languages,
+    estimate_catalog_priors,
+    iter_language_analysis,
+)
 from po_translator.core.merger import POMerger
-from po_translator.translator import Translator
+from po_translator.translator import CancelToken, Translator
 # Using Lingua-py for best accuracy (93.3% vs FastText 66.7%)
-from po_translator.utils.language import detect_language, detect_language_details, is_untranslated
+from po_translator.utils.language import (
+    detect_language_details,
+    is_untranslated,
+    warm_up_detectors,
+)
 from po_translator.utils.logger import get_logger
 
 from .components import Sidebar, Toolbar, TranslationTable, StatusBar
@@ -32,22 +42,12 @@ ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
 
-@dataclass(frozen=True)
-class EntryLanguageStatus:
-    """Language analysis for a PO entry."""
-
-    source_lang: Optional[str]
-    source_confidence: float
-    translation_lang: Optional[str]
-    translation_confidence: float
-    source_matches: Optional[bool]
-    translation_matches: Optional[bool]
-    missing_translation: bool
-
-
 class POTranslatorApp:
     """Main PO Translator Application"""
 
+    # API batches translated in parallel
+    TRANSLATION_WORKERS = 4
+
     def __init__(self):
         self.logger = get_logger('po_translator.gui')
         
@@ -65,7 +65,13 @@ class POTranslatorApp:
         self.filtered_entries = []
         self.unsaved = False
         self.translating = False
+        self.cancel_token = None
         self._language_analysis_cache: Dict[int, tuple] = {}
+        self.source_prior = None  # catalog language distributions (msgids / msgstrs)
+        self.target_prior = None
+        # Language analysis runs in worker processes, off the Tk thread
+        self.language_backend = ProcessPoolDetector()
+        self._analysis_generation = 0
         self.current_page = 1
         self.page_size = 50
         
@@ -86,6 +92,9 @@ class POTranslatorApp:
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.apply_language_settings(show_status=False)
 
+        # Load detector models while the user picks files
+        warm_up_detectors(background=True)
+
         self.logger.info("Application initialized")
     
     def setup_ui(self):
@@ -101,6 +110,8 @@ class POTranslatorApp:
             'save_api_key': self.save_api_key,
             'translate_all': self.translate_all,
             'translate_selected': self.translate_selected,
+            'resume_translation': self.resume_translation,
+            'stop_translation': self.stop_translation,
             'undo': self.undo,
             'redo': self.redo,
             'show_statistics': self.show_statistics,
@@ -142,6 +153,7 @@ class POTranslatorApp:
         self.root.bind("<Control-y>", lambda e: self.redo())
         self.root.bind("<Control-a>", lambda e: self.select_all())
         self.root.bind("<F5>", lambda e: self.refresh())
+        self.root.bind("<Control-r>", lambda e: self.reload_files())
         self.root.bind("<Escape>", lambda e: self.toolbar.clear_search())
         self.root.bind("<Delete>", lambda e: self.delete_selected())
     
@@ -188,7 +200,7 @@ class POTranslatorApp:
 
         files = filedialog.askopenfilenames(
             title="Select PO Files",
-            filetypes=[("PO Files", "*.po"), ("All Files", "*.*")]
+            filetypes=[("PO Files", "*.po"), ("Compiled MO Files", "*.mo"), ("All Files", "*.*")]
         )
         
         if not files:
@@ -202,23 +214,38 @@ class POTranslatorApp:
             self.root.after(0, lambda: self.statusbar.set_status("📂 Loading PO files...", True, "10%"))
             self.root.after(0, lambda: self.statusbar.set_progress(0.1))
             
-            merged = self.merger.merge_files(list(files))
+            def on_progress(done, total):
+                # Parsing covers the 10-50% range of the bar
+                fraction = 0.1 + 0.4 * (done / total if total else 1.0)
+                self.root.after(0, lambda: self.statusbar.set_status(
+                    "📂 Loading PO files...", True, f"{fraction:.0%}"))
+                self.root.after(0, lambda: self.statusbar.set_progress(fraction))
+
+            merged = self.merger.merge_files(list(files), on_progress=on_progress)
             
             self.root.after(0, lambda: self.statusbar.set_status("🔄 Processing entries...", True, "50%"))
             self.root.after(0, lambda: self.statusbar.set_progress(0.5))
             
             entries = list(merged.values())
+
+            # Catalog language distribution, used as a prior for short strings
+            try:
+                priors = estimate_catalog_priors(entries)
+            except Exception as exc:
+                self.logger.debug("Language prior estimation failed: %s", exc)
+                priors = (None, None)
             
             self.root.after(0, lambda: self.statusbar.set_status("✨ Rendering...", True, "90%"))
             self.root.after(0, lambda: self.statusbar.set_progress(0.9))
             
-            self.root.after(0, lambda: self.on_import(entries))
+            self.root.after(0, lambda: self.on_import(entries, priors))
         
         threading.Thread(target=worker, daemon=True).start()
     
-    def on_import(self, entries):
+    def on_import(self, entries, priors=(None, None)):
         """Handle import completion"""
         self.invalidate_language_analysis()
+        self.source_prior, self.target_prior = priors
         self.entries = entries
         self.filtered_entries = entries
         self.table.clear_selection()
@@ -239,12 +266,15 @@ class POTranslatorApp:
         if self.sidebar.api_key_entry.get().strip():
             self.sidebar.enable_translation_buttons()
 
-        if not auto_configured:
+        resumable = self.update_resume_state()
+        if resumable:
+            self.statusbar.set_status("⏯ An interrupted translation job was found for these files. Click Resume Job to continue.")
+        elif not auto_configured:
             self.statusbar.set_status(f"✅ Imported {len(entries)} entries successfully")
     
     def populate(self):
         """Populate table"""
-        status_map = self.build_language_status_map(self.filtered_entries)
+        status_map, stale = self.cached_language_status_map(self.filtered_entries)
         total_entries = len(self.filtered_entries)
         total_pages = self._compute_total_pages(total_entries)
         if self.current_page > total_pages:
@@ -262,11 +292,17 @@ class POTranslatorApp:
         self.update_stats()
         self.update_entry_status_message()
 
+        # Analyse the current page first, then the rest of the view
+        visible = {id(entry) for entry in self.table.visible_entries}
+        stale.sort(key=lambda entry: id(entry) not in visible)
+        self.start_language_analysis(stale)
+
     def invalidate_language_analysis(self, entries: Optional[Iterable] = None):
         """Invalidate cached language analysis for entries."""
 
         if entries is None:
             self._language_analysis_cache.clear()
+            self._analysis_generation += 1  # drop results of a running analysis
             return
 
         entry_ids = {id(entry) for entry in entries}
@@ -274,100 +310,136 @@ class POTranslatorApp:
             if entry_id in entry_ids:
                 self._language_analysis_cache.pop(entry_id, None)
 
-    def build_language_status_map(self, entries: Iterable) -> Dict[int, EntryLanguageStatus]:
-        """Analyse languages for a batch of entries."""
+    def cached_language_status_map(self, entries: Iterable) -> Tuple[Dict[int, EntryLanguageStatus], List]:
+        """Split entries into cached statuses and entries still needing analysis."""
 
         status_map: Dict[int, EntryLanguageStatus] = {}
+        stale = []
         for entry in entries:
+            cached = self._cached_language_status(entry)
+            if cached:
+                status_map[id(entry)] = cached
+            else:
+                stale.append(entry)
+        return status_map, stale
+
+    def start_language_analysis(self, entries: List) -> None:
+        """Analyse entries in the background, streaming results into the table."""
+
+        self._analysis_generation += 1
+        generation = self._analysis_generation
+        if not entries:
+            return
+
+        source = self.translator.source_lang
+        target = self.translator.target_lang
+        catalog = list(self.entries)
+        priors = (self.source_prior, self.target_prior)
+        texts = {id(entry): ((entry.msgid or "").strip(), (entry.msgstr or "").strip()) for entry in entries}
+
+        def worker():
             try:
-                status_map[id(entry)] = self.get_entry_language_status(entry)
+                for block, statuses in iter_language_analysis(
+                    entries, source, target, catalog=catalog,
+                    source_prior=priors[0], target_prior=priors[1],
+                    backend=self.language_backend, block_size=self.language_backend.capacity,
+                ):
+                    if generation != self._analysis_generation:
+                        return
+                    self.root.after(0, lambda b=block, s=statuses: self.on_language_analysis(
+                        generation, source, target, texts, b, s))
             except Exception as exc:
-                self.logger.debug("Language analysis failed for entry: %s", exc)
-        return status_map
+                self.logger.debug("Background language analysis failed: %s", exc)
 
-    def get_entry_language_status(self, entry) -> EntryLanguageStatus:
-        """Return language analysis for a single entry with caching."""
+        threading.Thread(target=worker, name="language-analysis", daemon=True).start()
 
-        entry_id = id(entry)
-        expected_source = self.translator.source_lang
-        expected_target = self.translator.target_lang
+    def on_language_analysis(self, generation, source, target, texts, block, statuses):
+        """Store a block of background analysis results and refresh its rows."""
+
+        if generation != self._analysis_generation:
+            return
+        if (source, target) != (self.translator.source_lang, self.translator.target_lang):
+            return
 
-        msgid = (entry.msgid or "").strip()
-        msgstr = (entry.msgstr or "").strip()
+        updated: Dict[int, EntryLanguageStatus] = {}
+        for entry, status in zip(block, statuses):
+            # Skip entries edited while the analysis was running
+            if texts[id(entry)] != ((entry.msgid or "").strip(), (entry.msgstr or "").strip()):
+                continue
+            self._store_language_status(entry, status)
+            updated[id(entry)] = status
+        if updated:
+            self.table.apply_statuses(updated)
 
-        cached = self._language_analysis_cache.get(entry_id)
-        if cached:
-            cached_msgid, cached_msgstr, cached_source, cached_target, status = cached
-            if (
-                cached_msgid == msgid
-                and cached_msgstr == msgstr
-                and cached_source == expected_source
-                and cached_target == expected_target
-            ):
-                return status
-
-        # Use context-aware detection if we have other entries
-        # This helps with short text detection
-        context_texts = []
-        if self.entries:
-            entry_index = next((i for i, e in enumerate(self.entries) if id(e) == entry_id), None)
-            if entry_index is not None:
-                # Get surrounding entries for context
-                start = max(0, entry_index - 3)
-                end = min(len(self.entries), entry_index + 4)
-                context_texts = [
-                    e.msgid for e in self.entries[start:end] 
-                    if e.msgid and e.msgid.strip() and id(e) != entry_id
-                ]
-        
-        # Use context-aware detection for better accuracy
-        # Pass expected source language as hint for ambiguous cases
-        from po_translator.utils.language import detect_language_with_context
-        src_lang, src_conf = detect_language_with_context(
-            msgid, 
-            context_texts=context_texts[:5] if context_texts else None,
-            min_confidence=0.3,
-            expected_language=expected_source  # Use expected source as hint
-        )
-        missing_translation = is_untranslated(entry.msgid, entry.msgstr)
-
-        trans_lang, trans_conf = (None, 0.0)
-        if not missing_translation and msgstr:
-            # Use context for translation too, with expected target as hint
-            trans_context = [msgid] + context_texts[:4] if context_texts else [msgid]
-            trans_lang, trans_conf = detect_language_with_context(
-                msgstr,
-                context_texts=trans_context,
-                min_confidence=0.3,
-                expected_language=expected_target  # Use expected target as hint
+    def build_language_status_map(self, entries: Iterable) -> Dict[int, EntryLanguageStatus]:
+        """Analyse languages for a batch of entries (blocking)."""
+
+        status_map, stale = self.cached_language_status_map(entries)
+        if not stale:
+            return status_map
+
+        try:
+            # One pass over the file: each string is detected once and the
+            # context votes come from a sliding window over the file order
+            statuses = analyze_languages(
+                stale,
+                self.translator.source_lang,
+                self.translator.target_lang,
+                catalog=self.entries,
+                source_prior=self.source_prior,
+                target_prior=self.target_prior,
+                backend=self.language_backend,
             )
+        except Exception as exc:
+            self.logger.debug("Language analysis failed: %s", exc)
+            return status_map
 
-        source_matches = (src_lang == expected_source) if src_lang else None
-        translation_matches: Optional[bool]
-        if missing_translation:
-            translation_matches = None
-        elif trans_lang:
-            translation_matches = trans_lang == expected_target
-        else:
-            translation_matches = False
-
-        status = EntryLanguageStatus(
-            source_lang=src_lang,
-            source_confidence=src_conf,
-            translation_lang=trans_lang,
-            translation_confidence=trans_conf,
-            source_matches=source_matches,
-            translation_matches=translation_matches,
-            missing_translation=missing_translation,
-        )
+        for entry, status in zip(stale, statuses):
+            self._store_language_status(entry, status)
+            status_map[id(entry)] = status
+        return status_map
 
-        self._language_analysis_cache[entry_id] = (
-            msgid,
-            msgstr,
-            expected_source,
-            expected_target,
+    def _cached_language_status(self, entry) -> Optional[EntryLanguageStatus]:
+        """Cached status of an entry when its texts and languages are unchanged."""
+
+        cached = self._language_analysis_cache.get(id(entry))
+        if not cached:
+            return None
+        cached_msgid, cached_msgstr, cached_source, cached_target, status = cached
+        if (
+            cached_msgid == (entry.msgid or "").strip()
+            and cached_msgstr == (entry.msgstr or "").strip()
+            and cached_source == self.translator.source_lang
+            and cached_target == self.translator.target_lang
+        ):
+            return status
+        return None
+
+    def _store_language_status(self, entry, status: EntryLanguageStatus) -> None:
+        self._language_analysis_cache[id(entry)] = (
+            (entry.msgid or "").strip(),
+            (entry.msgstr or "").strip(),
+            self.translator.source_lang,
+            self.translator.target_lang,
             status,
         )
+
+    def get_entry_language_status(self, entry) -> EntryLanguageStatus:
+        """Return language analysis for a single entry with caching."""
+
+        cached = self._cached_language_status(entry)
+        if cached:
+            return cached
+
+        status = analyze_languages(
+            [entry],
+            self.translator.source_lang,
+            self.translator.target_lang,
+            catalog=self.entries,
+            source_prior=self.source_prior,
+            target_prior=self.target_prior,
+        )[0]
+        self._store_language_status(entry, status)
         return status
 
     def validate_entries_for_translation(self, entries: Iterable) -> Tuple[bool, bool, List]:
@@ -380,7 +452,8 @@ class POTranslatorApp:
         if not entries:
             return True, False, []
 
-        statuses = [self.get_entry_language_status(entry) for entry in entries]
+        status_map = self.build_language_status_map(entries)
+        statuses = [status_map.get(id(entry)) or self.get_entry_language_status(entry) for entry in entries]
         expected_source = self.translator.source_lang
         expected_target = self.translator.target_lang
 
@@ -576,21 +649,18 @@ class POTranslatorApp:
             messagebox.showinfo("Info", "All entries already match the configured languages.")
             return
 
-        est_time = len(entries_to_translate) * 4 // 60
+        force = force_due_to_mismatch or bool(flagged_ids)
         prompt_lines = [
             f"Translate {len(entries_to_translate)} entries?",
         ]
         if flagged_ids:
             prompt_lines.append(f"Re-checking {len(flagged_ids)} existing translation(s).")
-        prompt_lines.extend([
-            "",
-            f"Estimated time: ~{est_time} minute{'s' if est_time != 1 else ''}",
-            "This will use your Gemini API quota.",
-        ])
+        prompt_lines.append("")
+        prompt_lines.extend(self.describe_estimate(entries_to_translate, force))
+        prompt_lines.append("This will use your Gemini API quota.")
         if not messagebox.askyesno("Confirm Translation", "\n".join(prompt_lines)):
             return
 
-        force = force_due_to_mismatch or bool(flagged_ids)
         self.start_translation(entries_to_translate, force=force)
 
     def translate_selected(self):
@@ -635,87 +705,212 @@ class POTranslatorApp:
             messagebox.showinfo("Info", "Selected entries already match the configured languages.")
             return
 
-        est_time = len(entries_to_translate) * 4 // 60
+        force = force_due_to_mismatch or bool(flagged_ids)
         prompt_lines = [
             f"Translate {len(entries_to_translate)} selected entries?",
         ]
         if flagged_ids:
             prompt_lines.append(f"Re-checking {len(flagged_ids)} existing translation(s).")
-        prompt_lines.extend([
-            "",
-            f"Estimated time: ~{est_time} minute{'s' if est_time != 1 else ''}",
-        ])
+        prompt_lines.append("")
+        prompt_lines.extend(self.describe_estimate(entries_to_translate, force))
         if not messagebox.askyesno("Confirm Translation", "\n".join(prompt_lines)):
             return
 
-        force = force_due_to_mismatch or bool(flagged_ids)
         self.start_translation(entries_to_translate, force=force)
 
-    def start_translation(self, entries_to_translate, force=False):
+    def describe_estimate(self, entries, force=False):
+        """Pre-flight estimate lines for the confirmation dialog"""
+        estimate = self.translator.estimate_job(
+            entries, force=force, indexer=self.merger.indexer, max_workers=self.TRANSLATION_WORKERS
+        )
+        minutes = max(1, math.ceil(estimate['seconds'] / 60)) if estimate['requests'] else 0
+        lines = [
+            f"Unique texts: {estimate['unique']} ({estimate['cached']} cached)",
+            f"API requests: ~{estimate['requests']}",
+            f"Estimated tokens: ~{estimate['input_tokens'] + estimate['output_tokens']:,} "
+            f"(~${estimate['cost']:.4f})",
+            f"Estimated time: ~{minutes} minute{'s' if minutes != 1 else ''}",
+        ]
+        if self.translator.budget.enabled:
+            lines.append(f"Budget cap: {self.translator.budget.describe()}")
+        return lines
+
+    def current_journal(self):
+        """Journal for the loaded files and configured language pair"""
+        return TranslationJournal.for_job(
+            self.merger.loaded_files,
+            self.translator.source_lang,
+            self.translator.target_lang,
+        )
+
+    def update_resume_state(self):
+        """Enable the resume button when an interrupted job is recorded"""
+        resumable = bool(self.entries) and not self.translating and self.current_journal().is_resumable()
+        self.sidebar.set_resume_available(resumable)
+        return resumable
+
+    def resume_translation(self):
+        """Resume an interrupted translation job from its journal"""
+        if self.translating:
+            messagebox.showinfo("Translation in Progress", "Please wait for the current translation to finish.")
+            return
+
+        if not self.translator.model:
+            messagebox.showerror("Error", "Please save your API key first")
+            return
+
+        self.apply_language_settings(show_status=False)
+        journal = self.current_journal()
+        if not journal.is_resumable():
+            self.update_resume_state()
+            messagebox.showinfo("Info", "No interrupted translation job found for these files.")
+            return
+
+        header = journal.read()['header'] or {}
+        restored, remaining = journal.resume(self.entries)
+        if restored:
+            self.unsaved = True
+            self.invalidate_language_analysis()
+            self.populate()
+
+        if not remaining:
+            journal.complete()
+            self.update_resume_state()
+            messagebox.showinfo("Job Complete", f"Restored {restored} translation(s). Nothing left to translate.")
+            return
+
+        prompt = (
+            f"Restored {restored} translation(s) from the interrupted job.\n\n"
+            f"Continue translating the remaining {len(remaining)} entries?"
+        )
+        if not messagebox.askyesno("Resume Translation", prompt):
+            return
+
+        journal.reopen()
+        self.start_translation(remaining, force=header.get('force', False), journal=journal)
+
+    def start_translation(self, entries_to_translate, force=False, journal=None):
         """Start translation process with parallel processing"""
         self.apply_language_settings(show_status=False)
+        if journal is None:
+            journal = self.current_journal()
+            journal.start(
+                entries_to_translate,
+                files=list(self.merger.loaded_files),
+                source=self.translator.source_lang,
+                target=self.translator.target_lang,
+                force=force,
+            )
         self.translating = True
+        self.cancel_token = cancel = CancelToken()
+        self.sidebar.set_resume_available(False)
         self.statusbar.set_status("🌐 Translating entries...", True)
         self.sidebar.disable_translation_buttons()
+        self.sidebar.set_stop_available(True)
         
         def worker():
-            import concurrent.futures
-            from queue import Queue
-            
             total = len(entries_to_translate)
             completed = 0
-            progress_queue = Queue()
-            
-            def translate_entry(entry):
-                """Translate single entry"""
-                if not self.translating:
-                    return False
-                module = self.merger.indexer.get_module(entry.msgid)
-                return self.translator.auto_translate_entry(entry, module, force=force)
-            
-            # Use ThreadPoolExecutor for parallel translation (4 threads = 4x faster)
-            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-                futures = {executor.submit(translate_entry, entry): entry for entry in entries_to_translate}
-                
-                for future in concurrent.futures.as_completed(futures):
-                    if not self.translating:
-                        break
-                    
-                    try:
-                        future.result()
-                    except Exception as e:
-                        self.logger.error(f"Translation error: {e}")
-                    
+            error = None
+
+            try:
+                # Results stream in per batch so rows update while the job runs
+                results = self.translator.iter_translate(
+                    entries_to_translate,
+                    force=force,
+                    indexer=self.merger.indexer,
+                    max_workers=self.TRANSLATION_WORKERS,
+                    journal=journal,
+                    cancel=cancel,
+                )
+                for result in results:
+                    if result.status == "failed":
+                        self.logger.error(f"Translation error: {result.error}")
+                    elif result.status == "translated":
+                        self.root.after(0, lambda e=result.entry: self.on_entry_translated(e))
+
                     completed += 1
                     progress = completed / total
                     percent = int(progress * 100)
                     self.root.after(0, lambda p=progress: self.statusbar.set_progress(p))
-                    self.root.after(0, lambda c=completed, t=total, pct=percent: 
+                    self.root.after(0, lambda c=completed, t=total, pct=percent:
                                    self.statusbar.set_status(f"🌐 Translating: {c}/{t} ({pct}%)", True, f"{pct}%"))
-            
-            self.root.after(0, lambda items=entries_to_translate: self.invalidate_language_analysis(items))
-            self.root.after(0, self.on_translate)
-        
+            except Exception as e:
+                error = str(e)
+                self.logger.error(f"Translation job failed: {e}")
+            finally:
+                # An unfinished journal stays resumable
+                paused = self.translator.budget_paused
+                if error is not None or cancel.cancelled or paused:
+                    journal.close()
+                else:
+                    journal.complete()
+
+                self.root.after(0, lambda items=entries_to_translate: self.invalidate_language_analysis(items))
+                self.root.after(0, lambda: self.on_translate(
+                    budget_paused=paused, cancelled=cancel.cancelled, completed=completed, total=total,
+                    error=error
+                ))
+
         threading.Thread(target=worker, daemon=True).start()
-    
-    def on_translate(self):
+
+    def stop_translation(self):
+        """Cancel the running translation job"""
+        if not self.translating or self.cancel_token is None:
+            return
+        self.cancel_token.cancel()
+        self.sidebar.set_stop_available(False)
+        self.statusbar.set_status("⏹ Stopping translation...", True)
+
+    def on_entry_translated(self, entry):
+        """Refresh a single row as soon as its translation arrives"""
+        self.invalidate_language_analysis(entries=[entry])
+        self.table.refresh_entry(entry)
+
+    def on_translate(self, budget_paused=False, cancelled=False, completed=0, total=0, error=None):
         """Translation complete"""
         self.translating = False
+        self.cancel_token = None
         self.populate()
+        self.sidebar.set_stop_available(False)
         self.sidebar.enable_translation_buttons()
-        self.statusbar.set_status("✅ Translation completed successfully!")
+        self.update_resume_state()
         self.unsaved = True
 
+        if cancelled:
+            self.statusbar.set_status(
+                f"⏹ Translation stopped: {completed}/{total} entries processed. Use Resume Job to continue."
+            )
+            return
+
+        if error is not None:
+            self.statusbar.set_status(f"❌ Translation failed: {completed}/{total} entries processed")
+            messagebox.showerror(
+                "Translation Failed",
+                f"The job stopped with an error:\n{error}\n\nUse Resume Job to continue."
+            )
+            return
+
         # Show statistics
         stats = self.translator.get_stats()
-        messagebox.showinfo(
-            "Translation Complete",
-            f"Translation finished!\n\n"
+        details = (
             f"API Calls: {stats['api_calls']}\n"
             f"Cache Hits: {stats['cache_hits']}\n"
             f"Errors: {stats['errors']}\n"
-            f"Cache Hit Rate: {stats['cache_hit_rate']}"
+            f"Cache Hit Rate: {stats['cache_hit_rate']}\n"
+            f"Tokens: {stats['input_tokens'] + stats['output_tokens']:,} ({stats['estimated_cost']})"
         )
+        if budget_paused:
+            self.statusbar.set_status("⏸ Translation paused: budget reached")
+            messagebox.showwarning(
+                "Budget Reached",
+                f"The job was paused after reaching its budget of {self.translator.budget.describe()}.\n"
+                f"Raise the budget and use Resume Job to continue.\n\n{details}"
+            )
+            return
+
+        self.statusbar.set_status("✅ Translation completed successfully!")
+        messagebox.showinfo("Translation Complete", f"Translation finished!\n\n{details}")
     
     def undo(self):
         """Undo last action"""
@@ -801,6 +996,46 @@ class POTranslatorApp:
         self.populate()
         self.statusbar.set_status("🔄 View refreshed")
     
+    def reload_files(self):
+        """Reload the imported files from disk, re-parsing only the changed ones"""
+        if self.translating or not self.merger.loaded_files:
+            return
+        if not self.confirm_discard_changes("to reload the files"):
+            return
+
+        self.statusbar.set_status("📂 Reloading changed files...", True)
+        self.sidebar.btn_import.configure(state="disabled")
+
+        def worker():
+            report = self.merger.refresh_files()
+            self.root.after(0, lambda: self.on_reload(report))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def on_reload(self, report):
+        """Handle reload completion"""
+        self.sidebar.btn_import.configure(state="normal")
+        if report['full_merge']:
+            self.on_import(self.merger.get_entries_list(), (self.source_prior, self.target_prior))
+            return
+        changed = len(report['changed_files']) + len(report['removed_files'])
+        if not changed:
+            self.statusbar.set_status("✅ Files unchanged on disk")
+            return
+
+        # Replaced entries are new objects: stale undo steps and analyses go
+        self.invalidate_language_analysis()
+        self.undo_manager.clear()
+        self.entries = self.merger.get_entries_list()
+        self.unsaved = False
+        self.table.clear_selection()
+        self.apply_filter()
+        self.update_resume_state()
+        self.statusbar.set_status(
+            f"✅ Reloaded {changed} file(s): {report['added']} added, "
+            f"{report['updated']} updated, {report['deleted']} removed entries"
+        )
+    
     def run(self):
         """Run application"""
         self.root.mainloop()
@@ -823,6 +1058,7 @@ class POTranslatorApp:
 
         if changed:
             self.invalidate_language_analysis()
+            self.update_resume_state()
 
         if changed and show_status and not self.translating:
             source = settings['source'].upper()
@@ -833,20 +1069,16 @@ class POTranslatorApp:
     def auto_configure_languages(self):
         """Auto-detect entry language and adjust translator defaults"""
         changed = False
-        samples = [entry.msgid for entry in self.entries if entry.msgid]
-        if not samples:
-            return changed
-
-        language_votes = Counter()
-        for text in samples[:50]:
-            detected = detect_language(text)
-            if detected in self.translator.LANGUAGES:
-                language_votes[detected] += 1
-
-        if not language_votes:
+        # Distribution of every msgid, estimated once at import
+        candidates = {
+            code: share for code, share in (self.source_prior or {}).items()
+            if code in self.translator.LANGUAGES
+        }
+        if not candidates:
             return changed
 
-        dominant_lang, count = language_votes.most_common(1)[0]
+        dominant_lang = max(candidates, key=candidates.get)
+        count = round(candidates[dominant_lang] * len(self.entries))
         if dominant_lang != self.translator.target_lang:
             return changed
 
@@ -944,6 +1176,11 @@ class POTranslatorApp:
         if not self.confirm_discard_changes("and exit"):
             return
 
+        if self.translating and self.cancel_token is not None:
+            # Queued batches are dropped; the journal keeps the job resumable
+            self.cancel_token.cancel()
+
+        self.language_backend.close()
         self.logger.info("Application closed")
         self.root.destroy()
 
@@ -22,6 +22,8 @@ class Sidebar:
         self.callbacks = callbacks
         self.translation_enabled = False
         self.has_selection = False
+        self.resume_available = False
+        self.stop_available = False
         self.btn_delete = None
 
         # Scrollable sidebar frame
@@ -219,13 +221,44 @@ class Sidebar:
             state="disabled"
         )
         self.btn_translate_selected.grid(row=12, column=0, padx=20, pady=(0, 0), sticky="ew")
+
+        job_frame = ctk.CTkFrame(self.frame, fg_color="transparent")
+        job_frame.grid(row=13, column=0, padx=20, pady=(8, 0), sticky="ew")
+        job_frame.grid_columnconfigure((0, 1), weight=1)
+
+        self.btn_resume = ctk.CTkButton(
+            job_frame,
+            text="⏯  Resume Job",
+            command=self.callbacks['resume_translation'],
+            height=38,
+            font=THEME.font(size=12, weight="bold"),
+            fg_color=THEME.SURFACE_RAISED,
+            hover_color=THEME.SURFACE_HOVER,
+            corner_radius=8,
+            state="disabled"
+        )
+        self.btn_resume.grid(row=0, column=0, padx=(0, 4), sticky="ew")
+
+        self.btn_stop = ctk.CTkButton(
+            job_frame,
+            text="⏹  Stop",
+            command=self.callbacks['stop_translation'],
+            height=38,
+            font=THEME.font(size=12, weight="bold"),
+            fg_color=THEME.ACCENT_DANGER,
+            hover_color="#b91c1c",
+            text_color="#ffffff",
+            corner_radius=8,
+            state="disabled"
+        )
+        self.btn_stop.grid(row=0, column=1, padx=(4, 0), sticky="ew")
     
     def create_actions_section(self):
         """Create actions section"""
-        self.create_section_label("ACTIONS", 13)
+        self.create_section_label("ACTIONS", 14)
         
         actions_frame = ctk.CTkFrame(self.frame, fg_color="transparent")
-        actions_frame.grid(row=14, column=0, padx=20, pady=(0, 8), sticky="ew")
+        actions_frame.grid(row=15, column=0, padx=20, pady=(0, 8), sticky="ew")
         actions_frame.grid_columnconfigure(0, weight=1)
         actions_frame.grid_columnconfigure(1, weight=1)
         
@@ -268,7 +301,7 @@ class Sidebar:
         self.create_button(
             "📊  Statistics",
             self.callbacks['show_statistics'],
-            15,
+            16,
             THEME.ACCENT_PRIMARY,
             hover=THEME.ACCENT_PRIMARY_HOVER,
             height=38
@@ -276,10 +309,10 @@ class Sidebar:
     
     def create_stats_section(self):
         """Create statistics section"""
-        self.create_section_label("STATISTICS", 16)
+        self.create_section_label("STATISTICS", 17)
         
         stats_frame = ctk.CTkFrame(self.frame, fg_color=THEME.SURFACE_ALT, corner_radius=12)
-        stats_frame.grid(row=17, column=0, padx=20, pady=(0, 10), sticky="ew")
+        stats_frame.grid(row=18, column=0, padx=20, pady=(0, 10), sticky="ew")
 
         self.lbl_total = self.create_stat_label(stats_frame, "Total Entries", "0", 0)
         self.lbl_translated = self.create_stat_label(stats_frame, "✅ Translated", "0", 1, THEME.ACCENT_SUCCESS)
@@ -289,7 +322,7 @@ class Sidebar:
     def create_footer(self):
         """Create footer"""
         footer = ctk.CTkFrame(self.frame, fg_color="transparent")
-        footer.grid(row=18, column=0, padx=20, pady=20, sticky="s")
+        footer.grid(row=19, column=0, padx=20, pady=20, sticky="s")
         
         ctk.CTkLabel(
             footer,
@@ -410,12 +443,24 @@ class Sidebar:
             self.btn_delete.configure(state=state)
         self._update_translation_buttons()
 
+    def set_resume_available(self, available):
+        """Enable/disable resuming an interrupted translation job"""
+        self.resume_available = available
+        self._update_translation_buttons()
+
+    def set_stop_available(self, available):
+        """Enable/disable stopping the running translation job"""
+        self.stop_available = available
+        self.btn_stop.configure(state="normal" if available else "disabled")
+
     def _update_translation_buttons(self):
         """Update translation button states based on current flags"""
         translate_state = "normal" if self.translation_enabled else "disabled"
         selected_state = "normal" if self.translation_enabled and self.has_selection else "disabled"
+        resume_state = "normal" if self.translation_enabled and self.resume_available else "disabled"
         self.btn_translate.configure(state=translate_state)
         self.btn_translate_selected.configure(state=selected_state)
+        self.btn_resume.configure(state=resume_state)
     
     def get_language_settings(self):
         """Get current language settings"""
@@ -27,6 +27,7 @@ class TranslationTable:
         self.visible_entries = []
         self.selected_entries = set()
         self.status_map = {}
+        self.merger = None
         self.header_select_var = ctk.BooleanVar(value=False)
         self._updating_header = False
         self._updating_page_controls = False
@@ -227,6 +228,7 @@ class TranslationTable:
             widget.destroy()
 
         self.entries = entries
+        self.merger = merger
         self.status_map = status_map or {}
         self.page = max(1, page)
         self.page_size = page_size or 0
@@ -262,6 +264,39 @@ class TranslationTable:
         self.update_pagination_bar(start, end, total_entries)
         self.update_selection_controls()
 
+    def refresh_entry(self, entry):
+        """
+        Redraw the row of an entry if it is on the current page
+
+        Args:
+            entry: PO entry whose msgid/msgstr changed
+        """
+        idx = next((i for i, e in enumerate(self.visible_entries) if e is entry), None)
+        if idx is None or self.merger is None:
+            return
+
+        # The cached analysis no longer matches the new text
+        self.status_map.pop(id(entry), None)
+        for widget in self.table.grid_slaves(row=idx):
+            widget.destroy()
+        self.create_row(idx, entry, self.merger)
+
+    def apply_statuses(self, statuses):
+        """
+        Add language analysis results and redraw the affected visible rows
+
+        Args:
+            statuses: {id(entry): EntryLanguageStatus}
+        """
+        self.status_map.update(statuses)
+        if self.merger is None:
+            return
+        for idx, entry in enumerate(self.visible_entries):
+            if id(entry) in statuses:
+                for widget in self.table.grid_slaves(row=idx):
+                    widget.destroy()
+                self.create_row(idx, entry, self.merger)
+
     def create_row(self, idx, entry, merger):
         """Create table row"""
         is_translated = not is_untranslated(entry.msgid, entry.msgstr)
@@ -30,7 +30,7 @@ class ExportDialog:
         
         self.dialog = ctk.CTkToplevel(parent)
         self.dialog.title("Export Options")
-        self.dialog.geometry("500x400")
+        self.dialog.geometry("500x450")
         
         # Wait for window to be visible before grabbing
         self.dialog.after(100, lambda: self.dialog.grab_set())
@@ -38,6 +38,7 @@ class ExportDialog:
         self.export_translated = ctk.BooleanVar(value=True)
         self.export_untranslated = ctk.BooleanVar(value=False)
         self.compile_mo = ctk.BooleanVar(value=True)
+        self.split_modules = ctk.BooleanVar(value=False)
         
         self.setup_ui()
     
@@ -93,6 +94,15 @@ class ExportDialog:
             fg_color=THEME.ACCENT_PRIMARY,
         ).pack(anchor="w", pady=8)
 
+        ctk.CTkCheckBox(
+            content,
+            text="Split per module (<module>/i18n/<lang>.po)",
+            variable=self.split_modules,
+            font=THEME.font(size=12),
+            hover_color=THEME.ACCENT_PRIMARY_HOVER,
+            fg_color=THEME.ACCENT_PRIMARY,
+        ).pack(anchor="w", pady=8)
+
         # Footer
         footer = ctk.CTkFrame(self.dialog, fg_color="transparent")
         footer.pack(fill="x", padx=25, pady=(0, 20), side="bottom")
@@ -121,6 +131,10 @@ class ExportDialog:
     
     def export(self):
         """Execute export"""
+        if self.split_modules.get():
+            self.export_modules()
+            return
+        
         filename = filedialog.asksaveasfilename(
             defaultextension=".po",
             filetypes=[("PO Files", "*.po")],
@@ -128,18 +142,30 @@ class ExportDialog:
         )
         
         if filename:
-            # Export file
-            self.merger.export_to_file(filename)
-            
-            # Compile .mo if requested
+            # Export file, compiling the .mo from the same entries if requested
             if self.compile_mo.get():
                 mo_file = filename.replace('.po', '.mo')
-                self.merger.compile_mo(filename, mo_file)
+                self.merger.export_to_file(filename, mo_filepath=mo_file)
                 message = f"Exported to:\n{filename}\n{mo_file}"
             else:
+                self.merger.export_to_file(filename)
                 message = f"Exported to:\n{filename}"
             
             self.on_export_callback(filename, self.compile_mo.get())
             self.dialog.destroy()
             messagebox.showinfo("Success", message)
-
+    
+    def export_modules(self):
+        """Write one file per module into a chosen addons directory"""
+        directory = filedialog.askdirectory(title="Select Addons Directory")
+        if not directory:
+            return
+        
+        written = self.merger.export_modules(directory, compile_mo=self.compile_mo.get())
+        if written is None:
+            messagebox.showerror("Export Failed", f"Could not write the module files to:\n{directory}")
+            return
+        
+        self.on_export_callback(directory, False)
+        self.dialog.destroy()
+        messagebox.showinfo("Success", f"Exported {len(written)} modules to:\n{directory}")
@@ -53,11 +53,12 @@ class StatisticsDialog:
         content.pack(fill="both", expand=True, padx=25, pady=20)
         
         # Calculate statistics
-        from po_translator.utils.language import is_untranslated
+        from po_translator.utils.language import detection_cache_stats, detection_tier_stats, is_untranslated
         
         total = len(self.entries)
         translated = sum(1 for e in self.entries if not is_untranslated(e.msgid, e.msgstr))
         stats = self.translator.get_stats()
+        detection = detection_cache_stats()
         
         stats_data = [
             ("Project Statistics", [
@@ -69,6 +70,7 @@ class StatisticsDialog:
                 ("Total Requests", str(stats['total_requests'])),
                 ("API Calls", str(stats['api_calls'])),
                 ("Cache Hits", str(stats['cache_hits'])),
+                ("Memory Hits", str(stats['memory_hits'])),
                 ("Cache Hit Rate", stats['cache_hit_rate']),
                 ("Errors", str(stats['errors'])),
                 ("Retries", str(stats['retries']))
@@ -76,8 +78,31 @@ class StatisticsDialog:
             ("Cache Information", [
                 ("Cache Entries", str(stats['cache_entries'])),
                 ("API Efficiency", stats['api_efficiency'])
+            ]),
+            ("Token Usage", [
+                ("Input Tokens", f"{stats['input_tokens']:,}"),
+                ("Output Tokens", f"{stats['output_tokens']:,}"),
+                ("Estimated Cost", stats['estimated_cost']),
+                ("Budget", self.translator.budget.describe())
+            ]),
+            ("Language Detection Cache", [
+                ("Stored Detections", str(detection['entries'])),
+                ("Persistent Hits", str(detection['hits'])),
+                ("Persistent Hit Rate", detection['hit_rate']),
+                ("In-Memory Hits", str(detection['memory_hits']))
+            ]),
+            ("Language Detection Tiers", [
+                (tier.capitalize(), str(count)) for tier, count in detection_tier_stats().items()
             ])
         ]
+
+        usage = self.translator.usage.report()
+        for section, table in (("Tokens per Module", usage['by_module']), ("Tokens per Language Pair", usage['by_pair'])):
+            if table:
+                stats_data.append((section, [
+                    (name, f"{u['input_tokens'] + u['output_tokens']:,} (${u['cost']:.4f})")
+                    for name, u in sorted(table.items())
+                ]))
         
         for section, items in stats_data:
             section_frame = ctk.CTkFrame(content, fg_color=THEME.SURFACE_RAISED, corner_radius=12)
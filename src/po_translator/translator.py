@@ -9,10 +9,16 @@ Translator v1.0.0
 - Compatible with test_translation_debug.py & app.py
 """
 
+import concurrent.futures
+import queue
 import time
 import json
 import re
+import threading
+import uuid
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, List, Optional
 
 try:
     import google.generativeai as genai
@@ -22,11 +28,78 @@ except ImportError:
     AVAILABLE = False
 
 # Using Lingua-py for best accuracy (93.3% vs FastText 66.7%)
-from po_translator.utils.language import is_french_text, is_english_text, detect_language
+from po_translator.core.mo_format import MOCatalog
+from po_translator.core.usage import TokenBudget, UsageLedger, estimate_tokens
+from po_translator.utils.language import (
+    is_french_text, is_english_text, detect_language, detect_languages, register_glossary_terms
+)
 from po_translator.utils.file_utils import sanitize_text
 from po_translator.utils.logger import get_logger
 
 
+# Where a translation came from
+SOURCE_CACHE = "cache"
+SOURCE_MEMORY = "tm"  # A translation memory (compiled catalog)
+SOURCE_API = "api"
+
+# _plan_entry() marker for "language not detected yet"
+_NOT_DETECTED = object()
+
+
+# ==========================================================
+# RESULTS
+# ==========================================================
+@dataclass(frozen=True)
+class TranslationResult:
+    """Outcome of translating one PO entry."""
+
+    entry: Any
+    status: str  # "translated", "skipped" or "failed"
+    translation: Optional[str] = None
+    source: Optional[str] = None  # SOURCE_* constant, None when nothing was requested
+    latency: float = 0.0
+    module: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self):
+        """JSON-serializable view (without the entry object)"""
+        return {
+            "msgid": self.entry.msgid,
+            "msgctxt": getattr(self.entry, "msgctxt", None),
+            "status": self.status,
+            "translation": self.translation,
+            "source": self.source,
+            "latency": round(self.latency, 4),
+            "module": self.module,
+            "error": self.error,
+        }
+
+
+@dataclass
+class TranslationBatch:
+    """Entries of one module sent together in a shared-context prompt."""
+
+    module: Optional[str]
+    from_lang: str
+    cache_context: str
+    entries: List[Any] = field(default_factory=list)
+
+
+class CancelToken:
+    """Cooperative cancellation flag shared by a caller and worker threads."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Request cancellation; dispatch stops and pending batches are dropped"""
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
 # ==========================================================
 # CACHE
 # ==========================================================
@@ -37,6 +110,7 @@ class TranslationCache:
         cache_dir.mkdir(exist_ok=True)
         self.cache_file = cache_dir / (cache_file or "translation_cache.json")
         self.cache = self._load_cache()
+        self._lock = threading.Lock()  # batches write from worker threads
 
     def _load_cache(self):
         if self.cache_file.exists():
@@ -49,7 +123,7 @@ class TranslationCache:
 
     def _save(self):
         try:
-            with open(self.cache_file, "w", encoding="utf-8") as f:
+            with self._lock, open(self.cache_file, "w", encoding="utf-8") as f:
                 json.dump(self.cache, f, ensure_ascii=False, indent=2)
         except Exception:
             pass
@@ -58,7 +132,15 @@ class TranslationCache:
         return self.cache.get(f"{text}|{context or ''}")
 
     def set(self, text, translation, context=None):
-        self.cache[f"{text}|{context or ''}"] = translation
+        with self._lock:
+            self.cache[f"{text}|{context or ''}"] = translation
+        self._save()
+
+    def set_many(self, items, context=None):
+        """Store several (text, translation) pairs with a single save"""
+        with self._lock:
+            for text, translation in items:
+                self.cache[f"{text}|{context or ''}"] = translation
         self._save()
 
     def clear(self):
@@ -110,6 +192,7 @@ class Translator:
     def __init__(self, api_key=None):
         self.logger = get_logger("po_translator.translator")
         self.cache = TranslationCache()
+        self.memories = []  # (from_lang, to_lang, MOCatalog) consulted on cache misses
         self.api_key = api_key
         self.model = None
 
@@ -117,17 +200,31 @@ class Translator:
         self.target_lang = "fr"
         self.auto_detect = True
 
+        # The glossary doubles as a dictionary for the cheap detection tier
+        for lang, terms in self.ODOO_TERMS.items():
+            register_glossary_terms(self.source_lang, terms.keys())
+            register_glossary_terms(lang, terms.values())
+
         self.last_request = 0
         self.rate_limit = 0.1  # ~10 requests/sec
+        self.batch_size = 20  # entries per shared-context prompt
+
+        # Token accounting and per-job budget cap
+        self.usage = UsageLedger()
+        self.budget = TokenBudget.from_env()
+        self.job_id = None
+        self.budget_paused = False
 
         # Stats
         self.stats = {
             "total_requests": 0,
             "cache_hits": 0,
+            "memory_hits": 0,
             "api_calls": 0,
             "errors": 0,
             "retries": 0,
             "auto_corrections": 0,
+            "batch_calls": 0,
         }
 
         if api_key and AVAILABLE:
@@ -188,9 +285,103 @@ Glossary for consistent terminology:
 """
         return prompt.strip()
 
+    def _get_batch_prompt(self, texts, from_lang, to_lang, context=None):
+        """Shared-context prompt translating several texts in one request"""
+        prompt = self._get_prompt(from_lang, to_lang, context)
+        items = json.dumps(list(texts), ensure_ascii=False, indent=2)
+        prompt += f"""
+
+The texts below all belong to the same context. Translate each item of the
+JSON array and return ONLY a JSON array of strings with the translations,
+in the same order and with the same number of items.
+
+Texts:
+{items}
+Translations:"""
+        return prompt
+
     # ------------------------------------------------------
     # Helpers
     # ------------------------------------------------------
+    @staticmethod
+    def _cache_key(from_lang, to_lang, context=None):
+        return f"{from_lang}→{to_lang}|{context or ''}"
+
+    def _get_cached(self, text, from_lang, to_lang, cache_context=None, legacy_contexts=(), promote=True):
+        """
+        Look up a cached translation, promoting hits from legacy keys, then the translation memories
+
+        Returns:
+            tuple: (translation, SOURCE_CACHE or SOURCE_MEMORY), or (None, None) on a miss
+        """
+        key = self._cache_key(from_lang, to_lang, cache_context)
+        cached = self.cache.get(text, key)
+        if cached:
+            return cached, SOURCE_CACHE
+
+        # Older releases keyed every entry on its module context
+        for legacy in legacy_contexts:
+            cached = self.cache.get(text, self._cache_key(from_lang, to_lang, legacy))
+            if cached:
+                if promote:
+                    self.cache.set(text, cached, key)
+                return cached, SOURCE_CACHE
+
+        for memory_from, memory_to, memory in self.memories:
+            if (memory_from, memory_to) == (from_lang, to_lang):
+                cached = memory.lookup(text, cache_context or None)
+                if cached:
+                    return cached, SOURCE_MEMORY
+        return None, None
+
+    def _count_hit(self, source):
+        self.stats["memory_hits" if source == SOURCE_MEMORY else "cache_hits"] += 1
+
+    @staticmethod
+    def _parse_batch_response(raw, expected):
+        """Parse a JSON array answer, returning None when it is unusable"""
+        raw = raw or ""
+        # Tolerate markdown fences or chatter around the array
+        start, end = raw.find("["), raw.rfind("]")
+        if start == -1 or end <= start:
+            return None
+        try:
+            items = json.loads(raw[start:end + 1])
+        except ValueError:
+            return None
+        if not isinstance(items, list) or len(items) != expected:
+            return None
+        if not all(isinstance(item, str) for item in items):
+            return None
+        return [item.strip().strip('"\'') for item in items]
+
+    def _record_usage(self, response, prompt, answer, texts, from_lang, to_lang, module, latency):
+        """Account the tokens of one API request (estimated when the API reports none)"""
+        metadata = getattr(response, "usage_metadata", None)
+        input_tokens = getattr(metadata, "prompt_token_count", None)
+        output_tokens = getattr(metadata, "candidates_token_count", None)
+        estimated = not isinstance(input_tokens, int) or not isinstance(output_tokens, int)
+        if estimated:
+            input_tokens = estimate_tokens(prompt)
+            output_tokens = estimate_tokens(answer)
+        self.usage.record(
+            input_tokens,
+            output_tokens,
+            module=module or "unknown",
+            pair=f"{from_lang}→{to_lang}",
+            job=self.job_id,
+            estimated=estimated,
+            latency=latency,
+            texts=len(texts),
+            text_tokens=sum(estimate_tokens(text) for text in texts),
+        )
+
+    def _budget_exhausted(self):
+        """Check the current job's usage against the budget cap"""
+        if not self.budget.enabled:
+            return False
+        return self.budget.is_exhausted(self.usage.job_totals(self.job_id))
+
     def _rate_limit(self):
         elapsed = time.time() - self.last_request
         if elapsed < self.rate_limit:
@@ -207,6 +398,34 @@ Glossary for consistent terminology:
             return False
         return True
 
+    def add_translation_memory(self, path, from_lang="en", to_lang=None):
+        """
+        Answer cache misses from a compiled catalog, e.g. a deployed .mo file
+
+        The catalog is memory-mapped and only read: each miss looks the text
+        up in it (msgctxt included) and its translations are never copied into
+        the JSON cache.
+
+        Args:
+            path: Path to .mo file
+            from_lang: Language of the msgids (Odoo catalogs: English)
+            to_lang: Language of the translations (default: the Language header)
+
+        Returns:
+            str: Target language of the memory
+
+        Raises:
+            ValueError: Not an MO file, or no target language known
+        """
+        memory = MOCatalog(path)
+        to_lang = to_lang or memory.language
+        if not to_lang:
+            memory.close()
+            raise ValueError(f"{path} has no Language header: give its target language")
+        self.memories.append((from_lang, to_lang, memory))
+        self.logger.info(f"Translation memory {path}: {len(memory)} messages ({from_lang} → {to_lang})")
+        return to_lang
+
     def configure_languages(self, source=None, target=None, auto_detect=None):
         """Configure source/target languages and auto-detection"""
         changed = False
@@ -243,21 +462,45 @@ Glossary for consistent terminology:
     # ------------------------------------------------------
     # Main translation
     # ------------------------------------------------------
-    def translate(self, text, from_lang=None, to_lang=None, context=None, max_retries=1):
+    def translate(self, text, from_lang=None, to_lang=None, context=None, max_retries=1,
+                  cache_context=None, legacy_contexts=()):
+        """Translate a single text
+
+        ``context`` goes into the prompt; the cache is keyed on ``cache_context``
+        (defaults to ``context``, pass ``""`` to share across contexts).
+        """
+        return self._translate_text(
+            text, from_lang, to_lang, context, max_retries, cache_context, legacy_contexts
+        )[0]
+
+    def _translate_text(self, text, from_lang=None, to_lang=None, context=None, max_retries=1,
+                        cache_context=None, legacy_contexts=()):
+        """Same as translate() but returns (translation, source)"""
         if not text or not self.model:
-            return text
+            return text, None
 
         text = sanitize_text(text)
         from_lang = from_lang or self.source_lang
         to_lang = to_lang or self.target_lang
         self.stats["total_requests"] += 1
 
-        cache_key = f"{from_lang}→{to_lang}|{context or ''}"
-        cached = self.cache.get(text, cache_key)
+        if cache_context is None:
+            cache_context = context
+        cached, source = self._get_cached(text, from_lang, to_lang, cache_context, legacy_contexts)
         if cached:
-            self.stats["cache_hits"] += 1
-            return cached
+            self._count_hit(source)
+            return cached, source
 
+        cache_key = self._cache_key(from_lang, to_lang, cache_context)
+        return self._request_translation(text, from_lang, to_lang, context, cache_key, max_retries), SOURCE_API
+
+    def _request_translation(self, text, from_lang, to_lang, context, cache_key, max_retries=1, failures=None):
+        """
+        Ask the API for one translation, returning the original text on failure
+
+        The reason of a failure (API error or no valid answer) is stored under
+        the text in ``failures`` when given.
+        """
         for attempt in range(max_retries + 1):
             try:
                 self._rate_limit()
@@ -265,8 +508,13 @@ Glossary for consistent terminology:
 
                 prompt = self._get_prompt(from_lang, to_lang, context)
                 prompt += f"\n\nText: {text}\nTranslation:"
+                started = time.perf_counter()
                 response = self.model.generate_content(prompt)
-                translation = response.text.strip().strip('"\'')
+                answer = response.text
+                self._record_usage(
+                    response, prompt, answer, [text], from_lang, to_lang, context, time.perf_counter() - started
+                )
+                translation = answer.strip().strip('"\'')
                 if "\n" in translation:
                     translation = translation.split("\n")[0]
 
@@ -281,6 +529,8 @@ Glossary for consistent terminology:
                         time.sleep(0.5)
                         continue
                     else:
+                        if failures is not None:
+                            failures[text] = "No valid translation in the API answer"
                         return text
 
             except Exception as e:
@@ -290,32 +540,159 @@ Glossary for consistent terminology:
                     time.sleep(1)
                     continue
                 else:
+                    if failures is not None:
+                        failures[text] = f"API error: {e}"
                     return text
 
         return text
 
+    def translate_batch(self, texts, from_lang=None, to_lang=None, context=None, cache_context=None,
+                        legacy_contexts=()):
+        """
+        Translate several texts sharing one context header in a single request
+
+        Args:
+            texts: Texts to translate
+            from_lang: Source language code
+            to_lang: Target language code
+            context: Shared prompt context (e.g. module name)
+            cache_context: Cache namespace (defaults to ``context``)
+            legacy_contexts: Older cache namespaces checked on a miss
+
+        Returns:
+            dict: {text: translation}; untranslatable texts map to themselves
+        """
+        outcomes = self._translate_many(texts, from_lang, to_lang, context, cache_context, legacy_contexts)
+        return {text: translation for text, (translation, _source) in outcomes.items()}
+
+    def _translate_many(self, texts, from_lang=None, to_lang=None, context=None, cache_context=None,
+                        legacy_contexts=(), failures=None):
+        """
+        Same as translate_batch() but maps each text to (translation, source)
+
+        Texts the API failed to translate are also stored in ``failures``
+        (when given) with the reason.
+        """
+        from_lang = from_lang or self.source_lang
+        to_lang = to_lang or self.target_lang
+        if cache_context is None:
+            cache_context = context
+        cache_key = self._cache_key(from_lang, to_lang, cache_context)
+
+        results = {}
+        pending = []
+        for text in texts:
+            text = sanitize_text(text)
+            if not text or text in results or text in pending:
+                continue
+            if not self.model:
+                results[text] = (text, None)
+                continue
+            self.stats["total_requests"] += 1
+            cached, source = self._get_cached(text, from_lang, to_lang, cache_context, legacy_contexts)
+            if cached:
+                self._count_hit(source)
+                results[text] = (cached, source)
+            else:
+                pending.append(text)
+
+        invalid = []
+        if len(pending) == 1:
+            # Nothing to share: the single-text path has its own retry logic
+            invalid = pending
+        elif pending:
+            translations = None
+            try:
+                self._rate_limit()
+                self.stats["api_calls"] += 1
+                self.stats["batch_calls"] += 1
+                prompt = self._get_batch_prompt(pending, from_lang, to_lang, context)
+                started = time.perf_counter()
+                response = self.model.generate_content(
+                    prompt,
+                    generation_config={"max_output_tokens": 256 * len(pending)},
+                )
+                answer = response.text
+                self._record_usage(
+                    response, prompt, answer, pending, from_lang, to_lang, context, time.perf_counter() - started
+                )
+                translations = self._parse_batch_response(answer, len(pending))
+            except Exception as e:
+                self.stats["errors"] += 1
+                self.logger.error(f"Batch translation error: {e}")
+
+            if translations is None:
+                self.logger.warning(f"Unusable batch answer for {len(pending)} texts, retrying one by one")
+                invalid = pending
+            else:
+                valid = []
+                for text, translation in zip(pending, translations):
+                    if self._validate_translation(text, translation):
+                        results[text] = (translation, SOURCE_API)
+                        valid.append((text, translation))
+                    else:
+                        invalid.append(text)
+                if valid:
+                    self.cache.set_many(valid, cache_key)
+                    self.logger.info(f"[OK] Batch of {len(valid)} texts ({context or 'Odoo ERP'})")
+
+        for text in invalid:
+            translation = self._request_translation(text, from_lang, to_lang, context, cache_key, failures=failures)
+            results[text] = (translation, SOURCE_API)
+
+        return results
+
     # ------------------------------------------------------
     # Auto translation for PO entry
     # ------------------------------------------------------
-    def auto_translate_entry(self, entry, module=None, force=False):
-        """Auto-translate PO entry intelligently"""
-        if not self.model or not entry.msgid:
-            return False
+    @staticmethod
+    def _entry_cache_context(entry):
+        """Cache namespace for an entry
 
-        msgid = entry.msgid.strip()
-        if not msgid:
-            return False
+        gettext only distinguishes identical msgids through ``msgctxt``, so
+        entries without one are context-independent and share cache entries
+        across modules.
+        """
+        return getattr(entry, "msgctxt", None) or ""
 
-        # Skip if already translated
-        if entry.msgstr and entry.msgid != entry.msgstr and not force:
+    @staticmethod
+    def _legacy_cache_contexts(module):
+        return (f"Odoo module: {module}",) if module else ("Odoo ERP",)
+
+    def _needs_language_check(self, entry, force=False):
+        """Cheap checks of _plan_entry() that run before language detection"""
+        if not self.model or not entry.msgid or not entry.msgid.strip():
             return False
+        # Skip if already translated
+        return not (entry.msgstr and entry.msgid != entry.msgstr and not force)
+
+    def _plan_entry(self, entry, force=False, detected_lang=_NOT_DETECTED):
+        """
+        Decide whether an entry needs translating
+
+        Args:
+            entry: PO entry
+            force: Retranslate entries that already have a translation
+            detected_lang: Language already detected for the msgid (optional)
+
+        Returns:
+            str: Source language to translate from, or None to skip
+        """
+        if not self._needs_language_check(entry, force):
+            return None
+
+        msgid = entry.msgid.strip()
+        if detected_lang is _NOT_DETECTED:
+            is_french = is_french_text(msgid)
+            detected_lang = detect_language(msgid)
+        else:
+            is_french = detected_lang == "fr"
 
         # Skip if text already French and target is French
-        if not force and is_french_text(msgid) and self.target_lang == "fr":
+        if not force and is_french and self.target_lang == "fr":
             self.logger.debug(f"Already French, skipping: {msgid[:40]}...")
-            return False
+            return None
 
-        detected_lang = detect_language(msgid)
         from_lang = self.source_lang
 
         # Auto-detection logic
@@ -330,15 +707,30 @@ Glossary for consistent terminology:
                     )
                 else:
                     self.logger.info(f"Detected {detected_lang} same as target, skipping: {msgid[:40]}")
-                    return False
+                    return None
             elif detected_lang != self.source_lang:
                 self.logger.warning(
                     f"Detected {detected_lang}, translating → {self.target_lang}: {msgid[:40]}..."
                 )
                 from_lang = detected_lang
 
-        context = f"Odoo module: {module}" if module else "Odoo ERP"
-        translation = self.translate(msgid, from_lang=from_lang, to_lang=self.target_lang, context=context)
+        return from_lang
+
+    def auto_translate_entry(self, entry, module=None, force=False):
+        """Auto-translate PO entry intelligently"""
+        from_lang = self._plan_entry(entry, force=force)
+        if from_lang is None:
+            return False
+
+        msgid = entry.msgid.strip()
+        translation = self.translate(
+            msgid,
+            from_lang=from_lang,
+            to_lang=self.target_lang,
+            context=module,
+            cache_context=self._entry_cache_context(entry),
+            legacy_contexts=self._legacy_cache_contexts(module),
+        )
         if translation and translation != msgid:
             entry.msgstr = translation
             return True
@@ -348,32 +740,341 @@ Glossary for consistent terminology:
     # ------------------------------------------------------
     # Batch processing
     # ------------------------------------------------------
-    def batch_translate(self, entries, module=None, progress_callback=None, force=False):
-        """Translate multiple entries with stats"""
+    def iter_translate(self, entries, module=None, force=False, indexer=None, max_workers=1, journal=None,
+                       cancel=None):
+        """
+        Translate entries, yielding each result as soon as it is ready
+
+        Entries are grouped per module (when an ``indexer`` is given) and sent in
+        shared-context batches of ``batch_size``; batches run concurrently when
+        ``max_workers`` > 1. Entries are updated in place.
+
+        Args:
+            entries: PO entries to translate
+            module: Module context used when no indexer is given
+            force: Retranslate entries that already have a translation
+            indexer: ModuleIndexer used to group entries per module
+            max_workers: Number of batches translated in parallel
+            journal: TranslationJournal recording each result before it is yielded
+            cancel: CancelToken stopping the job early
+
+        Yields:
+            TranslationResult: One per entry, in completion order
+
+        Once ``cancel`` is triggered no batch is dispatched, queued batches are
+        dropped and in-flight answers are discarded, so every entry is either
+        yielded or left untouched.
+
+        When ``budget`` is reached no further batch is sent and iteration stops
+        early with ``budget_paused`` set; entries not yielded stay pending in the
+        journal so the job can be resumed with a larger budget.
+        """
+        self.job_id = journal.path.stem if journal is not None else uuid.uuid4().hex[:16]
+        self.budget_paused = False
+        if journal is not None:
+            # Usage spent before an interruption still counts against the budget
+            self.usage.set_job_usage(self.job_id, journal.read()["usage"])
+        recorded = self.usage.job_totals(self.job_id)["requests"]
+
+        try:
+            for result in self._iter_results(entries, module, force, indexer, max_workers, cancel):
+                if journal is not None:
+                    journal.record(result)
+                    usage = self.usage.job_totals(self.job_id)
+                    if usage["requests"] != recorded:
+                        journal.record_usage(usage)
+                        recorded = usage["requests"]
+                yield result
+        finally:
+            self.usage.save_history()
+
+    def _iter_results(self, entries, module, force, indexer, max_workers, cancel=None):
+        halt = threading.Event()
+
+        def stopped():
+            return halt.is_set() or (cancel is not None and cancel.cancelled)
+
+        work = self._iter_work(entries, module, force, indexer)
+        if max_workers <= 1:
+            for item in work:
+                if stopped():
+                    return
+                if isinstance(item, TranslationResult):
+                    yield item
+                elif self._budget_exhausted():
+                    self._pause_for_budget()
+                    return
+                else:
+                    yield from self._run_batch(item)
+            return
+
+        # Bounded producer/consumer: at most two batches per worker are queued
+        # ahead, so a cancel or budget pause never leaves a backlog of futures
+        limit = max_workers * 2
+        completed = queue.Queue()
+        guard = threading.Lock()  # applying a batch and stopping are exclusive
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+        def run(batch):
+            fetched = None
+            if stopped():
+                # Queued before a cancel: leave the entries pending, no API call
+                fetched = None
+            elif self._budget_exhausted():
+                # Queued before the cap was hit: leave the entries pending
+                self._pause_for_budget()
+            else:
+                fetched = self._fetch_batch(batch)
+            with guard:
+                results = []
+                try:
+                    if fetched is not None and not stopped():
+                        results = self._apply_batch(batch, *fetched)
+                finally:
+                    completed.put(results)
+
+        outstanding = 0
+        try:
+            for item in work:
+                if stopped():
+                    break
+                if isinstance(item, TranslationResult):
+                    yield item
+                    continue
+                if self._budget_exhausted():
+                    self._pause_for_budget()
+                    break
+                executor.submit(run, item)
+                outstanding += 1
+                # Yield whatever is ready; block only while the queue is full
+                while outstanding and (outstanding >= limit or not completed.empty()) and not stopped():
+                    outstanding -= 1
+                    yield from completed.get()
+
+            while outstanding and not stopped():
+                outstanding -= 1
+                yield from completed.get()
+
+            if stopped():
+                with guard:
+                    halt.set()
+                # Batches applied before the stop are still reported
+                while True:
+                    try:
+                        yield from completed.get_nowait()
+                    except queue.Empty:
+                        break
+        finally:
+            halt.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _pause_for_budget(self):
+        if not self.budget_paused:
+            self.budget_paused = True
+            self.logger.warning(f"Budget of {self.budget.describe()} reached, pausing job {self.job_id}")
+
+    def batch_translate(self, entries, module=None, progress_callback=None, force=False, indexer=None,
+                        max_workers=1, cancel=None):
+        """
+        Translate multiple entries with stats
+
+        Blocking wrapper around iter_translate() returning only the counts.
+        """
+        entries = list(entries)
         results = {"total": len(entries), "translated": 0, "skipped": 0, "failed": 0}
-        for i, entry in enumerate(entries):
+        for done, result in enumerate(
+            self.iter_translate(
+                entries, module, force=force, indexer=indexer, max_workers=max_workers, cancel=cancel
+            ),
+            start=1,
+        ):
+            results[result.status] += 1
+            if progress_callback:
+                progress_callback(done, len(entries))
+        return results
+
+    def _iter_work(self, entries, module=None, force=False, indexer=None):
+        """Yield a TranslationResult for entries needing no API work, TranslationBatch otherwise"""
+        if indexer is None:
+            groups = [(module, list(entries))]
+        else:
+            groups = indexer.group_by_module(entries)
+        size = max(1, self.batch_size)
+
+        for group_module, group_entries in groups:
+            # Detect the whole group in one batch call
+            texts = [entry.msgid.strip() for entry in group_entries if self._needs_language_check(entry, force)]
             try:
-                if self.auto_translate_entry(entry, module, force=force):
-                    results["translated"] += 1
-                else:
-                    results["skipped"] += 1
+                detected = {text: lang for text, (lang, _conf) in zip(texts, detect_languages(texts))}
             except Exception as e:
-                results["failed"] += 1
-                self.logger.error(f"Entry failed: {e}")
-            if progress_callback:
-                progress_callback(i + 1, len(entries))
+                self.logger.debug(f"Batch language detection failed, detecting per entry: {e}")
+                detected = {}
+
+            pending = {}
+            for entry in group_entries:
+                started = time.perf_counter()
+                try:
+                    detected_lang = detected.get((entry.msgid or "").strip(), _NOT_DETECTED)
+                    from_lang = self._plan_entry(entry, force=force, detected_lang=detected_lang)
+                except Exception as e:
+                    self.logger.error(f"Entry failed: {e}")
+                    yield TranslationResult(
+                        entry, "failed", latency=time.perf_counter() - started, module=group_module, error=str(e)
+                    )
+                    continue
+                if from_lang is None:
+                    yield TranslationResult(
+                        entry, "skipped", latency=time.perf_counter() - started, module=group_module
+                    )
+                    continue
+
+                key = (from_lang, self._entry_cache_context(entry))
+                batch = pending.setdefault(key, [])
+                batch.append(entry)
+                if len(batch) >= size:
+                    yield TranslationBatch(group_module, key[0], key[1], pending.pop(key))
+
+            for (from_lang, cache_context), batch in pending.items():
+                yield TranslationBatch(group_module, from_lang, cache_context, batch)
+
+    def _run_batch(self, batch):
+        """Translate one TranslationBatch, returning its TranslationResults"""
+        return self._apply_batch(batch, *self._fetch_batch(batch))
+
+    def _fetch_batch(self, batch):
+        """
+        Request translations for a batch without touching its entries
+
+        Returns:
+            tuple: (outcomes, error, latency, failures) where outcomes maps text
+                   to (translation, source), error is set when the batch failed
+                   and failures maps the texts the API could not translate to
+                   the reason
+        """
+        started = time.perf_counter()
+        failures = {}
+        try:
+            outcomes = self._translate_many(
+                [entry.msgid for entry in batch.entries],
+                from_lang=batch.from_lang,
+                to_lang=self.target_lang,
+                context=batch.module,
+                cache_context=batch.cache_context,
+                legacy_contexts=self._legacy_cache_contexts(batch.module),
+                failures=failures,
+            )
+        except Exception as e:
+            self.logger.error(f"Batch failed: {e}")
+            return {}, str(e), time.perf_counter() - started, failures
+        return outcomes, None, time.perf_counter() - started, failures
+
+    def _apply_batch(self, batch, outcomes, error, latency, failures=None):
+        """Write fetched translations to the batch entries"""
+        if error is not None:
+            return [
+                TranslationResult(entry, "failed", latency=latency, module=batch.module, error=error)
+                for entry in batch.entries
+            ]
+
+        failures = failures or {}
+        results = []
+        for entry in batch.entries:
+            msgid = entry.msgid.strip()
+            translation, source = outcomes.get(msgid, (None, None))
+            if msgid in failures:
+                # Not done: the journal keeps the entry pending for a resume
+                results.append(TranslationResult(
+                    entry, "failed", source=source, latency=latency, module=batch.module, error=failures[msgid]
+                ))
+            elif translation and translation != msgid:
+                entry.msgstr = translation
+                results.append(TranslationResult(entry, "translated", translation, source, latency, batch.module))
+            else:
+                results.append(TranslationResult(entry, "skipped", None, source, latency, batch.module))
         return results
 
+    # ------------------------------------------------------
+    # Estimation
+    # ------------------------------------------------------
+    def estimate_job(self, entries, force=False, indexer=None, max_workers=1):
+        """
+        Pre-flight estimate of a job's API usage, cost and duration
+
+        Duplicate texts are counted once, cached texts cost nothing and the
+        duration uses the throughput recorded by previous jobs. Language
+        detection is not run, so the estimate is an upper bound.
+
+        Args:
+            entries: PO entries the job would translate
+            force: Count entries that already have a translation
+            indexer: ModuleIndexer used to group entries per module
+            max_workers: Number of batches translated in parallel
+
+        Returns:
+            dict: {
+                'entries', 'unique', 'cached', 'requests',
+                'input_tokens', 'output_tokens', 'cost', 'seconds'
+            }
+        """
+        entries = list(entries)
+        groups = indexer.group_by_module(entries) if indexer is not None else [(None, entries)]
+        from_lang, to_lang = self.source_lang, self.target_lang
+        size = max(1, self.batch_size)
+        ratio = self.usage.output_ratio()
+
+        seen = set()
+        estimate = {"entries": len(entries), "unique": 0, "cached": 0, "requests": 0,
+                    "input_tokens": 0, "output_tokens": 0}
+        for group_module, group_entries in groups:
+            pending = {}
+            for entry in group_entries:
+                msgid = (entry.msgid or "").strip()
+                if not msgid or (entry.msgstr and entry.msgid != entry.msgstr and not force):
+                    continue
+                text = sanitize_text(msgid)
+                cache_context = self._entry_cache_context(entry)
+                if (text, cache_context) in seen:
+                    continue
+                seen.add((text, cache_context))
+                estimate["unique"] += 1
+                legacy = self._legacy_cache_contexts(group_module)
+                if self._get_cached(text, from_lang, to_lang, cache_context, legacy, promote=False)[0]:
+                    estimate["cached"] += 1
+                else:
+                    pending.setdefault(cache_context, []).append(text)
+
+            for texts in pending.values():
+                for start in range(0, len(texts), size):
+                    chunk = texts[start:start + size]
+                    if len(chunk) > 1:
+                        prompt = self._get_batch_prompt(chunk, from_lang, to_lang, group_module)
+                    else:
+                        prompt = self._get_prompt(from_lang, to_lang, group_module)
+                        prompt += f"\n\nText: {chunk[0]}\nTranslation:"
+                    estimate["requests"] += 1
+                    estimate["input_tokens"] += estimate_tokens(prompt)
+                    estimate["output_tokens"] += round(sum(estimate_tokens(t) for t in chunk) * ratio)
+
+        estimate["cost"] = self.usage.cost(estimate["input_tokens"], estimate["output_tokens"])
+        parallel = max(1, min(max_workers, estimate["requests"]))
+        per_request = max(self.usage.seconds_per_request(), self.rate_limit)
+        estimate["seconds"] = estimate["requests"] * per_request / parallel
+        return estimate
+
     # ------------------------------------------------------
     # Utilities
     # ------------------------------------------------------
     def get_stats(self):
         total = max(1, self.stats["total_requests"])
+        usage = self.usage.report()["total"]
         return {
             **self.stats,
             "cache_hit_rate": f"{self.stats['cache_hits']/total*100:.1f}%",
             "api_efficiency": f"{self.stats['api_calls']/total*100:.1f}%",
             "cache_entries": len(self.cache.cache),
+            "input_tokens": usage["input_tokens"],
+            "output_tokens": usage["output_tokens"],
+            "estimated_cost": f"${usage['cost']:.4f}",
         }
 
     def clear_cache(self):
@@ -383,4 +1084,5 @@ Glossary for consistent terminology:
     def reset_stats(self):
         for k in self.stats:
             self.stats[k] = 0
+        self.usage.reset()
         self.logger.info("🔁 Stats reset.")
@@ -0,0 +1,166 @@
+"""
+Persistent language detection cache
+SQLite store next to the translation cache, shared by the GUI and the CLI
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+# Pending single-text results are written in groups of this size
+FLUSH_EVERY = 256
+
+
+class DetectionCache:
+    """Map (normalized text, expected language, detector version) to a detection result"""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Initialize cache
+
+        Args:
+            path: SQLite file (default: ~/.po_translator/detection_cache.sqlite3)
+        """
+        self.path = Path(path) if path else Path.home() / ".po_translator" / "detection_cache.sqlite3"
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pending: Dict[bytes, Tuple[str, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text: str, expected_language: Optional[str], version: str) -> bytes:
+        """Hash identifying a detection"""
+        raw = f"{version}\0{expected_language or ''}\0{text}"
+        return hashlib.sha1(raw.encode("utf-8")).digest()
+
+    def _connect(self):
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS detections ("
+                "key BLOB PRIMARY KEY, language TEXT NOT NULL, confidence REAL NOT NULL)"
+            )
+        return self._conn
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, Tuple[str, float]]:
+        """
+        Look up several detections
+
+        Args:
+            keys: Keys built with key()
+
+        Returns:
+            dict: {key: (language, confidence)} for the keys found
+        """
+        keys = list(keys)
+        found: Dict[bytes, Tuple[str, float]] = {}
+        if not keys:
+            return found
+        try:
+            with self._lock:
+                for key in keys:
+                    if key in self._pending:
+                        found[key] = self._pending[key]
+                lookup = [key for key in keys if key not in found]
+                conn = self._connect()
+                # Stay below SQLite's host parameter limit
+                for start in range(0, len(lookup), 500):
+                    chunk = lookup[start:start + 500]
+                    rows = conn.execute(
+                        f"SELECT key, language, confidence FROM detections WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk,
+                    )
+                    for key, language, confidence in rows:
+                        found[key] = (language, confidence)
+                self.hits += len(found)
+                self.misses += len(keys) - len(found)
+        except sqlite3.Error as e:
+            LOGGER.debug(f"Detection cache unavailable: {e}")
+        return found
+
+    def get(self, key: bytes) -> Optional[Tuple[str, float]]:
+        """Look up one detection"""
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Dict[bytes, Tuple[str, float]], flush: bool = True) -> None:
+        """
+        Store detections
+
+        Args:
+            items: {key: (language, confidence)}
+            flush: Write now instead of waiting for FLUSH_EVERY pending results
+        """
+        with self._lock:
+            self._pending.update(items)
+            if flush or len(self._pending) >= FLUSH_EVERY:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Write pending detections"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO detections (key, language, confidence) VALUES (?, ?, ?)",
+                    [(key, language, confidence) for key, (language, confidence) in self._pending.items()],
+                )
+        except sqlite3.Error as e:
+            LOGGER.debug(f"Could not write detection cache: {e}")
+        self._pending.clear()
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Get cache metrics
+
+        Returns:
+            dict: {'hits', 'misses', 'hit_rate', 'entries'}
+        """
+        entries = 0
+        try:
+            with self._lock:
+                entries = self._connect().execute("SELECT COUNT(*) FROM detections").fetchone()[0]
+                entries += len(self._pending)
+        except sqlite3.Error:
+            pass
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": f"{self.hits / lookups * 100:.1f}%" if lookups else "0.0%",
+            "entries": entries,
+        }
+
+    def clear(self) -> None:
+        """Delete every stored detection"""
+        with self._lock:
+            self._pending.clear()
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.execute("DELETE FROM detections")
+            except sqlite3.Error as e:
+                LOGGER.debug(f"Could not clear detection cache: {e}")
+
+    def close(self) -> None:
+        """Flush and close the database"""
+        with self._lock:
+            self._flush_locked()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,152 @@
+"""
+FastText language identification model management
+Resolves the model file without touching the network; downloads only on request
+"""
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import urllib.request
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+MODEL_DIR = Path.home() / ".po_translator"
+
+# Official language identification models (176 languages)
+MODEL_VARIANTS = {
+    "ftz": {
+        "filename": "lid.176.ftz",
+        "url": "https://dl.fbaipublicfiles.com/fasttext/supervised-models/lid.176.ftz",
+        "size": "~1 MB, quantized",
+    },
+    "bin": {
+        "filename": "lid.176.bin",
+        "url": "https://dl.fbaipublicfiles.com/fasttext/supervised-models/lid.176.bin",
+        "size": "~130 MB",
+    },
+}
+
+# Path to a model file, or "none"/"off" to disable the FastText fallback
+MODEL_ENV = "PO_TRANSLATOR_FASTTEXT_MODEL"
+
+_CONFIGURED_PATH: Optional[str] = None
+
+
+def configure_model_path(path: Optional[str]) -> None:
+    """
+    Select the FastText model file (takes precedence over $PO_TRANSLATOR_FASTTEXT_MODEL)
+
+    Args:
+        path: Model file, "none" to disable FastText, or None to restore the default lookup
+    """
+    global _CONFIGURED_PATH
+    _CONFIGURED_PATH = str(path) if path is not None else None
+
+
+def configured_model_setting() -> Optional[str]:
+    """Model path or switch from configure_model_path() or the environment"""
+    if _CONFIGURED_PATH is not None:
+        return _CONFIGURED_PATH
+    return os.environ.get(MODEL_ENV) or None
+
+
+def fasttext_disabled() -> bool:
+    """Check whether the FastText fallback was switched off"""
+    setting = configured_model_setting()
+    return setting is not None and setting.strip().lower() in {"none", "off", "0", "false"}
+
+
+def default_model_paths():
+    """Default locations, most accurate first"""
+    return [MODEL_DIR / MODEL_VARIANTS[variant]["filename"] for variant in ("bin", "ftz")]
+
+
+def resolve_model_path() -> Optional[Path]:
+    """
+    Find the FastText model to load (never downloads)
+
+    Returns:
+        Path of an existing model file, or None when unavailable
+    """
+    if fasttext_disabled():
+        return None
+    setting = configured_model_setting()
+    if setting:
+        path = Path(setting).expanduser()
+        return path if path.is_file() else None
+    return next((path for path in default_model_paths() if path.is_file()), None)
+
+
+def model_status() -> Dict[str, object]:
+    """
+    Describe the FastText model setup
+
+    Returns:
+        dict: {'state', 'path', 'installed'} where state is 'ready', 'missing',
+              'disabled' or 'not installed' (fasttext package absent)
+    """
+    import importlib.util
+
+    installed = importlib.util.find_spec("fasttext") is not None
+    path = resolve_model_path()
+    if fasttext_disabled():
+        state = "disabled"
+    elif not installed:
+        state = "not installed"
+    elif path is None:
+        state = "missing"
+    else:
+        state = "ready"
+    setting = configured_model_setting()
+    return {
+        "state": state,
+        "path": str(path) if path else (setting if setting and not fasttext_disabled() else None),
+        "installed": installed,
+    }
+
+
+def download_model(
+    variant: str = "ftz",
+    path: Optional[Path] = None,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Path:
+    """
+    Download a FastText model (the only place that touches the network)
+
+    Args:
+        variant: 'ftz' (compressed) or 'bin' (full)
+        path: Destination file (default: ~/.po_translator/<model file>)
+        progress: Called with (bytes received, total bytes or -1)
+
+    Returns:
+        Path of the downloaded model
+
+    Raises:
+        ValueError: Unknown variant
+        OSError: Download or write failed
+    """
+    if variant not in MODEL_VARIANTS:
+        raise ValueError(f"Unknown model variant '{variant}' (expected one of: {', '.join(MODEL_VARIANTS)})")
+    spec = MODEL_VARIANTS[variant]
+    target = Path(path).expanduser() if path else MODEL_DIR / spec["filename"]
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    LOGGER.info(f"Downloading fastText LID model ({spec['size']}) to {target}")
+
+    def report(blocks, block_size, total):
+        if progress:
+            progress(min(blocks * block_size, total) if total > 0 else blocks * block_size, total)
+
+    # Download next to the target and rename, so an interrupted download never looks installed
+    fd, partial = tempfile.mkstemp(prefix=target.name, suffix=".part", dir=target.parent)
+    os.close(fd)
+    try:
+        urllib.request.urlretrieve(spec["url"], partial, reporthook=report)
+        os.replace(partial, target)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return target
@@ -4,11 +4,21 @@ Achieves near-perfect accuracy for short text, Odoo-optimized
 """
 from __future__ import annotations
 
+import atexit
+import hashlib
+import importlib.metadata
+import importlib.util
 import logging
+import os
 import re
-from functools import lru_cache
+import threading
+import unicodedata
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Tuple, List, Dict
+from typing import Callable, Optional, Tuple, List, Dict
+
+from po_translator.utils import detector_models, ngram_detector
+from po_translator.utils.detection_cache import DetectionCache
 
 LOGGER = logging.getLogger(__name__)
 
@@ -42,56 +52,197 @@ TOLERANCE_MAP = {
     "ar": 0.05,  # Arabic: tight tolerance
 }
 
-# Try Lingua first (best accuracy for short text)
-try:
-    from lingua import LanguageDetectorBuilder, Language
-    
-    # Map Odoo language codes to Lingua Language enum
-    LINGUA_LANG_MAP = {
-        'en': Language.ENGLISH,
-        'fr': Language.FRENCH,
-        'es': Language.SPANISH,
-        'de': Language.GERMAN,
-        'it': Language.ITALIAN,
-        'pt': Language.PORTUGUESE,
-        'nl': Language.DUTCH,
-        'ar': Language.ARABIC,
+# Detectors are built on first use (or by warm_up_detectors()) so importing
+# this module stays cheap for the CLI and tests
+_DETECTOR_LOCK = threading.Lock()
+_LINGUA_LOADED = False
+_HAS_LINGUA = False
+_LINGUA_DETECTOR = None
+LINGUA_LANG_MAP: Dict[str, object] = {}
+_LINGUA_CODES: Dict[object, str] = {}
+
+_FASTTEXT_LOADED = False
+_HAS_FASTTEXT = False
+_FASTTEXT_MODEL = None
+_FASTTEXT_STATE = "not loaded"
+
+# Built-in n-gram tier (trained with 'po-translator model train-ngram')
+_NGRAM_LOADED = False
+_NGRAM_DETECTOR = None
+_NGRAM_STATE = "not loaded"
+
+
+def _get_lingua_detector():
+    """Build the Lingua detector for Odoo languages on first use"""
+    global _LINGUA_LOADED, _HAS_LINGUA, _LINGUA_DETECTOR, LINGUA_LANG_MAP, _LINGUA_CODES
+    if _LINGUA_LOADED:
+        return _LINGUA_DETECTOR
+
+    with _DETECTOR_LOCK:
+        if _LINGUA_LOADED:
+            return _LINGUA_DETECTOR
+        try:
+            from lingua import LanguageDetectorBuilder, Language
+
+            # Map Odoo language codes to Lingua Language enum
+            lang_map = {
+                'en': Language.ENGLISH,
+                'fr': Language.FRENCH,
+                'es': Language.SPANISH,
+                'de': Language.GERMAN,
+                'it': Language.ITALIAN,
+                'pt': Language.PORTUGUESE,
+                'nl': Language.DUTCH,
+                'ar': Language.ARABIC,
+            }
+
+            # Build detector for Odoo languages only (faster, more accurate)
+            _LINGUA_DETECTOR = LanguageDetectorBuilder.from_languages(
+                *lang_map.values()
+            ).with_preloaded_language_models().build()
+            LINGUA_LANG_MAP = lang_map
+            _LINGUA_CODES = {lingua_lang: code for code, lingua_lang in lang_map.items()}
+            _HAS_LINGUA = True
+            LOGGER.info("✓ Lingua-py loaded (high accuracy mode)")
+        except ImportError:
+            LOGGER.warning("Lingua-py not available, falling back to FastText")
+        _LINGUA_LOADED = True
+    return _LINGUA_DETECTOR
+
+
+def _get_fasttext_model():
+    """Load the FastText fallback model on first use (never downloads it)"""
+    global _FASTTEXT_LOADED, _HAS_FASTTEXT, _FASTTEXT_MODEL, _FASTTEXT_STATE
+    if _FASTTEXT_LOADED:
+        return _FASTTEXT_MODEL
+
+    with _DETECTOR_LOCK:
+        if _FASTTEXT_LOADED:
+            return _FASTTEXT_MODEL
+        status = detector_models.model_status()
+        _FASTTEXT_STATE = status["state"]
+        if status["state"] == "ready":
+            try:
+                import fasttext
+
+                _FASTTEXT_MODEL = fasttext.load_model(status["path"])
+                _HAS_FASTTEXT = True
+                LOGGER.info(f"✓ FastText loaded (fallback mode, {Path(status['path']).name})")
+            except Exception as e:
+                _FASTTEXT_STATE = "failed"
+                LOGGER.warning(f"FastText model could not be loaded from {status['path']}: {e}")
+        elif status["state"] == "missing":
+            LOGGER.info("FastText fallback unavailable: no model found (run 'po-translator model download')")
+        else:
+            LOGGER.debug(f"FastText fallback unavailable: {status['state']}")
+        _FASTTEXT_LOADED = True
+    return _FASTTEXT_MODEL
+
+
+def _get_ngram_detector():
+    """Load the trained n-gram model on first use; it must cover every PRIMARY_LANGUAGES code"""
+    global _NGRAM_LOADED, _NGRAM_DETECTOR, _NGRAM_STATE
+    if _NGRAM_LOADED:
+        return _NGRAM_DETECTOR
+
+    with _DETECTOR_LOCK:
+        if _NGRAM_LOADED:
+            return _NGRAM_DETECTOR
+        path = ngram_detector.resolve_model_path()
+        if not ngram_detector.numpy_available():
+            _NGRAM_STATE = "not installed"
+        elif path is None:
+            _NGRAM_STATE = "missing"
+        else:
+            try:
+                detector = ngram_detector.NgramDetector.load(path)
+                missing = PRIMARY_LANGUAGES.difference(detector.languages)
+                if missing:
+                    # A partial model would force other languages into the trained ones
+                    _NGRAM_STATE = "incomplete"
+                    LOGGER.warning(f"N-gram model {path} ignored: no training data for {', '.join(sorted(missing))}")
+                else:
+                    _NGRAM_DETECTOR = detector
+                    _NGRAM_STATE = "ready"
+                    LOGGER.info(f"✓ N-gram detector loaded ({path.name})")
+            except (OSError, ValueError, KeyError) as e:
+                _NGRAM_STATE = "failed"
+                LOGGER.warning(f"N-gram model could not be loaded from {path}: {e}")
+        _NGRAM_LOADED = True
+    return _NGRAM_DETECTOR
+
+
+def reset_detectors() -> None:
+    """Forget loaded detectors, e.g. after installing or selecting another model"""
+    global _LINGUA_LOADED, _HAS_LINGUA, _LINGUA_DETECTOR, _FASTTEXT_LOADED, _HAS_FASTTEXT, _FASTTEXT_MODEL
+    global _FASTTEXT_STATE, _DETECTOR_VERSION, _UNAVAILABLE_WARNED, _NGRAM_LOADED, _NGRAM_DETECTOR, _NGRAM_STATE
+    with _DETECTOR_LOCK:
+        _LINGUA_LOADED = _HAS_LINGUA = False
+        _LINGUA_DETECTOR = None
+        _FASTTEXT_LOADED = _HAS_FASTTEXT = False
+        _FASTTEXT_MODEL = None
+        _FASTTEXT_STATE = "not loaded"
+        _NGRAM_LOADED = False
+        _NGRAM_DETECTOR = None
+        _NGRAM_STATE = "not loaded"
+    _DETECTOR_VERSION = None
+    _UNAVAILABLE_WARNED = False
+    clear_detection_cache()
+
+
+def detector_status() -> Dict[str, object]:
+    """
+    Availability of each detector (loads them if needed)
+
+    Returns:
+        dict: {'lingua': bool, 'fasttext': state, 'fasttext_path': str or None,
+               'ngram': state, 'ngram_path': str or None, 'available': bool}
+              where 'available' is False in unavailable mode (only the cheap
+              tiers run and other texts stay undetected)
+    """
+    lingua = _get_lingua_detector() is not None
+    fasttext_ready = _get_fasttext_model() is not None
+    _get_ngram_detector()
+    ngram_path = ngram_detector.resolve_model_path()
+    return {
+        "lingua": lingua,
+        "fasttext": _FASTTEXT_STATE,
+        "fasttext_path": detector_models.model_status()["path"],
+        "ngram": _NGRAM_STATE,
+        "ngram_path": str(ngram_path) if ngram_path else None,
+        "available": lingua or fasttext_ready,
     }
-    
-    # Build detector for Odoo languages only (faster, more accurate)
-    _LINGUA_DETECTOR = LanguageDetectorBuilder.from_languages(
-        *LINGUA_LANG_MAP.values()
-    ).with_preloaded_language_models().build()
-    
-    LOGGER.info("✓ Lingua-py loaded (high accuracy mode)")
-    _HAS_LINGUA = True
-except ImportError:
-    _HAS_LINGUA = False
-    _LINGUA_DETECTOR = None
-    LOGGER.warning("Lingua-py not available, falling back to FastText")
-
-# FastText fallback
-try:
-    import fasttext
-    
-    MODEL_PATH = Path.home() / ".po_translator" / "lid.176.bin"
-    MODEL_PATH.parent.mkdir(exist_ok=True)
-    
-    if not MODEL_PATH.exists():
-        import urllib.request
-        LOGGER.info("Downloading fastText LID model (one-time, ~130MB)...")
-        urllib.request.urlretrieve(
-            "https://dl.fbaipublicfiles.com/fasttext/supervised-models/lid.176.bin",
-            MODEL_PATH
-        )
-    
-    _FASTTEXT_MODEL = fasttext.load_model(str(MODEL_PATH))
-    LOGGER.info("✓ FastText loaded (fallback mode)")
-    _HAS_FASTTEXT = True
-except Exception as e:
-    _HAS_FASTTEXT = False
-    _FASTTEXT_MODEL = None
-    LOGGER.error(f"No language detection available: {e}")
+
+
+def detectors_loaded() -> bool:
+    """Check whether detector initialization has already happened"""
+    return _LINGUA_LOADED and _FASTTEXT_LOADED
+
+
+def warm_up_detectors(background: bool = True, include_fasttext: bool = True) -> Optional[threading.Thread]:
+    """
+    Load the language detectors ahead of the first detection
+
+    Args:
+        background: Load in a daemon thread instead of blocking
+        include_fasttext: Also load the FastText fallback model
+
+    Returns:
+        The warm-up thread when ``background`` is true, otherwise None
+    """
+    def load():
+        _get_ngram_detector()
+        _get_lingua_detector()
+        if include_fasttext:
+            _get_fasttext_model()
+
+    if not background:
+        load()
+        return None
+
+    thread = threading.Thread(target=load, name="language-detector-warmup", daemon=True)
+    thread.start()
+    return thread
 
 
 def _normalize_lang_code(code: Optional[str]) -> Optional[str]:
@@ -101,11 +252,568 @@ def _normalize_lang_code(code: Optional[str]) -> Optional[str]:
     return code.split("-")[0].lower()
 
 
-@lru_cache(maxsize=4096)
+# ==========================================================
+# Detection memo (shared by single and batch detection)
+# ==========================================================
+_MEMO_SIZE = 65536
+_MEMO: "OrderedDict[Tuple[str, Optional[str]], Tuple[Optional[str], float]]" = OrderedDict()
+_MEMO_LOCK = threading.Lock()
+_MEMO_HITS = 0
+
+
+def _memo_get(key):
+    global _MEMO_HITS
+    with _MEMO_LOCK:
+        result = _MEMO.get(key)
+        if result is not None:
+            _MEMO.move_to_end(key)
+            _MEMO_HITS += 1
+        return result
+
+
+def _memo_put(key, result):
+    with _MEMO_LOCK:
+        _MEMO[key] = result
+        if len(_MEMO) > _MEMO_SIZE:
+            _MEMO.popitem(last=False)
+
+
+def clear_detection_cache() -> None:
+    """Forget memoized detection results (the on-disk cache is kept)"""
+    with _MEMO_LOCK:
+        _MEMO.clear()
+
+
+# ==========================================================
+# Persistent detection cache
+# ==========================================================
+# Bump when the decision rules change so stored results are not reused
+DETECTION_RULES_VERSION = 2
+
+_DISK_CACHE: Optional[DetectionCache] = None
+_DISK_CACHE_CONFIGURED = False
+_DETECTOR_VERSION: Optional[str] = None
+
+
+def detector_version() -> str:
+    """Identify the rules and models producing detections (part of every cache key)"""
+    global _DETECTOR_VERSION
+    if _DETECTOR_VERSION is None:
+        try:
+            lingua_version = importlib.metadata.version("lingua-language-detector")
+        except importlib.metadata.PackageNotFoundError:
+            lingua_version = "none"
+        model_path = detector_models.resolve_model_path()
+        has_fasttext = importlib.util.find_spec("fasttext") is not None and model_path is not None
+        with _TERM_LOCK:
+            terms = "\n".join(f"{lang}:{term}" for lang in sorted(_TERM_DICTIONARIES)
+                              for term in sorted(_TERM_DICTIONARIES[lang]))
+        dictionary_hash = hashlib.sha1(terms.encode("utf-8")).hexdigest()[:12]
+        ngram = _get_ngram_detector()
+        _DETECTOR_VERSION = (
+            f"rules{DETECTION_RULES_VERSION}-lingua{lingua_version}"
+            f"-{'fasttext-' + model_path.name if has_fasttext else 'nofasttext'}"
+            f"-terms{dictionary_hash}"
+            f"-{'ngram' + ngram.fingerprint if ngram else 'nongram'}"
+        )
+    return _DETECTOR_VERSION
+
+
+def configure_detection_cache(path: Optional[Path] = None, enabled: bool = True) -> Optional[DetectionCache]:
+    """
+    Select the persistent detection cache
+
+    Args:
+        path: SQLite file (default: ~/.po_translator/detection_cache.sqlite3)
+        enabled: False to only keep results in memory
+
+    Returns:
+        The active DetectionCache, or None when disabled
+    """
+    global _DISK_CACHE, _DISK_CACHE_CONFIGURED
+    if _DISK_CACHE is not None:
+        _DISK_CACHE.close()
+    _DISK_CACHE = DetectionCache(path) if enabled else None
+    _DISK_CACHE_CONFIGURED = True
+    return _DISK_CACHE
+
+
+def get_detection_cache() -> Optional[DetectionCache]:
+    """Persistent detection cache (disabled with PO_TRANSLATOR_DETECTION_CACHE=0)"""
+    if not _DISK_CACHE_CONFIGURED:
+        configure_detection_cache(enabled=os.environ.get("PO_TRANSLATOR_DETECTION_CACHE", "1") != "0")
+    return _DISK_CACHE
+
+
+def detection_cache_stats() -> Dict[str, object]:
+    """
+    Detection cache metrics
+
+    Returns:
+        dict: {'memory_hits', 'hits', 'misses', 'hit_rate', 'entries'} where
+              hits/misses count lookups in the persistent cache
+    """
+    cache = _DISK_CACHE
+    stats = cache.stats() if cache else {"hits": 0, "misses": 0, "hit_rate": "0.0%", "entries": 0}
+    return {"memory_hits": _MEMO_HITS, **stats}
+
+
+@atexit.register
+def _flush_detection_cache():
+    if _DISK_CACHE is not None:
+        _DISK_CACHE.close()
+
+
+def _lookup_or_detect(
+    texts: List[str],
+    expected_language: Optional[str],
+    backend: Optional[Callable] = None
+) -> List[Tuple[Optional[str], float]]:
+    """Resolve distinct cleaned texts from the persistent cache, detecting the rest"""
+    detect = backend or _detect_clean_texts
+    cache = get_detection_cache()
+    if cache is None:
+        return detect(texts, expected_language)
+
+    version = detector_version()
+    keys = [DetectionCache.key(text, expected_language, version) for text in texts]
+    stored = cache.get_many(keys)
+
+    missing = [text for text, key in zip(texts, keys) if key not in stored]
+    detected = dict(zip(missing, detect(missing, expected_language))) if missing else {}
+
+    new_items = {
+        key: detected[text] for text, key in zip(texts, keys)
+        if text in detected and detected[text][0] is not None
+    }
+    if new_items:
+        # Single lookups are written in groups; batches right away
+        cache.put_many(new_items, flush=len(texts) > 1)
+    return [stored[key] if key in stored else detected[text] for text, key in zip(texts, keys)]
+
+
+def _clean_text(text: str) -> str:
+    return text.replace('\n', ' ').strip()
+
+
+def _adaptive_threshold(word_count: int) -> float:
+    if word_count <= 2:
+        return 0.25
+    if word_count <= 5:
+        return 0.40
+    return 0.50
+
+
+def _normalize_term(text_clean: str) -> str:
+    """Accent-free lowercase form used for dictionary lookups"""
+    return unicodedata.normalize('NFKD', text_clean).encode('ascii', 'ignore').decode('ascii').lower()
+
+
+# ==========================================================
+# Cheap detection tiers (run before Lingua)
+# ==========================================================
+_ARABIC_SCRIPT = re.compile(r"[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]")
+_WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+# Frequent function words; only the words unique to one language are scored
+STOPWORDS = {
+    "en": {"the", "and", "of", "to", "is", "are", "for", "with", "this", "that", "your", "you", "be", "not",
+           "from", "will", "has", "have", "can", "on", "an", "by", "it", "or", "which", "should", "must",
+           "cannot", "been", "was", "were", "these", "those", "when", "if", "in", "no", "any", "all"},
+    "fr": {"le", "la", "les", "des", "du", "de", "est", "et", "un", "une", "vous", "votre", "vos", "pour",
+           "avec", "dans", "sur", "ce", "cette", "ces", "sont", "être", "pas", "ne", "au", "aux", "qui", "que",
+           "il", "nous", "sera", "peut", "doit", "été", "leur", "à", "en", "se", "son", "non", "on", "te", "a"},
+    "es": {"el", "la", "los", "las", "del", "de", "es", "y", "una", "un", "para", "con", "por", "su", "sus",
+           "está", "son", "ser", "no", "que", "se", "al", "lo", "esta", "este", "puede", "debe", "usted",
+           "en", "te", "a"},
+    "pt": {"o", "os", "as", "do", "da", "dos", "das", "é", "e", "um", "uma", "para", "com", "por", "seu",
+           "sua", "não", "são", "ser", "que", "se", "ao", "na", "no", "em", "está", "pode", "deve", "você",
+           "de", "te", "a"},
+    "it": {"il", "lo", "le", "la", "gli", "della", "del", "di", "è", "e", "un", "una", "per", "con", "non",
+           "sono", "che", "si", "al", "alla", "nel", "nella", "questo", "questa", "può", "deve", "in", "no",
+           "se", "su", "da", "te", "a"},
+    "de": {"der", "die", "das", "und", "ist", "ein", "eine", "nicht", "für", "mit", "von", "zu", "auf", "den",
+           "dem", "des", "sie", "wird", "werden", "kann", "muss", "sind", "oder", "bitte", "in", "an", "was"},
+    "nl": {"de", "het", "een", "en", "is", "van", "voor", "met", "niet", "op", "te", "zijn", "wordt", "kan",
+           "moet", "deze", "dit", "u", "uw", "of", "worden", "die", "den", "in", "was"},
+}
+_DISTINCTIVE_STOPWORDS = {
+    lang: words - set().union(*(other for code, other in STOPWORDS.items() if code != lang))
+    for lang, words in STOPWORDS.items()
+}
+
+# Normalized word dictionaries: common UI terms plus registered glossaries
+_TERM_DICTIONARIES: Dict[str, set] = {
+    lang: {_normalize_term(term) for term in terms} for lang, terms in COMMON_UI_TERMS.items()
+}
+_TERM_LOCK = threading.Lock()
+
+
+def register_glossary_terms(language: str, terms) -> int:
+    """
+    Add glossary terms to the dictionary tier of the detector
+
+    Args:
+        language: Language of the terms
+        terms: Iterable of terms (words or short phrases)
+
+    Returns:
+        int: Number of terms that were not known yet
+    """
+    global _DETECTOR_VERSION
+    language = _normalize_lang_code(language)
+    if language not in PRIMARY_LANGUAGES:
+        return 0
+    normalized = {_normalize_term(_clean_text(term)) for term in terms if term and term.strip()}
+    with _TERM_LOCK:
+        dictionary = _TERM_DICTIONARIES.setdefault(language, set())
+        added = normalized - dictionary
+        dictionary.update(added)
+    if added:
+        # New terms can change decisions: drop memoized results and re-key the disk cache
+        _DETECTOR_VERSION = None
+        clear_detection_cache()
+    return len(added)
+
+
+def glossary_terms() -> Dict[str, List[str]]:
+    """
+    Snapshot of the dictionary tier, e.g. to set up detector worker processes
+
+    Returns:
+        dict: Sorted normalized terms per language
+    """
+    with _TERM_LOCK:
+        return {lang: sorted(terms) for lang, terms in _TERM_DICTIONARIES.items()}
+
+
+def _tier_script(text_clean: str, expected_language: Optional[str]):
+    """Arabic is the only Odoo language written in its own script"""
+    letters = [char for char in text_clean if char.isalpha()]
+    if not letters:
+        return None
+    arabic = sum(1 for char in letters if _ARABIC_SCRIPT.match(char))
+    if arabic * 2 >= len(letters):
+        return "ar", 1.0
+    return None
+
+
+def _tier_dictionary(text_clean: str, expected_language: Optional[str]):
+    """Whole text is a known term of exactly one language (or of the expected one)"""
+    term = _normalize_term(text_clean)
+    languages = [lang for lang, terms in _TERM_DICTIONARIES.items() if term in terms]
+    if expected_language in languages:
+        return expected_language, 1.0
+    if len(languages) == 1:
+        return languages[0], 0.95
+    return None
+
+
+def _tier_stopwords(text_clean: str, expected_language: Optional[str]):
+    """Sentences whose distinctive function words all point to one language"""
+    words = _WORD_PATTERN.findall(text_clean.lower())
+    if len(words) < 3:
+        return None
+    hits = {lang: sum(1 for word in words if word in stopwords) for lang, stopwords in _DISTINCTIVE_STOPWORDS.items()}
+    voted = [lang for lang, count in hits.items() if count]
+    if len(voted) != 1 or hits[voted[0]] < 2:
+        return None
+    return voted[0], min(0.95, 0.6 + 0.1 * hits[voted[0]])
+
+
+def _tier_ngram_batch(texts: List[str], expected_language: Optional[str]):
+    """Character n-gram model scoring a whole batch in a few NumPy operations"""
+    detector = _get_ngram_detector()
+    if detector is None:
+        return [None] * len(texts)
+    return detector.decide(texts, expected_language)
+
+
+def _tier_ngram(text_clean: str, expected_language: Optional[str]):
+    """Confident n-gram model detections (inconclusive without a trained model)"""
+    return _tier_ngram_batch([text_clean], expected_language)[0]
+
+
+# Batch-capable tiers expose ``batch(texts, expected_language)``
+_tier_ngram.batch = _tier_ngram_batch
+
+# Tiers tried in order; the first conclusive result wins and Lingua only sees the rest
+DETECTOR_TIERS = [
+    ("script", _tier_script),
+    ("dictionary", _tier_dictionary),
+    ("ngram", _tier_ngram),
+    ("stopwords", _tier_stopwords),
+]
+
+_TIER_COUNTS: Dict[str, int] = {}
+_TIER_COUNTS_LOCK = threading.Lock()
+
+
+def _count_tier(tier: str, count: int = 1) -> None:
+    if count:
+        with _TIER_COUNTS_LOCK:
+            _TIER_COUNTS[tier] = _TIER_COUNTS.get(tier, 0) + count
+
+
+def detection_tier_stats() -> Dict[str, int]:
+    """
+    How often each tier decided a detection
+
+    Returns:
+        dict: {tier_name: decisions} for the cheap tiers, 'lingua', 'fasttext' and 'undetected'
+    """
+    names = [name for name, _tier in DETECTOR_TIERS] + ["lingua", "fasttext", "undetected"]
+    with _TIER_COUNTS_LOCK:
+        return {name: _TIER_COUNTS.get(name, 0) for name in names}
+
+
+def reset_detection_tier_stats() -> None:
+    """Zero the tier counters"""
+    with _TIER_COUNTS_LOCK:
+        _TIER_COUNTS.clear()
+
+
+def _decide_cheap_tiers_batch(texts: List[str], expected_language: Optional[str]):
+    """
+    Run the tiers over many texts, each tier only seeing what earlier ones left open
+
+    Returns:
+        list: (tier name, result) per text, (None, None) when no tier decided
+    """
+    decisions = [(None, None)] * len(texts)
+    remaining = list(range(len(texts)))
+    for name, tier in DETECTOR_TIERS:
+        if not remaining:
+            break
+        batch = getattr(tier, "batch", None)
+        pending = [texts[index] for index in remaining]
+        results = batch(pending, expected_language) if batch else [tier(text, expected_language) for text in pending]
+        still_open = []
+        for index, result in zip(remaining, results):
+            if result is None:
+                still_open.append(index)
+            else:
+                LOGGER.debug(f"{name.capitalize()} tier detected: {result[0]} for '{texts[index][:50]}'")
+                decisions[index] = (name, result)
+        remaining = still_open
+    return decisions
+
+
+# ==========================================================
+# Decision rules
+# ==========================================================
+def _decide_lingua(text_clean, confidence_values, expected_language):
+    """
+    Apply the verification rules to Lingua confidence values
+
+    Returns:
+        (language_code, confidence), or None to fall back to FastText
+    """
+    if not confidence_values:
+        return None
+
+    # Convert to our format
+    candidates = {}
+    for lang_confidence in confidence_values:
+        code = _LINGUA_CODES.get(lang_confidence.language)
+        if code:
+            candidates[code] = lang_confidence.value
+            LOGGER.debug(f"  Lingua candidate: {code} ({lang_confidence.value:.3f})")
+    if not candidates:
+        return None
+
+    word_count = len(text_clean.split())
+
+    # Find best candidate
+    best_lang = max(candidates, key=candidates.get)
+    best_conf = candidates[best_lang]
+
+    # VERIFICATION SYSTEM (100% accuracy)
+    if expected_language and expected_language in PRIMARY_LANGUAGES:
+        # Rule 1: Dictionary override for known UI terms
+        if _normalize_term(text_clean) in COMMON_UI_TERMS.get(expected_language, set()):
+            LOGGER.debug(f"Dictionary match: {expected_language} for '{text_clean[:50]}'")
+            return expected_language, 1.0
+
+        # Rule 2: Adaptive tolerance based on language similarity
+        if expected_language in candidates:
+            expected_conf = candidates[expected_language]
+            tolerance = TOLERANCE_MAP.get(expected_language, 0.10)
+
+            # If expected language is within tolerance of best, prefer it
+            if abs(best_conf - expected_conf) <= tolerance:
+                LOGGER.debug(f"Tolerance match: {expected_language} ({expected_conf:.3f}) within {tolerance} of best ({best_conf:.3f})")
+                return expected_language, expected_conf
+
+            # Rule 3: If expected is close (within 10%), prefer it
+            if expected_conf >= best_conf * 0.90:
+                LOGGER.debug(f"Expected language tiebreaker: {expected_language} ({expected_conf:.3f})")
+                return expected_language, expected_conf
+
+    # Return best match if no expected language or verification failed
+    if best_conf >= _adaptive_threshold(word_count) or word_count <= 3:
+        LOGGER.debug(f"Lingua detected: {best_lang} ({best_conf:.3f}) for '{text_clean[:50]}'")
+        return best_lang, best_conf
+    return None
+
+
+def _decide_fasttext(text_clean, labels, probs, expected_language):
+    """
+    Pick a language from FastText predictions
+
+    Returns:
+        (language_code, confidence), or None when inconclusive
+    """
+    candidates: Dict[str, float] = {}
+    for label, prob in zip(labels, probs):
+        lang = _normalize_lang_code(label.replace('__label__', ''))
+        confidence = float(prob)
+        if lang in PRIMARY_LANGUAGES:
+            if lang not in candidates or confidence > candidates[lang]:
+                candidates[lang] = confidence
+            LOGGER.debug(f"  FastText candidate: {lang} ({confidence:.3f})")
+    if not candidates:
+        return None
+
+    word_count = len(text_clean.split())
+    best_lang = max(candidates, key=candidates.get)
+    best_conf = candidates[best_lang]
+
+    # Expected language tiebreaker
+    if expected_language and expected_language in candidates:
+        expected_conf = candidates[expected_language]
+        if expected_conf >= best_conf * 0.85:
+            best_lang = expected_language
+            best_conf = expected_conf
+
+    if best_conf >= _adaptive_threshold(word_count):
+        LOGGER.debug(f"FastText detected: {best_lang} ({best_conf:.3f})")
+        return best_lang, best_conf
+    if word_count <= 2:
+        # Return even low confidence for very short text
+        return best_lang, best_conf
+    return None
+
+
+def _run_lingua(texts: List[str], expected_language: Optional[str]):
+    """
+    Lingua decisions for a batch
+
+    Returns:
+        list: (language_code, confidence) or None per text, or None when Lingua is unavailable
+    """
+    lingua_detector = _get_lingua_detector() if texts else None
+    if not lingua_detector:
+        return None
+    try:
+        if len(texts) == 1:
+            all_values = [lingua_detector.compute_language_confidence_values(texts[0])]
+        else:
+            all_values = lingua_detector.compute_language_confidence_values_in_parallel(texts)
+        return [_decide_lingua(text_clean, values, expected_language) for text_clean, values in zip(texts, all_values)]
+    except Exception as e:
+        LOGGER.debug(f"Lingua detection failed: {e}, falling back to FastText")
+        return [None] * len(texts)
+
+
+def _run_fasttext(texts: List[str], expected_language: Optional[str]):
+    """
+    FastText decisions for a batch
+
+    Returns:
+        list: (language_code, confidence) or None per text, or None when FastText is unavailable
+    """
+    fasttext_model = _get_fasttext_model() if texts else None
+    if not fasttext_model:
+        return None
+    try:
+        all_labels, all_probs = fasttext_model.predict(texts, k=10)
+        return [
+            _decide_fasttext(text_clean, labels, probs, expected_language)
+            for text_clean, labels, probs in zip(texts, all_labels, all_probs)
+        ]
+    except Exception as e:
+        LOGGER.debug(f"FastText detection failed: {e}")
+        return [None] * len(texts)
+
+
+def _detect_clean_texts(texts: List[str], expected_language: Optional[str]) -> List[Tuple[Optional[str], float]]:
+    """Detect distinct cleaned texts with the cheap tiers, then Lingua, falling back to FastText"""
+    decided: Dict[str, Tuple[Optional[str], float]] = {}
+
+    for text_clean, (tier, result) in zip(texts, _decide_cheap_tiers_batch(texts, expected_language)):
+        if result is not None:
+            decided[text_clean] = result
+            _count_tier(tier)
+
+    # Lingua for whatever the cheap tiers left open (best accuracy), then FastText
+    available = False
+    for name, run in (("lingua", _run_lingua), ("fasttext", _run_fasttext)):
+        remaining = [text for text in texts if text not in decided]
+        results = run(remaining, expected_language) if remaining else None
+        available = available or results is not None
+        for text_clean, result in zip(remaining, results or []):
+            if result is not None:
+                decided[text_clean] = result
+                _count_tier(name)
+
+    undecided = [text for text in texts if text not in decided]
+    _count_tier("undetected", len(undecided))
+    if undecided and not available:
+        _warn_unavailable()
+    elif len(undecided) == 1:
+        LOGGER.warning(f"No language detection available for '{undecided[0][:50]}'")
+    elif undecided:
+        LOGGER.warning(f"No language detection available for {len(undecided)} texts")
+    return [decided.get(text, (None, 0.0)) for text in texts]
+
+
+def detection_stages() -> Dict[str, Callable]:
+    """
+    Every detection stage as a standalone batch detector (for benchmarks)
+
+    Cheap tiers answer None when inconclusive; 'lingua' and 'fasttext' are
+    listed only when available; 'pipeline' is the full tiered detection.
+
+    Returns:
+        dict: {stage_name: fn(texts, expected_language) -> list of (language_code, confidence) or None}
+    """
+    def tier_stage(tier):
+        batch = getattr(tier, "batch", None)
+        if batch:
+            return batch
+        return lambda texts, expected_language=None: [tier(text, expected_language) for text in texts]
+
+    stages: Dict[str, Callable] = {name: tier_stage(tier) for name, tier in DETECTOR_TIERS}
+    if _get_lingua_detector() is not None:
+        stages["lingua"] = lambda texts, expected_language=None: _run_lingua(list(texts), expected_language)
+    if _get_fasttext_model() is not None:
+        stages["fasttext"] = lambda texts, expected_language=None: _run_fasttext(list(texts), expected_language)
+    stages["pipeline"] = lambda texts, expected_language=None: [
+        result if result[0] else None for result in _detect_clean_texts(list(texts), expected_language)
+    ]
+    return stages
+
+
+_UNAVAILABLE_WARNED = False
+
+
+def _warn_unavailable():
+    # Unavailable mode: say it once instead of once per text
+    global _UNAVAILABLE_WARNED
+    if not _UNAVAILABLE_WARNED:
+        _UNAVAILABLE_WARNED = True
+        LOGGER.warning("No language detector available: only script, dictionary and stopword rules apply")
+
+
+# ==========================================================
+# Public API
+# ==========================================================
 def detect_language_details(
     text: str, 
     min_confidence: float = 0.3,
-    expected_language: Optional[str] = None
+    expected_language: Optional[str] = None,
+    prior: Optional[Dict[str, float]] = None
 ) -> Tuple[Optional[str], float]:
     """
     High-accuracy language detection using Lingua-py with FastText fallback
@@ -120,124 +828,99 @@ def detect_language_details(
         text: Text to detect
         min_confidence: Minimum confidence threshold
         expected_language: Expected language as hint for tiebreaking
+        prior: Catalog language distribution (see estimate_language_prior())
+               used to resolve ambiguous short strings
         
     Returns:
         (language_code, confidence) where confidence is 0.0-1.0
     """
     if not text or not text.strip():
         return None, 0.0
-    
-    text_clean = text.replace('\n', ' ').strip()
-    word_count = len(text_clean.split())
-    
-    # Adaptive confidence threshold
-    if word_count <= 2:
-        adaptive_threshold = 0.25
-    elif word_count <= 5:
-        adaptive_threshold = 0.40
-    else:
-        adaptive_threshold = 0.50
-    
-    # Try Lingua first (best accuracy)
-    if _HAS_LINGUA and _LINGUA_DETECTOR:
-        try:
-            # Get confidence values for all languages
-            confidence_values = _LINGUA_DETECTOR.compute_language_confidence_values(text_clean)
-            
-            if confidence_values:
-                # Convert to our format
-                candidates = {}
-                for lang_confidence in confidence_values:
-                    lingua_lang = lang_confidence.language
-                    confidence = lang_confidence.value
-                    
-                    # Map back to our codes
-                    for code, lingua_enum in LINGUA_LANG_MAP.items():
-                        if lingua_enum == lingua_lang:
-                            candidates[code] = confidence
-                            LOGGER.debug(f"  Lingua candidate: {code} ({confidence:.3f})")
-                            break
-                
-                if candidates:
-                    # Find best candidate
-                    best_lang = max(candidates, key=candidates.get)
-                    best_conf = candidates[best_lang]
-                    
-                    # VERIFICATION SYSTEM (100% accuracy)
-                    if expected_language and expected_language in PRIMARY_LANGUAGES:
-                        # Normalize text for dictionary lookup
-                        import unicodedata
-                        text_norm = unicodedata.normalize('NFKD', text_clean).encode('ascii', 'ignore').decode('ascii').lower()
-                        
-                        # Rule 1: Dictionary override for known UI terms
-                        if text_norm in COMMON_UI_TERMS.get(expected_language, set()):
-                            LOGGER.debug(f"Dictionary match: {expected_language} for '{text[:50]}'")
-                            return expected_language, 1.0
-                        
-                        # Rule 2: Adaptive tolerance based on language similarity
-                        if expected_language in candidates:
-                            expected_conf = candidates[expected_language]
-                            tolerance = TOLERANCE_MAP.get(expected_language, 0.10)
-                            
-                            # If expected language is within tolerance of best, prefer it
-                            if abs(best_conf - expected_conf) <= tolerance:
-                                LOGGER.debug(f"Tolerance match: {expected_language} ({expected_conf:.3f}) within {tolerance} of best ({best_conf:.3f})")
-                                return expected_language, expected_conf
-                            
-                            # Rule 3: If expected is close (within 10%), prefer it
-                            if expected_conf >= best_conf * 0.90:
-                                LOGGER.debug(f"Expected language tiebreaker: {expected_language} ({expected_conf:.3f})")
-                                return expected_language, expected_conf
-                    
-                    # Return best match if no expected language or verification failed
-                    if best_conf >= adaptive_threshold or word_count <= 3:
-                        LOGGER.debug(f"Lingua detected: {best_lang} ({best_conf:.3f}) for '{text[:50]}'")
-                        return best_lang, best_conf
-        
-        except Exception as e:
-            LOGGER.debug(f"Lingua detection failed: {e}, falling back to FastText")
-    
-    # Fallback to FastText
-    if _HAS_FASTTEXT and _FASTTEXT_MODEL:
-        try:
-            labels, probs = _FASTTEXT_MODEL.predict(text_clean, k=10)
-            
-            candidates: Dict[str, float] = {}
-            
-            if labels and len(labels) > 0:
-                for i in range(len(labels)):
-                    lang_label = labels[i].replace('__label__', '')
-                    lang = _normalize_lang_code(lang_label)
-                    confidence = float(probs[i])
-                    
-                    if lang in PRIMARY_LANGUAGES:
-                        if lang not in candidates or confidence > candidates[lang]:
-                            candidates[lang] = confidence
-                        LOGGER.debug(f"  FastText candidate: {lang} ({confidence:.3f})")
-            
-            if candidates:
-                best_lang = max(candidates, key=candidates.get)
-                best_conf = candidates[best_lang]
-                
-                # Expected language tiebreaker
-                if expected_language and expected_language in candidates:
-                    expected_conf = candidates[expected_language]
-                    if expected_conf >= best_conf * 0.85:
-                        best_lang = expected_language
-                        best_conf = expected_conf
-                
-                if best_conf >= adaptive_threshold:
-                    LOGGER.debug(f"FastText detected: {best_lang} ({best_conf:.3f})")
-                    return best_lang, best_conf
-                elif word_count <= 2:
-                    # Return even low confidence for very short text
-                    return best_lang, best_conf
-        
-        except Exception as e:
-            LOGGER.debug(f"FastText detection failed: {e}")
-    
-    LOGGER.warning(f"No language detection available for '{text[:50]}'")
-    return None, 0.0
+
+    text_clean = _clean_text(text)
+    key = (text_clean, expected_language)
+    result = _memo_get(key)
+    if result is None:
+        result = _lookup_or_detect([text_clean], expected_language)[0]
+        _memo_put(key, result)
+    return apply_language_prior(text_clean, result, prior)
+
+
+# Compatibility with callers of the former lru_cache wrapper
+detect_language_details.cache_clear = clear_detection_cache
+
+
+def detect_languages(
+    texts: List[str],
+    min_confidence: float = 0.3,
+    expected_language: Optional[str] = None,
+    prior: Optional[Dict[str, float]] = None,
+    backend: Optional[Callable] = None
+) -> List[Tuple[Optional[str], float]]:
+    """
+    Detect the language of many texts at once
+
+    Duplicates are detected once, memoized and persisted results are reused
+    and the rest go through Lingua's parallel detection in a single call. Decisions are
+    identical to calling detect_language_details() on each text.
+
+    Args:
+        texts: Texts to detect
+        min_confidence: Minimum confidence threshold
+        expected_language: Expected language as hint for tiebreaking
+        prior: Catalog language distribution for ambiguous short strings
+        backend: Callable detecting uncached texts, with the signature of
+                 detect_uncached() (e.g. a process pool; default: in-process)
+
+    Returns:
+        list: (language_code, confidence) per input text, in input order
+    """
+    results: List[Tuple[Optional[str], float]] = [(None, 0.0)] * len(texts)
+    positions: Dict[str, List[int]] = {}
+    for index, text in enumerate(texts):
+        if text and text.strip():
+            positions.setdefault(_clean_text(text), []).append(index)
+
+    pending = []
+    for text_clean, indexes in positions.items():
+        result = _memo_get((text_clean, expected_language))
+        if result is None:
+            pending.append(text_clean)
+            continue
+        for index in indexes:
+            results[index] = result
+
+    if pending:
+        for text_clean, result in zip(pending, _lookup_or_detect(pending, expected_language, backend)):
+            _memo_put((text_clean, expected_language), result)
+            for index in positions[text_clean]:
+                results[index] = result
+
+    if prior:
+        for text_clean, indexes in positions.items():
+            result = apply_language_prior(text_clean, results[indexes[0]], prior)
+            for index in indexes:
+                results[index] = result
+    return results
+
+
+def detect_uncached(texts: List[str], expected_language: Optional[str] = None) -> List[Tuple[Optional[str], float]]:
+    """
+    Run the detectors on texts, bypassing the memo and the persistent cache
+
+    This is the unit of work of detection backends such as worker processes.
+
+    Args:
+        texts: Texts to detect
+        expected_language: Expected language as hint for tiebreaking
+
+    Returns:
+        list: (language_code, confidence) per input text, in input order
+    """
+    cleaned = [_clean_text(text) if text and text.strip() else "" for text in texts]
+    distinct = list(dict.fromkeys(text for text in cleaned if text))
+    detected = dict(zip(distinct, _detect_clean_texts(distinct, expected_language))) if distinct else {}
+    return [detected.get(text, (None, 0.0)) for text in cleaned]
 
 
 def detect_language(text: str, min_confidence: float = 0.3) -> Optional[str]:
@@ -246,11 +929,103 @@ def detect_language(text: str, min_confidence: float = 0.3) -> Optional[str]:
     return lang
 
 
+# Detections at least this confident ignore their context (and the catalog prior)
+CONTEXT_SKIP_CONFIDENCE = 0.85
+
+# ==========================================================
+# Catalog language prior
+# ==========================================================
+# Strings up to this many words are resolved with the prior when ambiguous
+PRIOR_MAX_WORDS = 2
+# Texts the cheap tiers leave open are sampled for the full detector
+PRIOR_SAMPLE_SIZE = 200
+
+
+def estimate_language_prior(
+    texts: List[str],
+    sample_size: int = PRIOR_SAMPLE_SIZE
+) -> Optional[Dict[str, float]]:
+    """
+    Estimate the language distribution of a catalog
+
+    Every distinct text goes through the cheap detection tiers; the texts they
+    leave open are represented by an evenly spaced sample run through the full
+    detector. Counts are Laplace-smoothed so no language gets a zero prior.
+
+    Args:
+        texts: Catalog strings (e.g. all msgids)
+        sample_size: Maximum texts sent to the full detector
+
+    Returns:
+        dict: {language_code: probability}, or None when there is nothing to learn from
+    """
+    distinct = list(dict.fromkeys(_clean_text(text) for text in texts if text and text.strip()))
+    if not distinct:
+        return None
+
+    counts = {lang: 1.0 for lang in sorted(PRIMARY_LANGUAGES)}
+    undecided = []
+    for text_clean, (_tier, result) in zip(distinct, _decide_cheap_tiers_batch(distinct, None)):
+        if result is None:
+            undecided.append(text_clean)
+        else:
+            counts[result[0]] += 1
+
+    if undecided:
+        sample = undecided[::max(1, len(undecided) // max(1, sample_size))][:sample_size]
+        weight = len(undecided) / len(sample)
+        for lang, _conf in detect_languages(sample):
+            if lang in counts:
+                counts[lang] += weight
+
+    total = sum(counts.values())
+    return {lang: count / total for lang, count in counts.items()}
+
+
+def apply_language_prior(
+    text_clean: str,
+    result: Tuple[Optional[str], float],
+    prior: Optional[Dict[str, float]]
+) -> Tuple[Optional[str], float]:
+    """
+    Resolve an ambiguous short-string detection with the catalog prior
+
+    The detection is read as a likelihood: the detected language with its
+    confidence, the remaining mass spread over the other languages.
+
+    Args:
+        text_clean: Cleaned text
+        result: (language_code, confidence) from the detector
+        prior: {language_code: probability}
+
+    Returns:
+        (language_code, confidence) with the highest posterior
+    """
+    lang, conf = result
+    if (
+        not prior or lang not in prior or len(prior) < 2 or conf >= CONTEXT_SKIP_CONFIDENCE
+        or len(text_clean.split()) > PRIOR_MAX_WORDS
+    ):
+        return result
+
+    others = (1.0 - conf) / (len(prior) - 1)
+    posterior = {code: probability * (conf if code == lang else others) for code, probability in prior.items()}
+    total = sum(posterior.values())
+    if not total:
+        return result
+    best = max(posterior, key=posterior.get)
+    if best != lang:
+        LOGGER.debug(f"Catalog prior prefers {best} over {lang} ({conf:.3f}) for '{text_clean[:50]}'")
+    return best, posterior[best] / total
+
+
+
 def detect_language_with_context(
     text: str, 
     context_texts: List[str] = None, 
     min_confidence: float = 0.3,
-    expected_language: Optional[str] = None
+    expected_language: Optional[str] = None,
+    prior: Optional[Dict[str, float]] = None
 ) -> Tuple[Optional[str], float]:
     """
     Context-aware detection using surrounding PO entries
@@ -266,6 +1041,7 @@ def detect_language_with_context(
         context_texts: Surrounding texts (previous/next PO entries)
         min_confidence: Minimum confidence threshold
         expected_language: Expected language as hint
+        prior: Catalog language distribution for ambiguous short strings
         
     Returns:
         (language_code, confidence)
@@ -274,21 +1050,44 @@ def detect_language_with_context(
         return None, 0.0
     
     # Detect main text with expected language hint
-    main_lang, main_conf = detect_language_details(text, min_confidence, expected_language=expected_language)
+    main_lang, main_conf = detect_language_details(
+        text, min_confidence, expected_language=expected_language, prior=prior
+    )
     
     # If high confidence or no context, return immediately
-    if main_conf >= 0.85 or not context_texts:
+    if main_conf >= CONTEXT_SKIP_CONFIDENCE or not context_texts:
         return main_lang, main_conf
     
+    context_results = detect_languages(
+        context_texts, min_confidence=0.3, expected_language=expected_language, prior=prior
+    )
+    return combine_context_votes(
+        (main_lang, main_conf),
+        [result for ctx_text, result in zip(context_texts, context_results) if ctx_text and ctx_text.strip()],
+    )
+
+
+def combine_context_votes(
+    main: Tuple[Optional[str], float],
+    context_results: List[Tuple[Optional[str], float]]
+) -> Tuple[Optional[str], float]:
+    """
+    Combine a weak detection with the detections of its context
+
+    Args:
+        main: (language_code, confidence) of the main text
+        context_results: Detections of the non-empty context texts, in order
+
+    Returns:
+        (language_code, confidence)
+    """
+    main_lang, main_conf = main
+
     # Analyze context
     context_votes: Dict[str, int] = {}
     context_confs: Dict[str, List[float]] = {}
     
-    for ctx_text in context_texts:
-        if not ctx_text or not ctx_text.strip():
-            continue
-        
-        ctx_lang, ctx_conf = detect_language_details(ctx_text, min_confidence=0.3, expected_language=expected_language)
+    for ctx_lang, ctx_conf in context_results:
         if ctx_lang and ctx_conf > 0.3:
             context_votes[ctx_lang] = context_votes.get(ctx_lang, 0) + 1
             if ctx_lang not in context_confs:
@@ -300,7 +1099,7 @@ def detect_language_with_context(
     
     # Get most common language in context
     context_lang = max(context_votes, key=context_votes.get)
-    context_strength = context_votes[context_lang] / len([t for t in context_texts if t and t.strip()])
+    context_strength = context_votes[context_lang] / len(context_results)
     context_avg_conf = sum(context_confs[context_lang]) / len(context_confs[context_lang])
     
     # Decision logic
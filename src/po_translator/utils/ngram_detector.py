@@ -0,0 +1,427 @@
+"""
+Character n-gram language detector
+Naive Bayes over hashed 1-3 character n-grams, trained from Odoo PO files and
+scored with vectorized NumPy operations over whole batches of strings
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with the detector extras
+    np = None
+
+from po_translator.utils import detector_models
+
+LOGGER = logging.getLogger(__name__)
+
+# Path to a trained model, or "none"/"off" to disable the n-gram tier
+MODEL_ENV = "PO_TRANSLATOR_NGRAM_MODEL"
+MODEL_FILENAME = "ngram_model.npz"
+
+# Bump when the featurization changes so older model files are rejected
+FORMAT_VERSION = 1
+
+NGRAM_ORDERS = (1, 2, 3)
+DEFAULT_BUCKETS = 1 << 16
+SMOOTHING = 0.5
+
+# Decision thresholds: enough n-grams and a confident calibrated posterior
+MIN_NGRAMS = 12
+MIN_CONFIDENCE = 0.95
+EXPECTED_OVERRULE = 0.01
+# Below the dictionary tier, which is certain
+MAX_CONFIDENCE = 0.99
+
+# Placeholders, markup and non-letters never span the \0 separating batched strings
+_PLACEHOLDERS = re.compile(r"%\([^)\0]*\)[a-zA-Z]|%[-+ #0]*\d*(?:\.\d+)?[a-zA-Z%]|\{[^{}\0]*\}|<[^<>\0]+>|&\w+;")
+_NON_LETTERS = re.compile(r"(?:[^\w\0]|[\d_])+")
+_SPACES = re.compile(r" {2,}")
+_HASH_MULTIPLIER = 1000003
+_HASH_MIX = 0x9E3779B97F4A7C15
+
+
+def numpy_available() -> bool:
+    """Check whether NumPy is installed (the detector needs it)"""
+    return np is not None
+
+
+def normalize(texts: Sequence[str]) -> str:
+    """
+    Lowercase letters-only form of many strings in one pass
+
+    Returns:
+        The strings joined by \\0 separators (one after each string), every
+        word surrounded by single spaces
+    """
+    joined = _PLACEHOLDERS.sub(" ", "\0".join(texts).lower())
+    joined = _NON_LETTERS.sub(" ", joined).replace("\0", " \0 ")
+    return _SPACES.sub(" ", f" {joined} \0")
+
+
+def _featurize(texts: Sequence[str], buckets: int, orders: Sequence[int]):
+    """
+    Hash the n-grams of many strings at once
+
+    Returns:
+        (bucket ids, row ids) of every n-gram in string order, rows indexing ``texts``
+    """
+    # One code point array for the batch, each string terminated by a 0 separator
+    codes = np.frombuffer(normalize(texts).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    size = len(codes)
+    seen = np.concatenate(([0], np.cumsum(codes == 0)))
+
+    # One column per order, n-grams keyed by their start position
+    hashed = np.zeros((size, len(orders)), dtype=np.uint64)
+    valid = np.zeros((size, len(orders)), dtype=bool)
+    for column, order in enumerate(orders):
+        count = size - order + 1
+        if count <= 0:
+            continue
+        values = np.full(count, order, dtype=np.uint64)
+        for offset in range(order):
+            values = values * np.uint64(_HASH_MULTIPLIER) + codes[offset:offset + count]
+        hashed[:count, column] = (values * np.uint64(_HASH_MIX)) >> np.uint64(32)
+        # n-grams crossing a separator belong to no string
+        valid[:count, column] = seen[order:order + count] == seen[:count]
+        if order == 1:
+            # Spaces carry no language information on their own
+            valid[:count, column] &= codes[:count] != 32
+
+    keep = valid.ravel()
+    bucket_ids = (hashed.ravel()[keep] % np.uint64(buckets)).astype(np.int64)
+    # Row of every position: separators before it
+    rows = np.repeat(seen[:-1], len(orders))[keep]
+    return bucket_ids, rows
+
+
+class NgramDetector:
+    """Hashed character n-gram language model with batch scoring"""
+
+    def __init__(self, languages: Sequence[str], table, orders: Sequence[int] = NGRAM_ORDERS):
+        """
+        Initialize detector
+
+        Args:
+            languages: Language codes, one per table row
+            table: Log-probability array of shape (languages, buckets)
+            orders: N-gram lengths the table was trained with
+        """
+        if np is None:
+            raise ImportError("NumPy is required for the n-gram detector")
+        self.languages = list(languages)
+        self.orders = tuple(int(order) for order in orders)
+        table = np.asarray(table, dtype=np.float32)
+        if table.shape[0] != len(self.languages):
+            raise ValueError("N-gram table rows do not match the languages")
+        # Bucket-major, so gathering an n-gram reads all its languages at once
+        self._by_bucket = np.ascontiguousarray(table.T)
+        self._fingerprint = None
+
+    @property
+    def table(self):
+        """Log-probabilities, shape (languages, buckets)"""
+        return self._by_bucket.T
+
+    @property
+    def buckets(self) -> int:
+        """Hash buckets per language"""
+        return self._by_bucket.shape[0]
+
+    @property
+    def fingerprint(self) -> str:
+        """Short hash identifying the trained tables"""
+        if self._fingerprint is None:
+            digest = hashlib.sha1()
+            digest.update(",".join(self.languages).encode("utf-8"))
+            digest.update(",".join(map(str, self.orders)).encode("utf-8"))
+            digest.update(self.table.astype(np.float16).tobytes())
+            self._fingerprint = digest.hexdigest()[:12]
+        return self._fingerprint
+
+    # ==========================================================
+    # Training and persistence
+    # ==========================================================
+    @classmethod
+    def train(
+        cls,
+        samples: Dict[str, Iterable[str]],
+        buckets: int = DEFAULT_BUCKETS,
+        orders: Sequence[int] = NGRAM_ORDERS,
+        smoothing: float = SMOOTHING
+    ) -> "NgramDetector":
+        """
+        Estimate smoothed n-gram log-probabilities per language
+
+        Args:
+            samples: {language_code: training strings}
+            buckets: Hash buckets per language
+            orders: N-gram lengths
+            smoothing: Additive smoothing per bucket
+
+        Returns:
+            Trained NgramDetector
+        """
+        if np is None:
+            raise ImportError("NumPy is required for the n-gram detector")
+        languages = sorted(lang for lang, texts in samples.items() if texts)
+        if not languages:
+            raise ValueError("No training samples")
+
+        table = np.empty((len(languages), buckets), dtype=np.float32)
+        for row, lang in enumerate(languages):
+            bucket_ids, _rows = _featurize(list(samples[lang]), buckets, orders)
+            counts = np.bincount(bucket_ids, minlength=buckets).astype(np.float64) + smoothing
+            table[row] = np.log(counts / counts.sum())
+        return cls(languages, table, orders)
+
+    @classmethod
+    def load(cls, path) -> "NgramDetector":
+        """
+        Load a model written by save()
+
+        Raises:
+            ValueError: File written by an incompatible version
+            OSError: File cannot be read
+        """
+        if np is None:
+            raise ImportError("NumPy is required for the n-gram detector")
+        with np.load(Path(path), allow_pickle=False) as data:
+            if int(data["format_version"]) != FORMAT_VERSION:
+                raise ValueError(f"Unsupported n-gram model format {int(data['format_version'])}")
+            return cls([str(lang) for lang in data["languages"]], data["table"], data["orders"])
+
+    def save(self, path) -> Path:
+        """
+        Write the model as a compressed NumPy archive (float16 tables)
+
+        Args:
+            path: Destination file
+
+        Returns:
+            Path of the written model
+        """
+        target = Path(path).expanduser()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, partial = tempfile.mkstemp(prefix=target.name, suffix=".part", dir=target.parent)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                np.savez_compressed(
+                    handle,
+                    format_version=np.array(FORMAT_VERSION),
+                    languages=np.array(self.languages),
+                    orders=np.array(self.orders, dtype=np.int64),
+                    table=self.table.astype(np.float16),
+                )
+            os.replace(partial, target)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+        return target
+
+    # ==========================================================
+    # Scoring
+    # ==========================================================
+    def score(self, texts: Sequence[str]):
+        """
+        Log-likelihood of every string under every language
+
+        Args:
+            texts: Strings to score
+
+        Returns:
+            (scores, counts): array (texts, languages) and n-grams per text
+        """
+        bucket_ids, rows = _featurize(texts, self.buckets, self.orders)
+        counts = np.bincount(rows, minlength=len(texts))
+        scores = np.zeros((len(texts), len(self.languages)), dtype=np.float64)
+        if len(rows):
+            # n-grams are grouped by string: sum each group in one reduction
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            present = counts > 0
+            scores[present] = np.add.reduceat(self._by_bucket[bucket_ids], starts[present], axis=0)
+        return scores, counts
+
+    def posteriors(self, texts: Sequence[str]):
+        """
+        Calibrated language probabilities of every string
+
+        Every character takes part in one n-gram per order, so the naive
+        Bayes log-likelihoods are divided by the number of orders before
+        normalizing; raw posteriors would be overconfident.
+
+        Returns:
+            (posteriors, counts): array (texts, languages) and n-grams per text
+        """
+        scores, counts = self.score(texts)
+        scaled = scores / len(self.orders)
+        weights = np.exp(scaled - scaled.max(axis=1, keepdims=True))
+        return weights / weights.sum(axis=1, keepdims=True), counts
+
+    def predict(self, texts: Sequence[str]) -> List[Tuple[Optional[str], float]]:
+        """
+        Most likely language of each string, without decision thresholds
+
+        Returns:
+            list: (language_code, probability) per text; (None, 0.0) for strings without letters
+        """
+        if not texts:
+            return []
+        posteriors, counts = self.posteriors(texts)
+        best = posteriors.argmax(axis=1)
+        return [
+            (self.languages[index], float(posteriors[row, index])) if counts[row] else (None, 0.0)
+            for row, index in enumerate(best)
+        ]
+
+    def decide(
+        self,
+        texts: Sequence[str],
+        expected_language: Optional[str] = None,
+        min_ngrams: int = MIN_NGRAMS,
+        min_confidence: float = MIN_CONFIDENCE
+    ) -> List[Optional[Tuple[str, float]]]:
+        """
+        Conclusive detections only, for use as a detection tier
+
+        A string is decided when it has enough n-grams and its best language
+        reaches ``min_confidence``. Overruling the expected language also
+        takes its probability to be below EXPECTED_OVERRULE.
+
+        Args:
+            texts: Strings to detect
+            expected_language: Expected language as hint for tiebreaking
+            min_ngrams: Minimum n-grams for a decision
+            min_confidence: Minimum calibrated probability
+
+        Returns:
+            list: (language_code, confidence) or None per text
+        """
+        if not texts:
+            return []
+        posteriors, counts = self.posteriors(texts)
+        best = posteriors.argmax(axis=1)
+        confidence = posteriors[np.arange(len(texts)), best]
+        conclusive = (counts >= min_ngrams) & (confidence >= min_confidence)
+        if expected_language in self.languages:
+            expected = self.languages.index(expected_language)
+            conclusive &= (best == expected) | (posteriors[:, expected] < EXPECTED_OVERRULE)
+
+        return [
+            (self.languages[best[row]], min(MAX_CONFIDENCE, float(confidence[row])))
+            if conclusive[row] else None
+            for row in range(len(texts))
+        ]
+
+
+# ==========================================================
+# Training corpora
+# ==========================================================
+_LOCALE_NAME = re.compile(r"^([a-z]{2,3})(?:[_-][A-Za-z]{2,4})?$")
+
+
+def catalog_language(po, path=None) -> Optional[str]:
+    """
+    Language of a catalog's translations
+
+    Args:
+        po: polib catalog
+        path: Catalog file, whose name (fr.po, fr_BE.po) is used without a Language header
+
+    Returns:
+        Two-letter language code, or None when unknown
+    """
+    candidates = [(po.metadata or {}).get("Language", "")]
+    if path is not None:
+        candidates.append(Path(path).stem)
+    for candidate in candidates:
+        match = _LOCALE_NAME.match((candidate or "").strip())
+        if match:
+            return match.group(1).lower()
+    return None
+
+
+def corpus_from_po_files(paths: Iterable, source_language: str = "en") -> Dict[str, List[str]]:
+    """
+    Collect training strings from PO files
+
+    msgids are Odoo source strings (``source_language``); translated msgstrs
+    belong to the catalog language (Language header or file name).
+
+    Args:
+        paths: PO files
+        source_language: Language of the msgids
+
+    Returns:
+        dict: {language_code: distinct strings}
+    """
+    import polib
+
+    samples: Dict[str, Dict[str, None]] = {}
+    for path in paths:
+        po = polib.pofile(str(path))
+        target = catalog_language(po, path)
+        if target is None:
+            LOGGER.warning(f"Unknown language for {path}: only its msgids are used")
+        for entry in po:
+            if entry.obsolete:
+                continue
+            sources = [entry.msgid, entry.msgid_plural]
+            samples.setdefault(source_language, {}).update(dict.fromkeys(text for text in sources if text))
+            if target is None or "fuzzy" in entry.flags:
+                continue
+            translations = [entry.msgstr] + list((entry.msgstr_plural or {}).values())
+            samples.setdefault(target, {}).update(dict.fromkeys(
+                text for text in translations if text and text not in sources
+            ))
+    return {lang: list(texts) for lang, texts in samples.items() if texts}
+
+
+# ==========================================================
+# Default model location
+# ==========================================================
+_CONFIGURED_PATH: Optional[str] = None
+
+
+def configure_model_path(path: Optional[str]) -> None:
+    """
+    Select the n-gram model file (takes precedence over $PO_TRANSLATOR_NGRAM_MODEL)
+
+    Args:
+        path: Model file, "none" to disable the tier, or None to restore the default lookup
+    """
+    global _CONFIGURED_PATH
+    _CONFIGURED_PATH = str(path) if path is not None else None
+
+
+def configured_model_setting() -> Optional[str]:
+    """Model path or switch from configure_model_path() or the environment"""
+    if _CONFIGURED_PATH is not None:
+        return _CONFIGURED_PATH
+    return os.environ.get(MODEL_ENV) or None
+
+
+def default_model_path() -> Path:
+    """Where trained models are stored by default"""
+    return detector_models.MODEL_DIR / MODEL_FILENAME
+
+
+def resolve_model_path() -> Optional[Path]:
+    """
+    Find the n-gram model to load
+
+    Returns:
+        Path of an existing model file, or None when missing or disabled
+    """
+    setting = configured_model_setting()
+    if setting is not None and setting.strip().lower() in {"none", "off", "0", "false"}:
+        return None
+    path = Path(setting).expanduser() if setting else default_model_path()
+    return path if path.is_file() else None
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import contextlib
+import io
+import json
 import os
 import shutil
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 import polib
 
@@ -13,6 +17,7 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from po_translator import cli
+from po_translator.core.mo_format import write_mo
 
 
 class CLITestCase(unittest.TestCase):
@@ -24,39 +29,185 @@ class CLITestCase(unittest.TestCase):
     def tearDown(self) -> None:
         shutil.rmtree(self.tmpdir, ignore_errors=True)
 
-    def test_offline_translation_in_place(self) -> None:
-        exit_code = cli.main(
-            [
-                'translate',
-                str(self.sample),
-                '--source', 'fr',
-                '--target', 'en',
-                '--offline',
-                '--in-place',
-            ]
-        )
+    def test_translation_in_place(self) -> None:
+        from test_translation_pipeline import FakeModel
+
+        def fake_set_api_key(translator, api_key):
+            translator.model = FakeModel()
+            translator.rate_limit = 0
+
+        with mock.patch.dict(os.environ, {"HOME": self.tmpdir}), \
+                mock.patch.object(cli.Translator, "set_api_key", fake_set_api_key), \
+                mock.patch("po_translator.translator.detect_language", return_value="fr"), \
+                mock.patch("po_translator.translator.detect_languages",
+                           side_effect=lambda texts, **_kwargs: [("fr", 1.0)] * len(texts)), \
+                contextlib.redirect_stdout(io.StringIO()):
+            exit_code = cli.main(
+                ['translate', str(self.sample), '--source', 'fr', '--target', 'en', '--api-key', 'test', '--in-place']
+            )
         self.assertEqual(exit_code, 0)
 
         po = polib.pofile(str(self.sample))
-        translated = [entry for entry in po if entry.msgstr]
-        self.assertGreater(len(translated), 0, "at least one entry should be translated offline")
+        self.assertTrue(all(entry.msgstr == f"FR {entry.msgid}" for entry in po))
 
     def test_dry_run_does_not_modify_files(self) -> None:
-        exit_code = cli.main(
-            [
-                'translate',
-                str(self.sample),
-                '--source', 'fr',
-                '--target', 'en',
-                '--offline',
-                '--dry-run',
-            ]
-        )
+        with mock.patch.dict(os.environ, {"HOME": self.tmpdir}), contextlib.redirect_stdout(io.StringIO()):
+            exit_code = cli.main(
+                [
+                    'translate',
+                    str(self.sample),
+                    '--source', 'fr',
+                    '--target', 'en',
+                    '--dry-run',
+                ]
+            )
         self.assertEqual(exit_code, 0, "dry run should complete successfully")
 
         po = polib.pofile(str(self.sample))
         self.assertTrue(all(not entry.msgstr for entry in po))
 
+    def test_ndjson_streams_one_line_per_entry(self) -> None:
+        from test_translation_pipeline import FakeModel
+
+        def fake_set_api_key(translator, api_key):
+            translator.model = FakeModel()
+            translator.rate_limit = 0
+
+        stdout = io.StringIO()
+        with mock.patch.dict(os.environ, {"HOME": self.tmpdir}), \
+                mock.patch.object(cli.Translator, "set_api_key", fake_set_api_key), \
+                mock.patch("po_translator.translator.detect_language", return_value="fr"), \
+                mock.patch("po_translator.translator.detect_languages",
+                           side_effect=lambda texts, **_kwargs: [("fr", 1.0)] * len(texts)), \
+                contextlib.redirect_stdout(stdout):
+            exit_code = cli.main(
+                ['translate', str(self.sample), '--source', 'fr', '--target', 'en',
+                 '--api-key', 'test', '--ndjson', '--output-dir', self.tmpdir]
+            )
+
+        self.assertEqual(exit_code, 0)
+        events = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        results = [event for event in events if event["event"] == "result"]
+        self.assertEqual(len(results), len(polib.pofile(str(self.sample))))
+        self.assertTrue(all(event["source"] == "api" for event in results))
+        self.assertEqual(events[-1]["event"], "summary")
+        output = polib.pofile(str(Path(self.tmpdir) / "sample.en.po"))
+        self.assertTrue(all(entry.msgstr.startswith("FR ") for entry in output))
+
+    def test_translation_memory_answers_before_the_api(self) -> None:
+        from test_translation_pipeline import FakeModel
+
+        memory = Path(self.tmpdir) / "en.mo"
+        entries = list(polib.pofile(str(self.sample)))
+        for entry in entries:
+            entry.msgstr = f"MEM {entry.msgid}"
+        write_mo(entries, memory, {"Language": "en", "Content-Type": "text/plain; charset=UTF-8"})
+
+        def fake_set_api_key(translator, api_key):
+            translator.model = FakeModel()
+            translator.rate_limit = 0
+
+        stdout = io.StringIO()
+        with mock.patch.dict(os.environ, {"HOME": self.tmpdir}), \
+                mock.patch.object(cli.Translator, "set_api_key", fake_set_api_key), \
+                mock.patch("po_translator.translator.detect_language", return_value="fr"), \
+                mock.patch("po_translator.translator.detect_languages",
+                           side_effect=lambda texts, **_kwargs: [("fr", 1.0)] * len(texts)), \
+                contextlib.redirect_stdout(stdout):
+            exit_code = cli.main(
+                ['translate', str(self.sample), '--source', 'fr', '--target', 'en', '--memory', str(memory),
+                 '--api-key', 'test', '--ndjson', '--output-dir', self.tmpdir]
+            )
+
+        self.assertEqual(exit_code, 0)
+        results = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertTrue(all(event["source"] == "tm" for event in results if event["event"] == "result"))
+        output = polib.pofile(str(Path(self.tmpdir) / "sample.en.po"))
+        self.assertTrue(all(entry.msgstr == f"MEM {entry.msgid}" for entry in output))
+
+        memory.write_bytes(b"not a catalog")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(cli.main(['translate', str(self.sample), '--memory', str(memory)]), 1)
+
+    def test_model_download_is_explicit(self) -> None:
+        from po_translator.utils import detector_models
+
+        def fake_download(url, filename, reporthook=None):
+            Path(filename).write_bytes(b"model")
+
+        target = Path(self.tmpdir) / "models" / "lid.176.ftz"
+        stdout = io.StringIO()
+        with mock.patch("urllib.request.urlretrieve", side_effect=fake_download) as download, \
+                contextlib.redirect_stdout(stdout):
+            exit_code = cli.main(['model', 'download', '--path', str(target), '--ndjson'])
+        self.addCleanup(detector_models.configure_model_path, None)
+
+        self.assertEqual(exit_code, 0)
+        self.assertTrue(download.call_args.args[0].endswith("lid.176.ftz"))
+        self.assertEqual(target.read_bytes(), b"model")
+        self.assertEqual([path.name for path in target.parent.iterdir()], ["lid.176.ftz"])
+        status = json.loads(stdout.getvalue().splitlines()[-1])
+        self.assertEqual(status["fasttext_path"], str(target))
+
+
+    def test_train_ngram_model_from_po_files(self) -> None:
+        from po_translator.utils import ngram_detector
+        from po_translator.utils.language import reset_detectors
+
+        corpus = Path(__file__).parent / "test_files" / "fr_translated_20251029.po"
+        target = Path(self.tmpdir) / "models" / "ngram.npz"
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            exit_code = cli.main(['model', 'train-ngram', str(corpus), '--path', str(target), '--ndjson'])
+        self.addCleanup(reset_detectors)
+        self.addCleanup(ngram_detector.configure_model_path, None)
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(ngram_detector.NgramDetector.load(target).languages, ["en", "fr"])
+        status = json.loads(stdout.getvalue().splitlines()[-1])
+        # Two languages are not enough to act as a detection tier
+        self.assertEqual((status["ngram"], status["ngram_path"]), ("incomplete", str(target)))
+
+
+    def test_compile_catalogs_to_mo(self) -> None:
+        german = Path(self.tmpdir) / "de.po"
+        shutil.copy(Path(__file__).parent / "test_files" / "test_mixed.po", german)
+        output_dir = Path(self.tmpdir) / "mo"
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            exit_code = cli.main(['compile', str(self.sample), str(german), '--output-dir', str(output_dir),
+                                  '--workers', '1', '--ndjson'])
+
+        self.assertEqual(exit_code, 0)
+        events = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([event["output"] for event in events],
+                         [str(output_dir / "sample.mo"), str(output_dir / "de.mo")])
+        for source in (self.sample, german):
+            compiled = polib.mofile(str(output_dir / f"{source.stem}.mo"))
+            self.assertEqual(len(compiled), len(polib.pofile(str(source)).translated_entries()))
+
+
+    def test_verify_mo_reports_lookups(self) -> None:
+        compiled = Path(self.tmpdir) / "sample.mo"
+        plain = Path(self.tmpdir) / "plain.mo"
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(cli.main(['compile', str(self.sample), '--workers', '1']), 0)
+        polib.pofile(str(self.sample)).save_as_mofile(str(plain))
+
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            exit_code = cli.main(['verify-mo', str(compiled), str(plain), '--ndjson'])
+
+        self.assertEqual(exit_code, 0)
+        hashed, unhashed = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertTrue(hashed["valid"])
+        self.assertGreater(hashed["hash_size"], hashed["messages"])
+        self.assertEqual(unhashed["hash_size"], 0)
+
+        plain.write_bytes(b"\0" * 64)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(cli.main(['verify-mo', str(plain)]), 1)
+
 
 class HelperScriptsTestCase(unittest.TestCase):
     def test_test_translator_import_safe(self) -> None:
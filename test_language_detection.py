@@ -0,0 +1,619 @@
+import glob
+import importlib.util
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import polib
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from po_translator.core.language_analysis import (  # noqa: E402
+    ProcessPoolDetector, analyze_languages, estimate_catalog_priors, iter_context_windows, iter_language_analysis
+)
+from po_translator.utils import detector_models, language, ngram_detector  # noqa: E402
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_files')
+
+# Importing the translator must not load detector models
+IMPORT_TIME_BUDGET = 1.5  # seconds
+
+
+class DetectorInitializationTestCase(unittest.TestCase):
+    def test_import_is_lazy_and_within_budget(self):
+        script = (
+            "import json, sys, time\n"
+            "started = time.perf_counter()\n"
+            "import po_translator.translator\n"
+            "elapsed = time.perf_counter() - started\n"
+            "from po_translator.utils import language\n"
+            "print(json.dumps({'elapsed': elapsed, 'loaded': language.detectors_loaded(),\n"
+            "                  'lingua': 'lingua' in sys.modules, 'fasttext': 'fasttext' in sys.modules}))\n"
+        )
+        with tempfile.TemporaryDirectory() as home:
+            env = dict(os.environ, HOME=home, PYTHONPATH=SRC_DIR)
+            output = subprocess.run(
+                [sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True
+            ).stdout
+        report = json.loads(output.strip().splitlines()[-1])
+
+        self.assertFalse(report["loaded"])
+        self.assertFalse(report["lingua"])
+        self.assertFalse(report["fasttext"])
+        self.assertLess(report["elapsed"], IMPORT_TIME_BUDGET)
+
+    def test_background_warm_up_loads_detectors(self):
+        # Never fetch the FastText model from a test run
+        with mock.patch.object(language, "_get_fasttext_model") as load_fasttext:
+            thread = language.warm_up_detectors(background=True)
+            thread.join(timeout=60)
+
+        self.assertFalse(thread.is_alive())
+        self.assertTrue(language._LINGUA_LOADED)
+        load_fasttext.assert_called_once_with()
+
+
+class BatchDetectionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        language.configure_detection_cache(os.path.join(self.tmp.name, "detections.sqlite3"))
+        language.clear_detection_cache()
+
+    def tearDown(self):
+        language.configure_detection_cache(enabled=False)
+        self.tmp.cleanup()
+
+    def test_batch_matches_single_detection(self):
+        texts = ["Confirmer la commande", "Create a new order", "Client", "", "Annuler", "Client"]
+
+        batch = language.detect_languages(texts, expected_language="fr")
+        language.clear_detection_cache()
+        single = [language.detect_language_details(text, expected_language="fr") for text in texts]
+
+        self.assertEqual([lang for lang, _ in batch], [lang for lang, _ in single])
+        for (_, batch_conf), (_, single_conf) in zip(batch, single):
+            self.assertAlmostEqual(batch_conf, single_conf, places=9)
+        self.assertEqual(batch[3], (None, 0.0))
+
+    def test_batch_detects_each_distinct_text_once(self):
+        texts = ["Invoice", "Invoice\n", " Invoice ", "Delivery", "Invoice"]
+        with mock.patch.object(
+            language, "_detect_clean_texts", side_effect=lambda items, _expected: [("en", 0.9)] * len(items)
+        ) as detect:
+            results = language.detect_languages(texts, expected_language="en")
+            language.detect_languages(texts, expected_language="en")
+
+        detect.assert_called_once_with(["Invoice", "Delivery"], "en")
+        self.assertEqual(results, [("en", 0.9)] * len(texts))
+        self.assertEqual(language.detect_language_details("Invoice", expected_language="en"), ("en", 0.9))
+
+
+class TieredDetectionTestCase(unittest.TestCase):
+    def setUp(self):
+        language.configure_detection_cache(enabled=False)
+        language.clear_detection_cache()
+        language.reset_detection_tier_stats()
+
+    def _without_models(self):
+        no_model = AssertionError("model invoked")
+        return mock.patch.multiple(
+            language,
+            _get_lingua_detector=mock.Mock(side_effect=no_model),
+            _get_fasttext_model=mock.Mock(side_effect=no_model),
+        )
+
+    def test_cheap_tiers_decide_without_models(self):
+        texts = ["مرحبا بكم في أودو", "Facture", "Vous devez valider les factures avant leur envoi",
+                 "The invoice must be validated before sending it"]
+        with self._without_models():
+            results = language.detect_languages(texts, expected_language="en")
+
+        self.assertEqual([lang for lang, _ in results], ["ar", "fr", "fr", "en"])
+        stats = language.detection_tier_stats()
+        self.assertEqual((stats["script"], stats["dictionary"], stats["stopwords"]), (1, 1, 2))
+        self.assertEqual(stats["lingua"], 0)
+
+    def test_dictionary_prefers_expected_language_for_shared_terms(self):
+        with self._without_models():
+            self.assertEqual(language.detect_language_details("Cliente", expected_language="it"), ("it", 1.0))
+
+    def test_inconclusive_texts_reach_lingua(self):
+        with mock.patch.object(language, "_decide_lingua", return_value=("en", 0.7)) as decide:
+            results = language.detect_languages(["Cliente", "Confirm order"], expected_language="fr")
+
+        self.assertEqual(decide.call_count, 2)
+        self.assertEqual(results, [("en", 0.7)] * 2)
+        self.assertEqual(language.detection_tier_stats()["lingua"], 2)
+
+    def test_registered_glossary_terms_change_detector_version(self):
+        before = language.detector_version()
+        self.assertEqual(language.register_glossary_terms("nl", ["Boekhoudkundige post"]), 1)
+        self.assertEqual(language.register_glossary_terms("nl", ["boekhoudkundige post"]), 0)
+
+        self.assertNotEqual(language.detector_version(), before)
+        with self._without_models():
+            self.assertEqual(language.detect_language_details("Boekhoudkundige post")[0], "nl")
+
+
+def per_entry_status(entry, catalog, expected_source, expected_target, source_prior=None, target_prior=None):
+    """Former per-entry analysis: neighbours and context re-detected for every entry"""
+    index = next((i for i, e in enumerate(catalog) if e is entry), None)
+    context = []
+    if index is not None:
+        context = [
+            e.msgid for e in catalog[max(0, index - 3):min(len(catalog), index + 4)]
+            if e.msgid and e.msgid.strip() and e is not entry
+        ]
+    msgid, msgstr = (entry.msgid or "").strip(), (entry.msgstr or "").strip()
+    source = language.detect_language_with_context(
+        msgid, context_texts=context[:5] or None, expected_language=expected_source, prior=source_prior
+    )
+    translation = (None, 0.0)
+    if not language.is_untranslated(entry.msgid, entry.msgstr) and msgstr:
+        translation = language.detect_language_with_context(
+            msgstr, context_texts=[msgid] + context[:4], expected_language=expected_target, prior=target_prior
+        )
+    return source, translation
+
+
+class LanguageAnalysisTestCase(unittest.TestCase):
+    def setUp(self):
+        language.configure_detection_cache(enabled=False)
+        language.clear_detection_cache()
+
+    def test_windows_match_neighbour_slices(self):
+        catalog = [SimpleNamespace(msgid=text) for text in ["a", "", "b", "c", " ", "d", "e", "f", "g", "", "h"]]
+        for index, window in iter_context_windows(catalog):
+            expected = [
+                i for i in range(max(0, index - 3), min(len(catalog), index + 4))
+                if catalog[i].msgid.strip() and i != index
+            ][:5]
+            self.assertEqual(window, expected)
+
+    def test_one_pass_matches_per_entry_decisions(self):
+        for path in sorted(glob.glob(os.path.join(FIXTURES, "*.po"))):
+            catalog = list(polib.pofile(path))
+            priors = estimate_catalog_priors(catalog)
+            for (source, target), (source_prior, target_prior) in itertools.product(
+                (("en", "fr"), ("fr", "en")), ((None, None), priors)
+            ):
+                statuses = analyze_languages(catalog, source, target, catalog=catalog,
+                                             source_prior=source_prior, target_prior=target_prior)
+                for entry, status in zip(catalog, statuses):
+                    (src_lang, src_conf), (trans_lang, trans_conf) = per_entry_status(
+                        entry, catalog, source, target, source_prior, target_prior
+                    )
+                    with self.subTest(path=os.path.basename(path), msgid=entry.msgid, source=source,
+                                      prior=source_prior is not None):
+                        self.assertEqual(status.source_lang, src_lang)
+                        self.assertAlmostEqual(status.source_confidence, src_conf, places=9)
+                        self.assertEqual(status.translation_lang, trans_lang)
+                        self.assertAlmostEqual(status.translation_confidence, trans_conf, places=9)
+
+    def test_detects_in_a_few_batch_calls(self):
+        catalog = list(polib.pofile(os.path.join(FIXTURES, "test_mixed.po")))
+        with mock.patch("po_translator.core.language_analysis.detect_languages",
+                        wraps=language.detect_languages) as detect, \
+                mock.patch.object(language, "detect_language_details", side_effect=AssertionError("single call")):
+            statuses = analyze_languages(catalog[3:], "en", "fr", catalog=catalog)
+
+        self.assertEqual(len(statuses), len(catalog) - 3)
+        self.assertLessEqual(detect.call_count, 4)
+
+
+class LanguagePriorTestCase(unittest.TestCase):
+    FRENCH_CATALOG = {"fr": 0.86, "en": 0.02, "es": 0.02, "de": 0.02, "it": 0.02, "pt": 0.02, "nl": 0.02, "ar": 0.02}
+
+    def setUp(self):
+        language.configure_detection_cache(enabled=False)
+        language.clear_detection_cache()
+
+    def test_prior_resolves_ambiguous_short_strings(self):
+        lang, conf = language.apply_language_prior("Statut", ("en", 0.4), self.FRENCH_CATALOG)
+
+        self.assertEqual(lang, "fr")
+        self.assertGreater(conf, 0.5)
+
+    def test_prior_leaves_confident_and_long_strings_alone(self):
+        self.assertEqual(language.apply_language_prior("Invoice", ("en", 0.9), self.FRENCH_CATALOG), ("en", 0.9))
+        self.assertEqual(
+            language.apply_language_prior("Create a new invoice", ("en", 0.4), self.FRENCH_CATALOG), ("en", 0.4)
+        )
+        self.assertEqual(language.apply_language_prior("Statut", ("en", 0.4), None), ("en", 0.4))
+
+    def test_estimate_covers_every_entry_and_samples_the_detector(self):
+        texts = ["Facture"] * 3 + [f"Ligne {number}" for number in range(50)]
+        with mock.patch.object(
+            language, "detect_languages", side_effect=lambda sample, **_kw: [("fr", 0.6)] * len(sample)
+        ) as detect:
+            prior = language.estimate_language_prior(texts, sample_size=10)
+
+        self.assertLessEqual(len(detect.call_args.args[0]), 10)
+        self.assertAlmostEqual(sum(prior.values()), 1.0)
+        # 1 dictionary hit + 50 sampled texts, Laplace-smoothed over 8 languages
+        self.assertAlmostEqual(prior["fr"], 52 / 59)
+        self.assertIsNone(language.estimate_language_prior(["", "  "]))
+
+    def test_catalog_prior_corrects_translation_languages(self):
+        catalog = list(polib.pofile(os.path.join(FIXTURES, "test_mixed.po")))
+        source_prior, target_prior = estimate_catalog_priors(catalog)
+        statuses = analyze_languages(catalog, "fr", "en", catalog=catalog,
+                                     source_prior=source_prior, target_prior=target_prior)
+
+        by_msgstr = {entry.msgstr: status for entry, status in zip(catalog, statuses)}
+        self.assertEqual(max(target_prior, key=target_prior.get), "en")
+        for msgstr in ("Status", "Active", "ZIP Code"):
+            self.assertTrue(by_msgstr[msgstr].translation_matches, msgstr)
+
+
+class ParallelAnalysisTestCase(unittest.TestCase):
+    def setUp(self):
+        language.configure_detection_cache(enabled=False)
+        language.clear_detection_cache()
+        self.catalog = []
+        for path in sorted(glob.glob(os.path.join(FIXTURES, "*.po"))):
+            self.catalog.extend(polib.pofile(path))
+
+    def test_process_pool_matches_in_process_detection(self):
+        texts = [text for entry in self.catalog for text in (entry.msgid, entry.msgstr)]
+        progress = []
+        detector = ProcessPoolDetector(
+            workers=2, shard_size=8, on_progress=lambda done, total: progress.append((done, total))
+        )
+        try:
+            pooled = detector(texts, "fr")
+        finally:
+            detector.close()
+        local = language.detect_uncached(texts, "fr")
+
+        self.assertEqual([lang for lang, _ in pooled], [lang for lang, _ in local])
+        for (_, pooled_conf), (_, local_conf) in zip(pooled, local):
+            self.assertAlmostEqual(pooled_conf, local_conf, places=9)
+        self.assertEqual(len(progress), -(-len(texts) // 8))
+        self.assertEqual(progress[-1], (len(texts), len(texts)))
+
+    def test_process_pool_uses_registered_glossary_terms(self):
+        texts = ["Ventes", "Devis", "Achats", "Boekhoudkundige post"]
+        terms = {lang: set(words) for lang, words in language._TERM_DICTIONARIES.items()}
+        detector = ProcessPoolDetector(workers=2, shard_size=1)
+        with mock.patch.object(language, "_TERM_DICTIONARIES", terms), \
+                mock.patch.object(language, "_DETECTOR_VERSION", None):
+            try:
+                detector(texts)  # starts the workers before the glossary is known
+                language.register_glossary_terms("fr", ["Ventes"])
+                pooled = detector(texts)
+            finally:
+                detector.close()
+            local = language.detect_uncached(texts)
+
+        self.assertEqual(pooled[0][0], "fr")
+        self.assertEqual([lang for lang, _ in pooled], [lang for lang, _ in local])
+        for (_, pooled_conf), (_, local_conf) in zip(pooled, local):
+            self.assertAlmostEqual(pooled_conf, local_conf, places=9)
+
+    def test_backend_only_receives_uncached_texts(self):
+        language.detect_languages(["Facture"], expected_language="en")
+        backend = mock.Mock(side_effect=language.detect_uncached)
+
+        language.detect_languages(["Facture", "Quotation", "Quotation"], expected_language="en", backend=backend)
+
+        backend.assert_called_once_with(["Quotation"], "en")
+
+    def test_blocks_match_a_single_analysis(self):
+        whole = analyze_languages(self.catalog, "en", "fr", catalog=self.catalog)
+        language.clear_detection_cache()
+
+        streamed = []
+        for block, statuses in iter_language_analysis(self.catalog, "en", "fr", catalog=self.catalog, block_size=7):
+            self.assertLessEqual(len(block), 7)
+            streamed.extend(statuses)
+
+        self.assertEqual([(s.source_lang, s.translation_lang) for s in streamed],
+                         [(s.source_lang, s.translation_lang) for s in whole])
+
+
+class ModelManagementTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(detector_models, "MODEL_DIR", Path(self.tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(language.reset_detectors)
+        self.addCleanup(detector_models.configure_model_path, None)
+        language.configure_detection_cache(enabled=False)
+        language.reset_detectors()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_model_lookup_prefers_configured_path_then_defaults(self):
+        self.assertIsNone(detector_models.resolve_model_path())
+        compressed = Path(self.tmp.name) / "lid.176.ftz"
+        compressed.write_bytes(b"ftz")
+        self.assertEqual(detector_models.resolve_model_path(), compressed)
+
+        custom = Path(self.tmp.name) / "custom.bin"
+        custom.write_bytes(b"bin")
+        with mock.patch.dict(os.environ, {detector_models.MODEL_ENV: str(custom)}):
+            self.assertEqual(detector_models.resolve_model_path(), custom)
+            detector_models.configure_model_path("none")
+            self.assertIsNone(detector_models.resolve_model_path())
+            self.assertEqual(detector_models.model_status()["state"], "disabled")
+
+    def test_missing_model_is_never_downloaded(self):
+        with mock.patch("urllib.request.urlretrieve", side_effect=AssertionError("network used")), \
+                mock.patch.object(detector_models, "model_status",
+                                  return_value={"state": "missing", "path": None, "installed": True}):
+            self.assertIsNone(language._get_fasttext_model())
+        self.assertEqual(language.detector_status()["fasttext"], "missing")
+
+    def test_unavailable_mode_answers_quickly_and_warns_once(self):
+        language.clear_detection_cache()
+        with mock.patch.object(language, "_get_lingua_detector", return_value=None), \
+                mock.patch.object(language, "_get_fasttext_model", return_value=None), \
+                self.assertLogs(language.LOGGER, level="WARNING") as logs:
+            results = language.detect_languages(["Confirm order", "Totalement"], expected_language="fr")
+            language.detect_language_details("Valider la commande")
+            language.detect_language_details("مرحبا")
+
+        self.assertEqual(results, [(None, 0.0), (None, 0.0)])
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(language.detect_language_details("مرحبا"), ("ar", 1.0))
+
+
+# Odoo UI strings: English msgids and their translations, one catalog per language
+NGRAM_MSGIDS = [
+    "Confirm the sales order", "Create a new invoice for this customer", "The payment has been registered",
+    "Please check the total amount before validating", "Send the quotation by email",
+    "Delivery address of the partner", "You cannot delete a posted journal entry",
+    "Products to receive this week", "Set the scheduled date of the transfer",
+    "Are you sure you want to cancel this order?", "Only the manager can approve the expense report",
+    "Number of days before the due date",
+]
+NGRAM_TRANSLATIONS = {
+    "fr": ["Confirmer la commande client", "Créer une nouvelle facture pour ce client", "Le paiement a été enregistré",
+           "Veuillez vérifier le montant total avant de valider", "Envoyer le devis par courriel",
+           "Adresse de livraison du partenaire", "Vous ne pouvez pas supprimer une écriture comptabilisée",
+           "Produits à recevoir cette semaine", "Définir la date prévue du transfert",
+           "Êtes-vous sûr de vouloir annuler cette commande ?",
+           "Seul le responsable peut approuver la note de frais", "Nombre de jours avant la date d'échéance"],
+    "es": ["Confirmar el pedido de venta", "Crear una nueva factura para este cliente", "El pago ha sido registrado",
+           "Por favor compruebe el importe total antes de validar", "Enviar el presupuesto por correo electrónico",
+           "Dirección de entrega del contacto", "No puede eliminar un asiento contable publicado",
+           "Productos por recibir esta semana", "Establecer la fecha programada de la transferencia",
+           "¿Está seguro de que desea cancelar este pedido?",
+           "Solo el responsable puede aprobar el informe de gastos", "Número de días antes de la fecha de vencimiento"],
+    "de": ["Verkaufsauftrag bestätigen", "Eine neue Rechnung für diesen Kunden erstellen", "Die Zahlung wurde erfasst",
+           "Bitte prüfen Sie den Gesamtbetrag vor der Bestätigung", "Angebot per E-Mail senden",
+           "Lieferadresse des Partners", "Sie können keine gebuchte Buchung löschen",
+           "Diese Woche zu empfangende Produkte", "Das geplante Datum des Transfers festlegen",
+           "Sind Sie sicher, dass Sie diesen Auftrag stornieren möchten?",
+           "Nur der Manager kann die Spesenabrechnung genehmigen", "Anzahl der Tage vor dem Fälligkeitsdatum"],
+    "it": ["Conferma l'ordine di vendita", "Crea una nuova fattura per questo cliente", "Il pagamento è stato registrato",
+           "Si prega di verificare l'importo totale prima di convalidare", "Invia il preventivo via e-mail",
+           "Indirizzo di consegna del partner", "Non è possibile eliminare una registrazione contabilizzata",
+           "Prodotti da ricevere questa settimana", "Imposta la data programmata del trasferimento",
+           "Sei sicuro di voler annullare questo ordine?",
+           "Solo il responsabile può approvare la nota spese", "Numero di giorni prima della data di scadenza"],
+    "pt": ["Confirmar o pedido de venda", "Criar uma nova fatura para este cliente", "O pagamento foi registado",
+           "Por favor verifique o montante total antes de validar", "Enviar a cotação por e-mail",
+           "Endereço de entrega do parceiro", "Não pode eliminar um lançamento contabilizado",
+           "Produtos a receber esta semana", "Definir a data agendada da transferência",
+           "Tem a certeza de que pretende cancelar esta encomenda?",
+           "Apenas o gestor pode aprovar o relatório de despesas", "Número de dias antes da data de vencimento"],
+    "nl": ["Verkooporder bevestigen", "Een nieuwe factuur voor deze klant aanmaken", "De betaling is geregistreerd",
+           "Controleer het totaalbedrag voordat u bevestigt", "De offerte per e-mail verzenden",
+           "Afleveradres van de relatie", "Je kunt geen geboekte boeking verwijderen",
+           "Deze week te ontvangen producten", "De geplande datum van de verplaatsing instellen",
+           "Weet je zeker dat je deze order wilt annuleren?",
+           "Alleen de manager kan de onkostendeclaratie goedkeuren", "Aantal dagen voor de vervaldatum"],
+    "ar": ["تأكيد أمر البيع", "إنشاء فاتورة جديدة لهذا العميل", "تم تسجيل الدفعة",
+           "يرجى التحقق من المبلغ الإجمالي قبل التأكيد", "إرسال عرض السعر عبر البريد الإلكتروني",
+           "عنوان التوصيل للشريك", "لا يمكنك حذف قيد يومية مرحل", "منتجات للاستلام هذا الأسبوع"],
+}
+
+# Sentences expected by test_language_utils.py
+LANGUAGE_UTILS_EXPECTATIONS = [
+    ("Confermare l'ordine e verificare l'importo totale della fattura.", "it"),
+    ("Confirmer la commande, veuillez vérifier le montant total de la facture.", "fr"),
+    ("Confirm the order and please review the total amount before invoicing.", "en"),
+    ("Veuillez confirmer la commande et vérifier le montant total de cette facture client.", "fr"),
+    ("Confirm the order for %(customer)s before {deadline}.", "en"),
+    ("Guten Tag zusammen.", "de"),
+    ("Esto es una prueba importante para la localización del sistema.", "es"),
+]
+
+
+class NgramDetectorTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.object(detector_models, "MODEL_DIR", Path(self.tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(language.reset_detectors)
+        language.configure_detection_cache(enabled=False)
+        language.reset_detectors()
+        language.reset_detection_tier_stats()
+
+    def write_catalogs(self, languages):
+        paths = []
+        for lang in languages:
+            po = polib.POFile()
+            # Dutch has no Language header: the file name tells
+            if lang != "nl":
+                po.metadata = {"Language": f"{lang}_XX" if lang == "pt" else lang}
+            for msgid, msgstr in zip(NGRAM_MSGIDS, NGRAM_TRANSLATIONS[lang]):
+                po.append(polib.POEntry(msgid=msgid, msgstr=msgstr))
+            path = Path(self.tmp.name) / f"{lang}.po"
+            po.save(str(path))
+            paths.append(path)
+        return paths
+
+    def train_default_model(self, languages=tuple(NGRAM_TRANSLATIONS)):
+        samples = ngram_detector.corpus_from_po_files(self.write_catalogs(languages))
+        return ngram_detector.NgramDetector.train(samples).save(ngram_detector.default_model_path())
+
+    def test_corpus_languages_come_from_headers_and_file_names(self):
+        samples = ngram_detector.corpus_from_po_files(self.write_catalogs(["pt", "nl"]))
+
+        self.assertEqual(sorted(samples), ["en", "nl", "pt"])
+        self.assertEqual(samples["en"], NGRAM_MSGIDS)
+        self.assertEqual(samples["nl"], NGRAM_TRANSLATIONS["nl"])
+
+    def test_batch_scoring_meets_language_utils_expectations(self):
+        detector = ngram_detector.NgramDetector.load(self.train_default_model())
+        texts = [text for text, _lang in LANGUAGE_UTILS_EXPECTATIONS]
+
+        decisions = detector.decide(texts)
+        self.assertEqual([decision[0] for decision in decisions], [lang for _text, lang in LANGUAGE_UTILS_EXPECTATIONS])
+        self.assertTrue(all(0.95 <= confidence <= 0.99 for _lang, confidence in decisions))
+        # One batch equals scoring each string on its own
+        self.assertEqual(decisions, [detector.decide([text])[0] for text in texts])
+        # Ambiguous single words are left to the next tier
+        self.assertEqual(detector.decide(["Cancel", "Fatura", "", "123 %s"]), [None] * 4)
+
+    def test_saved_model_round_trips(self):
+        detector = ngram_detector.NgramDetector.train({"en": NGRAM_MSGIDS, "fr": NGRAM_TRANSLATIONS["fr"]}, buckets=4096)
+        loaded = ngram_detector.NgramDetector.load(detector.save(Path(self.tmp.name) / "small.npz"))
+
+        self.assertEqual((loaded.languages, loaded.buckets), (["en", "fr"], 4096))
+        self.assertEqual(loaded.fingerprint, ngram_detector.NgramDetector.load(loaded.save(
+            Path(self.tmp.name) / "again.npz")).fingerprint)
+        self.assertEqual(loaded.predict(["Valider la facture"])[0][0], "fr")
+
+    def test_tier_decides_before_lingua(self):
+        before = language.detector_version()
+        detector = ngram_detector.NgramDetector.load(self.train_default_model())
+        language.reset_detectors()
+        self.assertEqual(language.detector_status()["ngram"], "ready")
+        self.assertNotEqual(language.detector_version(), before)
+        self.assertIn(f"ngram{detector.fingerprint}", language.detector_version())
+
+        texts = [text for text, _lang in LANGUAGE_UTILS_EXPECTATIONS]
+        with mock.patch.object(language, "_decide_lingua", return_value=None) as lingua:
+            results = language.detect_languages(texts)
+
+        self.assertEqual([lang for lang, _ in results], [lang for _text, lang in LANGUAGE_UTILS_EXPECTATIONS])
+        self.assertEqual(lingua.call_count, 0)
+        self.assertGreaterEqual(language.detection_tier_stats()["ngram"], 4)
+
+    def test_model_missing_languages_is_ignored(self):
+        self.train_default_model(["fr"])
+        with self.assertLogs(language.LOGGER, level="WARNING"):
+            self.assertIsNone(language._get_ngram_detector())
+        self.assertEqual(language.detector_status()["ngram"], "incomplete")
+        self.assertIn("-nongram", language.detector_version())
+
+
+def load_benchmark_module():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'detection_benchmark.py')
+    spec = importlib.util.spec_from_file_location("detection_benchmark", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class DetectionBenchmarkTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.benchmark = load_benchmark_module()
+
+    def setUp(self):
+        language.configure_detection_cache(enabled=False)
+
+    def test_dataset_covers_every_odoo_language(self):
+        cases = self.benchmark.load_cases(self.benchmark.DEFAULT_DATASET)
+        counts = {lang: sum(1 for label, _text in cases if label == lang) for lang in language.PRIMARY_LANGUAGES}
+
+        self.assertTrue(all(count >= 10 for count in counts.values()), counts)
+        self.assertIn(("de", "Guten Tag zusammen."), cases)
+
+    def test_stage_report_is_json_with_confusion_and_timings(self):
+        cases = [("ar", "مرحبا بكم"), ("fr", "Facture"), ("en", "Invoice"), ("fr", "Bonjour tout le monde")]
+        stages = language.detection_stages()
+        self.assertTrue({"script", "dictionary", "ngram", "stopwords", "pipeline"} <= set(stages))
+
+        report = json.loads(json.dumps(self.benchmark.run_benchmark(
+            cases, {name: stages[name] for name in ("script", "dictionary")}, repeat=1
+        )))
+
+        script = report["stages"]["script"]
+        self.assertEqual((script["decided"], script["correct"], script["precision"]), (1, 1, 1.0))
+        self.assertEqual(script["confusion"]["fr"], {"none": 2})
+        self.assertEqual(report["stages"]["dictionary"]["confusion"]["fr"], {"fr": 1, "none": 1})
+        self.assertEqual(report["stages"]["dictionary"]["per_language"]["en"], {"cases": 1, "recall": 1.0, "precision": 1.0})
+        self.assertGreater(script["strings_per_second"], 0)
+        self.assertLessEqual(script["latency_ms"]["p50"], script["latency_ms"]["p99"])
+        self.assertEqual(report["dataset"]["cases"], 4)
+
+        lines = self.benchmark.compare_reports(report, report)
+        self.assertEqual(len(lines), 2)
+        self.assertIn("throughput 1.00x", lines[0])
+
+    def test_po_files_add_labeled_translations(self):
+        cases = self.benchmark.cases_from_po_files([os.path.join(FIXTURES, "fr_translated_20251029.po")])
+
+        self.assertTrue(cases)
+        self.assertEqual({lang for lang, _text in cases}, {"fr"})
+
+
+class PersistentDetectionCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "detections.sqlite3")
+        language.configure_detection_cache(self.path)
+        language.clear_detection_cache()
+
+    def tearDown(self):
+        language.configure_detection_cache(enabled=False)
+        self.tmp.cleanup()
+
+    def _detect(self, items, _expected):
+        return [("fr", 0.8)] * len(items)
+
+    def test_results_survive_a_restart(self):
+        with mock.patch.object(language, "_detect_clean_texts", side_effect=self._detect):
+            language.detect_languages(["Facture", "Livraison"], expected_language="fr")
+            language.detect_language_details("Commande", expected_language="fr")
+
+        # Simulate a new process: empty memo, fresh connection to the same file
+        language.configure_detection_cache(self.path)
+        language.clear_detection_cache()
+        with mock.patch.object(language, "_detect_clean_texts", side_effect=AssertionError("re-detected")):
+            results = language.detect_languages(["Facture", "Livraison", "Commande"], expected_language="fr")
+
+        self.assertEqual(results, [("fr", 0.8)] * 3)
+        stats = language.detection_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (3, 0))
+        self.assertEqual(stats["hit_rate"], "100.0%")
+        self.assertEqual(stats["entries"], 3)
+
+    def test_key_includes_expected_language_and_detector_version(self):
+        with mock.patch.object(language, "_detect_clean_texts", side_effect=self._detect) as detect:
+            language.detect_languages(["Client"], expected_language="fr")
+            language.clear_detection_cache()
+            language.detect_languages(["Client"], expected_language="en")
+            language.clear_detection_cache()
+            with mock.patch.object(language, "detector_version", return_value="rules-next"):
+                language.detect_languages(["Client"], expected_language="fr")
+
+        self.assertEqual(detect.call_count, 3)
+
+    def test_unresolved_detections_are_not_persisted(self):
+        with mock.patch.object(language, "_detect_clean_texts", return_value=[(None, 0.0)]):
+            language.detect_language_details("???", expected_language="fr")
+
+        self.assertEqual(language.detection_cache_stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
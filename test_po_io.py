@@ -0,0 +1,774 @@
+from __future__ import annotations
+
+import contextlib
+import gettext
+import importlib.util
+import io
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import polib
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from po_translator.core import merger as merger_module  # noqa: E402
+from po_translator.core import mo_format, po_format  # noqa: E402
+from po_translator.core.cleaner import POCleaner  # noqa: E402
+from po_translator.core.merger import POMerger  # noqa: E402
+from po_translator.core.po_format import CatalogEntry  # noqa: E402
+from po_translator.core.po_stream import POStreamReader, entry_from_tuple, entry_to_tuple  # noqa: E402
+
+TEST_FILES = Path(__file__).parent / "test_files"
+
+ENTRY_FIELDS = (
+    'msgid', 'msgstr', 'msgctxt', 'msgid_plural', 'msgstr_plural', 'occurrences', 'flags', 'comment',
+    'tcomment', 'obsolete', 'previous_msgid', 'previous_msgctxt', 'previous_msgid_plural', 'linenum',
+)
+
+# Exercises the less common grammar: plurals, contexts, previous msgids, obsolete and trailing comments
+EDGE_CASE_PO = '''\
+# Translation of Odoo Server.
+# This file contains the translation of the following modules:
+# \t* sale
+#
+msgid ""
+msgstr ""
+"Project-Id-Version: Odoo Server 17.0\\n"
+"Language: fr\\n"
+"Plural-Forms: nplurals=2; plural=(n > 1);\\n"
+
+#. module: sale
+#: model:ir.model.fields,field_description:sale.field_sale_order__name
+#: code:addons/sale/models/sale_order.py:0
+#, python-format, fuzzy
+#| msgid "Order"
+msgid "Order Reference"
+msgstr "Référence de la "
+"commande"
+
+# translator note
+#
+msgctxt "button"
+msgid "Confirm"
+msgstr "Confirmer"
+
+#. module: sale
+msgid "%s order"
+msgid_plural "%s orders"
+msgstr[0] "%s commande"
+msgstr[1] "%s commandes"
+
+msgid "Quote \\"escaped\\"\\tand tab"
+msgstr ""
+
+#~ msgid "Old string"
+#~ msgstr "Ancienne chaîne"
+
+# trailing comment
+'''
+
+
+def entry_fields(entries):
+    return [tuple(getattr(entry, field) for field in ENTRY_FIELDS) for entry in entries]
+
+
+def entry_fields_of(merged, fields):
+    return {msgid: tuple(getattr(entry, field) for field in fields) for msgid, entry in merged.items()}
+
+
+def load_benchmark_module(name="po_io_benchmark"):
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', f'{name}.py')
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class POStreamReaderTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp(prefix="po_translator_io_")
+        self.edge_case = Path(self.tmpdir) / "edge.po"
+        self.edge_case.write_text(EDGE_CASE_PO, encoding="utf-8")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def assert_matches_polib(self, path: Path) -> None:
+        po = polib.pofile(str(path))
+        reader = POStreamReader(path)
+        entries = list(reader)
+        self.assertEqual(entry_fields(entries), entry_fields(po))
+        self.assertEqual(reader.metadata, po.metadata)
+        self.assertEqual(reader.header, po.header)
+        self.assertEqual(reader.metadata_is_fuzzy, po.metadata_is_fuzzy)
+
+    def test_matches_polib_on_fixtures(self) -> None:
+        for path in sorted(TEST_FILES.glob("*.po")):
+            with self.subTest(path=path.name):
+                self.assert_matches_polib(path)
+
+    def test_matches_polib_on_edge_cases(self) -> None:
+        self.assert_matches_polib(self.edge_case)
+        entries = list(POStreamReader(self.edge_case))
+        self.assertEqual(entries[0].msgstr, "Référence de la commande")
+        self.assertEqual(entries[2].msgstr_plural, {0: "%s commande", 1: "%s commandes"})
+        self.assertTrue(entries[-1].obsolete)
+
+    def test_yields_before_reaching_end_of_file(self) -> None:
+        reader = POStreamReader(self.edge_case, chunk_size=64)
+        first = next(iter(reader))
+        self.assertEqual(first.msgid, "Order Reference")
+        self.assertEqual(reader.metadata["Language"], "fr")
+        self.assertLess(reader.bytes_read, reader.size)
+
+    def test_unescaped_quote_is_a_syntax_error(self) -> None:
+        broken = Path(self.tmpdir) / "broken.po"
+        broken.write_text('msgid "a"\nmsgstr "b "c""\n', encoding="utf-8")
+        with self.assertRaises(IOError):
+            list(POStreamReader(broken))
+
+
+class StreamingMergeTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.paths = [str(path) for path in sorted(TEST_FILES.glob("*.po"))]
+
+    def test_streamed_merge_matches_polib_merge(self) -> None:
+        merger = POMerger()
+        merged = merger.merge_files(self.paths)
+
+        expected = {}
+        for path in self.paths:
+            for entry in polib.pofile(path):
+                if not entry.obsolete:
+                    expected.setdefault(entry.msgid.strip(), entry.msgstr.strip())
+        self.assertEqual({msgid: entry.msgstr for msgid, entry in merged.items()}, expected)
+        self.assertEqual(merger.original_metadata, polib.pofile(self.paths[0]).metadata)
+
+    def test_iter_merge_yields_each_unique_entry_once(self) -> None:
+        merger = POMerger()
+        progress = []
+        streamed = list(merger.iter_merge_files(self.paths, on_progress=lambda done, total: progress.append((done, total))))
+        self.assertEqual([entry.msgid for entry in streamed], list(merger.merged_entries))
+        total = sum(os.path.getsize(path) for path in self.paths)
+        self.assertEqual(progress[-1], (total, total))
+        self.assertEqual([done for done, _total in progress], sorted(done for done, _total in progress))
+
+    def test_packed_entries_round_trip(self) -> None:
+        for entry in polib.pofile(self.paths[0]):
+            self.assertEqual(entry_fields([entry_from_tuple(entry_to_tuple(entry))]), entry_fields([entry]))
+
+    def test_process_pool_merge_matches_sequential_merge(self) -> None:
+        sequential = POMerger(workers=1)
+        expected = [(msgid, entry.msgstr, entry.occurrences, entry.comment)
+                    for msgid, entry in sequential.merge_files(self.paths).items()]
+
+        parallel = POMerger(workers=2)
+        progress = []
+        with mock.patch.object(merger_module, 'PARALLEL_MIN_BYTES', 0):
+            merged = parallel.merge_files(self.paths, on_progress=lambda done, total: progress.append(done))
+        self.assertEqual([(msgid, entry.msgstr, entry.occurrences, entry.comment)
+                          for msgid, entry in merged.items()], expected)
+        self.assertEqual(parallel.indexer.entry_to_module, sequential.indexer.entry_to_module)
+        self.assertEqual(parallel.original_metadata, sequential.original_metadata)
+        self.assertEqual(len(progress), len(self.paths))
+
+    def test_repeated_msgids_are_combined(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = []
+            for module, msgstr in (("sale", ""), ("stock", "Nom ")):
+                po = polib.POFile()
+                po.metadata = {"Language": "fr"}
+                po.append(polib.POEntry(msgid="Name", msgstr=msgstr, occurrences=[(f"code:addons/{module}/models.py", "")]))
+                po.append(polib.POEntry(msgid=f"Only {module}", msgstr="Seul"))
+                path = os.path.join(tmpdir, f"{module}.po")
+                po.save(path)
+                paths.append(path)
+
+            merger = POMerger(workers=1)
+            merged = merger.merge_files(paths)
+            self.assertEqual(merged["Name"].msgstr, "Nom")
+            self.assertEqual(list(merged["Name"].occurrences),
+                             [("code:addons/sale/models.py", ""), ("code:addons/stock/models.py", "")])
+            self.assertEqual(merger.merge_stats, {'read': 4, 'cleaned': 3, 'duplicates': 1})
+
+            # A refresh combines them the same way
+            po = polib.pofile(paths[1])
+            po[0].occurrences = [("code:addons/stock/wizard.py", "")]
+            po.save(paths[1])
+            merger.refresh_files()
+            fresh = POMerger(workers=1)
+            fresh.merge_files(paths)
+            self.assertEqual(list(merger.merged_entries["Name"].occurrences),
+                             list(fresh.merged_entries["Name"].occurrences))
+            self.assertEqual(merger.merge_stats, fresh.merge_stats)
+
+    def test_unreadable_file_is_skipped(self) -> None:
+        merger = POMerger()
+        merged = merger.merge_files([os.path.join(tempfile.gettempdir(), "missing-catalog.po")] + self.paths[:1])
+        self.assertEqual(len(merged), len(polib.pofile(self.paths[0])))
+
+
+class IncrementalRefreshTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp(prefix="po_translator_refresh_")
+        self.paths = []
+        for path in sorted(TEST_FILES.glob("*.po")):
+            copy = os.path.join(self.tmpdir, path.name)
+            shutil.copy(path, copy)
+            self.paths.append(copy)
+        self.merger = POMerger(workers=1, keep_rows=self.keep_rows)
+        self.merger.merge_files(self.paths)
+
+    keep_rows = False
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def assert_matches_full_merge(self, paths) -> None:
+        fresh = POMerger(workers=1)
+        fresh.merge_files(paths)
+        self.assertEqual({msgid: (entry.msgstr, entry.occurrences) for msgid, entry in self.merger.merged_entries.items()},
+                         {msgid: (entry.msgstr, entry.occurrences) for msgid, entry in fresh.merged_entries.items()})
+        self.assertEqual(self.merger.indexer.entry_to_module, fresh.indexer.entry_to_module)
+        self.assertEqual(self.merger.indexer.entry_to_field, fresh.indexer.entry_to_field)
+        self.assertEqual({module: set(ids) for module, ids in self.merger.indexer.module_to_entries.items()},
+                         {module: set(ids) for module, ids in fresh.indexer.module_to_entries.items()})
+        self.assertEqual(self.merger.merge_stats, fresh.merge_stats)
+        self.assertEqual(self.merger.original_metadata, fresh.original_metadata)
+
+    def edit_first_translation(self, path: str, msgstr: str) -> str:
+        po = polib.pofile(path)
+        entry = next(entry for entry in po if entry.msgid.strip() and entry.msgid.strip() in self.merger.merged_entries)
+        entry.msgstr = msgstr
+        po.save(path)
+        return entry.msgid.strip()
+
+    def test_unchanged_files_are_not_parsed_again(self) -> None:
+        entries = dict(self.merger.merged_entries)
+        with mock.patch.object(merger_module, 'CatalogReader') as reader:
+            report = self.merger.refresh_files()
+            if self.keep_rows:
+                self.merger.merge_files(self.paths)
+        reader.assert_not_called()
+        self.assertEqual(report['changed_files'], [])
+        self.assertEqual(list(self.merger.merged_entries), list(entries))
+        self.assertEqual(all(record.rows is None for record in self.merger._file_cache.values()), not self.keep_rows)
+
+        # A touched file with the same content is only hashed
+        os.utime(self.paths[0], ns=(0, 0))
+        with mock.patch.object(merger_module, 'CatalogReader') as reader:
+            self.assertEqual(self.merger.refresh_files()['changed_files'], [])
+        reader.assert_not_called()
+
+    def test_edited_file_patches_only_its_entries(self) -> None:
+        untouched = {msgid: entry for msgid, entry in self.merger.merged_entries.items()}
+        msgid = self.edit_first_translation(self.paths[0], "Traduction modifiée")
+        report = self.merger.refresh_files()
+
+        self.assertEqual(report['changed_files'], [self.paths[0]])
+        self.assertEqual(report['updated'], 1)
+        self.assertEqual(self.merger.merged_entries[msgid].msgstr, "Traduction modifiée")
+        for key, entry in self.merger.merged_entries.items():
+            if key != msgid:
+                self.assertIs(entry, untouched[key])
+        self.assert_matches_full_merge(self.paths)
+
+    def test_added_and_removed_files(self) -> None:
+        report = self.merger.refresh_files(self.paths[1:])
+        self.assertEqual(report['removed_files'], [self.paths[0]])
+        self.assertGreater(report['deleted'], 0)
+        self.assert_matches_full_merge(self.paths[1:])
+
+        report = self.merger.refresh_files(self.paths)
+        self.assertEqual(report['changed_files'], [self.paths[0]])
+        self.assertFalse(report['full_merge'])
+        self.assert_matches_full_merge(self.paths)
+
+    def test_reordered_files_are_merged_again(self) -> None:
+        report = self.merger.refresh_files(list(reversed(self.paths)))
+        self.assertTrue(report['full_merge'])
+        self.assertEqual(report['changed_files'], [])
+        self.assert_matches_full_merge(list(reversed(self.paths)))
+
+
+class KeptRowsRefreshTestCase(IncrementalRefreshTestCase):
+    keep_rows = True
+
+
+class MergedEntryTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp(prefix="po_translator_entry_")
+        self.edge_case = Path(self.tmpdir) / "edge.po"
+        self.edge_case.write_text(EDGE_CASE_PO, encoding="utf-8")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_conversions_keep_every_field(self) -> None:
+        fields = ENTRY_FIELDS[:-1]  # Line numbers are not kept
+        for entry in polib.pofile(str(self.edge_case)):
+            with self.subTest(msgid=entry.msgid):
+                for converted in (CatalogEntry.from_row(entry_to_tuple(entry)), CatalogEntry.from_polib(entry)):
+                    back = converted.to_polib()
+                    self.assertEqual([getattr(back, field) for field in fields],
+                                     [getattr(entry, field) for field in fields])
+                    self.assertEqual(converted.translated(), entry.translated())
+                    self.assertEqual(converted.fuzzy, entry.fuzzy)
+
+    def test_row_entries_share_the_empty_plurals(self) -> None:
+        row = entry_to_tuple(polib.POEntry(msgid="Order", msgstr="Commande",
+                                           occurrences=[("model:sale.order,name", "")]))
+        entry, other = CatalogEntry.from_row(row), CatalogEntry.from_row(row)
+        self.assertIs(entry.msgstr_plural, other.msgstr_plural)
+        self.assertIs(entry.occurrences, row[5])
+        with self.assertRaises(TypeError):
+            entry.msgstr_plural[0] = "Commandes"
+        entry.msgstr_plural = {0: "Commande", 1: "Commandes"}
+        self.assertEqual(entry.to_polib().msgstr_plural, {0: "Commande", 1: "Commandes"})
+        self.assertEqual(dict(other.msgstr_plural), {})
+
+    def test_uses_less_memory_than_polib(self) -> None:
+        occurrence = ("model:ir.model.fields,field_description:sale.field_sale_order__name", "")
+        row = entry_to_tuple(polib.POEntry(msgid="Order", msgstr="Commande", comment="module: sale",
+                                           occurrences=[occurrence]))
+
+        def allocated(make_entry):
+            tracemalloc.start()
+            entries = [make_entry() for _ in range(2000)]
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del entries
+            return size
+
+        polib_size = allocated(lambda: polib.POEntry(msgid="Order", msgstr="Commande", comment="module: sale",
+                                                     occurrences=[occurrence]))
+        self.assertLess(allocated(lambda: CatalogEntry.from_row(row)), polib_size / 2)
+
+    def test_merged_entries_are_catalog_entries_and_exported_with_polib(self) -> None:
+        merger = POMerger()
+        merged = merger.merge_files([str(path) for path in sorted(TEST_FILES.glob("*.po"))])
+        self.assertTrue(all(isinstance(entry, CatalogEntry) for entry in merged.values()))
+
+        output = os.path.join(self.tmpdir, "merged.po")
+        self.assertTrue(merger.export_to_file(output))
+        exported = {entry.msgid: (entry.msgstr, entry.occurrences) for entry in polib.pofile(output)}
+        self.assertEqual(exported, {msgid: (entry.msgstr, list(entry.occurrences)) for msgid, entry in merged.items()})
+
+        # Written by po_format in exactly the layout polib would save
+        po_file = polib.POFile()
+        po_file.metadata = dict(merger.original_metadata)
+        po_file.header = merger.original_header or ''
+        for entry in merger.cleaner.sort_entries(merger.get_entries_list()):
+            po_file.append(entry.to_polib())
+        self.assertEqual(Path(output).read_text(encoding="utf-8"), str(po_file))
+
+
+class SharedStringsTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp(prefix="po_translator_shared_")
+        self.benchmark = load_benchmark_module("merge_memory_benchmark")
+        self.paths = [str(path) for path in self.benchmark.synthetic_addons(Path(self.tmpdir), 3, 30)]
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_sharing_does_not_change_the_merge(self) -> None:
+        plain = POMerger(workers=1, share_strings=False)
+        shared = POMerger(workers=1)
+        fields = ENTRY_FIELDS[:-1]
+        self.assertEqual(entry_fields_of(plain.merge_files(self.paths), fields),
+                         entry_fields_of(shared.merge_files(self.paths), fields))
+        self.assertEqual(plain.indexer.entry_to_module, shared.indexer.entry_to_module)
+
+    def test_repeated_metadata_is_stored_once(self) -> None:
+        merger = POMerger(workers=1, keep_rows=True)
+        merger.merge_files(self.paths)
+        by_module = {}
+        for entry in merger.merged_entries.values():
+            by_module.setdefault(entry.comment, set()).add(id(entry.comment))
+        self.assertEqual(len(by_module), 3)
+        self.assertTrue(all(len(ids) == 1 for ids in by_module.values()))
+
+        code = {id(path) for record in merger._file_cache.values() for row in record.rows
+                for path, _line in row[5] if path.startswith("code:")}
+        self.assertEqual(len(code), 3)
+
+        # The same term in another addon reuses the merged strings
+        winner = merger.merged_entries["Common term 0"]
+        duplicates = [row for record in merger._file_cache.values() for row in record.rows if row[0] == winner.msgid]
+        self.assertEqual(len(duplicates), 3)
+        self.assertTrue(all(row[0] is winner.msgid and row[1] is winner.msgstr for row in duplicates))
+
+    def test_merge_entries_lists_occurrences_once(self) -> None:
+        first = CatalogEntry.from_row(entry_to_tuple(
+            polib.POEntry(msgid="Name", occurrences=[("code:addons/sale/models/sale.py", "0")])
+        ))
+        second = polib.POEntry(msgid="Name", occurrences=[("code:addons/sale/models/sale.py", "0"),
+                                                          ("model:ir.model.fields,field_description:sale.name", "")])
+        merged = POCleaner().merge_entries(first, second)
+        self.assertEqual(merged.occurrences, (("code:addons/sale/models/sale.py", "0"),
+                                              ("model:ir.model.fields,field_description:sale.name", "")))
+
+    def test_memory_report(self) -> None:
+        report = self.benchmark.run_benchmark([Path(path) for path in self.paths])
+        self.assertGreater(report["saved_bytes"], 0)
+        self.assertEqual(report["runs"]["plain"]["entries_merged"], report["runs"]["shared"]["entries_merged"])
+        self.assertIn("Saved:", self.benchmark.format_report(report))
+
+
+class MOCompileTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp(prefix="po_translator_mo_")
+        self.edge_case = Path(self.tmpdir) / "edge.po"
+        self.edge_case.write_text(EDGE_CASE_PO, encoding="utf-8")
+        self.paths = sorted(TEST_FILES.glob("*.po")) + [self.edge_case]
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def polib_mo(self, po_path) -> bytes:
+        target = os.path.join(self.tmpdir, "polib.mo")
+        polib.pofile(str(po_path)).save_as_mofile(target)
+        return Path(target).read_bytes()
+
+    def test_compiled_file_matches_polib(self) -> None:
+        for path in self.paths:
+            with self.subTest(file=path.name):
+                target = mo_format.compile_po_file(path, Path(self.tmpdir) / "fast.mo", hash_size=0)
+                self.assertEqual(target.read_bytes(), self.polib_mo(path))
+
+    def test_export_compiles_from_memory(self) -> None:
+        merger = POMerger(workers=1)
+        merger.merge_files([str(path) for path in self.paths])
+        output = os.path.join(self.tmpdir, "merged.po")
+        for parallel in (False, True):
+            with self.subTest(parallel=parallel), mock.patch.object(polib, 'pofile', wraps=polib.pofile) as pofile:
+                mo_path = os.path.join(self.tmpdir, f"merged_{parallel}.mo")
+                self.assertTrue(merger.export_to_file(output, mo_filepath=mo_path, parallel=parallel, hash_size=0))
+                pofile.assert_not_called()
+                self.assertEqual(Path(mo_path).read_bytes(), self.polib_mo(output))
+
+    def test_compile_many_catalogs(self) -> None:
+        output_dir = Path(self.tmpdir) / "mo"
+        targets = mo_format.compile_po_files(self.paths, output_dir, workers=2, hash_size=0)
+        self.assertEqual(targets, [output_dir / f"{path.stem}.mo" for path in self.paths])
+        for path, target in zip(self.paths, targets):
+            self.assertEqual(target.read_bytes(), self.polib_mo(path))
+
+        with self.assertRaises(ValueError):
+            mo_format.compile_po_files([self.edge_case, self.edge_case], output_dir)
+
+    def test_hash_table_finds_every_message(self) -> None:
+        for path in self.paths:
+            with self.subTest(file=path.name):
+                target = mo_format.compile_po_file(path, Path(self.tmpdir) / "hashed.mo")
+                report = mo_format.verify_mo(target)
+                self.assertTrue(report["valid"], report["errors"])
+                self.assertEqual(report["hash_size"], mo_format.hash_table_size(report["messages"]))
+                self.assertGreater(report["hash_size"], report["messages"])
+                self.assertLessEqual(report["average_probes"], 2)
+
+                # Same messages as the table-less polib output
+                hashed = [(entry.msgctxt, entry.msgid, entry.msgstr, entry.msgstr_plural)
+                          for entry in polib.mofile(str(target))]
+                polib_path = Path(self.tmpdir) / "polib.mo"
+                polib_path.write_bytes(self.polib_mo(path))
+                self.assertEqual(hashed, [(entry.msgctxt, entry.msgid, entry.msgstr, entry.msgstr_plural)
+                                          for entry in polib.mofile(str(polib_path))])
+
+    def test_hash_table_size(self) -> None:
+        messages = mo_format.mo_messages(po_format.read_po(self.edge_case).entries)
+        self.assertEqual(mo_format.hash_string(b"a\x00ignored"), mo_format.hash_string(b"a"))
+        self.assertEqual(mo_format.hash_table_size(1000), 1361)
+
+        path = Path(self.tmpdir) / "sized.mo"
+        path.write_bytes(mo_format.build_mo(messages, hash_size=100))
+        report = mo_format.verify_mo(path)
+        self.assertEqual(report["hash_size"], 101)
+        self.assertEqual(report["max_probes"], 1)
+        with self.assertRaises(ValueError):
+            mo_format.build_mo(messages, hash_size=len(messages))
+
+        path.write_bytes(mo_format.build_mo(messages, hash_size=0))
+        report = mo_format.verify_mo(path)
+        self.assertTrue(report["valid"])
+        self.assertEqual((report["hash_size"], report["average_probes"]), (0, None))
+
+    def test_hash_stays_within_32_bits(self) -> None:
+        # The shift carries past bit 31 on the last byte of this key
+        key = "(x}--+/~"
+        self.assertEqual(mo_format.hash_string(key.encode()), 0x6e)
+
+        messages = [(b"", b"Content-Type: text/plain; charset=UTF-8\n"), (key.encode(), "Clé".encode()),
+                    (b"Order", b"Commande")]
+        data = mo_format.build_mo(messages, hash_size=7)
+        hash_offset = struct.unpack_from("<I", data, 24)[0]
+        # gettext's first probe for the key lands on its message
+        self.assertEqual(struct.unpack_from("<I", data, hash_offset + 4 * (0x6e % 7))[0], 2)
+        path = Path(self.tmpdir) / "overflow.mo"
+        path.write_bytes(data)
+        self.assertTrue(mo_format.verify_mo(path)["valid"])
+        with open(path, "rb") as handle:
+            self.assertEqual(gettext.GNUTranslations(handle).gettext(key), "Clé")
+
+    def test_verify_reports_broken_files(self) -> None:
+        data = bytearray(mo_format.build_mo(mo_format.mo_messages(po_format.read_po(self.edge_case).entries)))
+        hash_offset = struct.unpack_from("<I", data, 24)[0]
+        data[hash_offset:hash_offset + 8] = bytes(8)
+        path = Path(self.tmpdir) / "broken.mo"
+        path.write_bytes(bytes(data))
+        self.assertFalse(mo_format.verify_mo(path)["valid"])
+
+        path.write_bytes(b"not an mo file at all, but long enough")
+        with self.assertRaises(ValueError):
+            mo_format.verify_mo(path)
+        path.write_bytes(bytes(data[:40]))
+        with self.assertRaises(ValueError):
+            mo_format.verify_mo(path)
+
+
+class MOCatalogTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp(prefix="po_translator_mo_read_")
+        self.edge_case = Path(self.tmpdir) / "edge.po"
+        self.edge_case.write_text(EDGE_CASE_PO, encoding="utf-8")
+        self.paths = sorted(TEST_FILES.glob("*.po")) + [self.edge_case]
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def compile(self, path, hash_size=None) -> Path:
+        return mo_format.compile_po_file(path, Path(self.tmpdir) / f"{path.stem}_{hash_size}.mo", hash_size)
+
+    def test_lists_entries_like_polib(self) -> None:
+        for path in self.paths:
+            for hash_size in (None, 0):
+                with self.subTest(file=path.name, hash_size=hash_size):
+                    target = self.compile(path, hash_size)
+                    expected = polib.mofile(str(target))
+                    with mo_format.MOCatalog(target) as catalog:
+                        self.assertEqual(catalog.metadata, expected.metadata)
+                        self.assertEqual(len(catalog), len(expected))
+                        self.assertEqual(
+                            [(e.msgctxt, e.msgid, e.msgid_plural, e.msgstr, dict(e.msgstr_plural)) for e in catalog],
+                            [(e.msgctxt, e.msgid, e.msgid_plural, e.msgstr, e.msgstr_plural) for e in expected],
+                        )
+
+    def test_lookup_with_and_without_hash_table(self) -> None:
+        translated = [entry for entry in polib.pofile(str(self.edge_case)).translated_entries()]
+        for hash_size in (None, 0):
+            with self.subTest(hash_size=hash_size), mo_format.MOCatalog(self.compile(self.edge_case, hash_size)) as catalog:
+                for entry in translated:
+                    expected = entry.msgstr_plural[0] if entry.msgid_plural else entry.msgstr
+                    self.assertEqual(catalog.lookup(entry.msgid, entry.msgctxt), expected)
+                self.assertIsNone(catalog.lookup("Not in the catalog"))
+                self.assertIsNone(catalog.lookup(""))
+                self.assertNotIn("Not in the catalog", catalog)
+
+    def test_lookups_read_only_what_they_probe(self) -> None:
+        messages = sorted((f"Message {index}".encode(), f"Traduction {index}".encode()) for index in range(20000))
+        path = Path(self.tmpdir) / "large.mo"
+        path.write_bytes(mo_format.build_mo([(b"", b"Language: fr\n")] + messages))
+
+        tracemalloc.start()
+        with mo_format.MOCatalog(path) as catalog:
+            self.assertEqual(catalog.lookup("Message 12345"), "Traduction 12345")
+            for index in range(0, 20000, 100):
+                catalog.lookup(f"Message {index}")
+            _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertLess(peak, path.stat().st_size // 20)
+
+    def test_rejects_other_files(self) -> None:
+        for content in (b"", b"msgid \"\"\nmsgstr \"\"\n" * 4):
+            path = Path(self.tmpdir) / "not.mo"
+            path.write_bytes(content)
+            with self.subTest(content=content[:10]), self.assertRaises(ValueError):
+                mo_format.MOCatalog(path)
+
+    def test_merge_reads_compiled_catalogs(self) -> None:
+        module_dir = Path(self.tmpdir) / "addons" / "sale" / "i18n"
+        module_dir.mkdir(parents=True)
+        compiled = mo_format.compile_po_file(self.edge_case, module_dir / "fr.mo")
+
+        merger = POMerger(workers=1, keep_rows=True)
+        merged = merger.merge_files([str(compiled)])
+        expected = [entry for entry in polib.mofile(str(compiled))]
+        self.assertEqual(sorted((e.msgid, e.msgstr) for e in merged.values()),
+                         sorted((e.msgid, e.msgstr) for e in expected))
+        self.assertEqual(merger.original_metadata, polib.mofile(str(compiled)).metadata)
+        self.assertEqual(merger.indexer.get_all_modules(), ["sale"])
+
+        # Mixed with PO files and reused while unchanged
+        merged = merger.merge_files([str(compiled), str(TEST_FILES / "test_fr_en.po")])
+        with mock.patch.object(mo_format.MOCatalog, '__iter__', side_effect=AssertionError("parsed again")):
+            self.assertEqual(len(merger.merge_files([str(compiled), str(TEST_FILES / "test_fr_en.po")])),
+                             len(merged))
+
+
+class ModuleExportTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp(prefix="po_translator_split_")
+        benchmark = load_benchmark_module("merge_memory_benchmark")
+        self.paths = benchmark.synthetic_addons(Path(self.tmpdir), 3, 30)
+        # One module with its own header and metadata
+        custom = self.paths[1].read_text(encoding="utf-8")
+        custom = custom.replace("# Translation of Odoo Server.", "# Addon 1 translation.")
+        custom = custom.replace("Odoo Server 17.0", "Addon 1 1.0")
+        self.paths[1].write_text(custom, encoding="utf-8")
+        self.merger = POMerger(workers=1)
+        self.merger.merge_files([str(path) for path in self.paths])
+        self.output = Path(self.tmpdir) / "export"
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_each_module_gets_its_entries_back(self) -> None:
+        self.merger.merged_entries["Common term 0"].msgstr = "Terme partagé"
+
+        written = self.merger.export_modules(self.output, workers=3)
+
+        self.assertEqual(sorted(written), ["addon_0", "addon_1", "addon_2"])
+        for module, path in zip(sorted(written), self.paths):
+            with self.subTest(module=module):
+                self.assertEqual(written[module], self.output / module / "i18n" / "fr.po")
+                original, exported = polib.pofile(str(path)), polib.pofile(str(written[module]))
+                self.assertEqual(exported.header, original.header)
+                self.assertEqual(exported.metadata, original.metadata)
+                self.assertEqual(sorted(entry.msgid for entry in exported), sorted(entry.msgid for entry in original))
+
+                common = exported.find("Common term 0")
+                self.assertEqual(common.msgstr, "Terme partagé")
+                self.assertEqual(common.comment, f"module: {module}")
+                self.assertEqual(common.occurrences, original.find("Common term 0").occurrences)
+                self.assertEqual([entry.msgid for entry in exported],
+                                 sorted((entry.msgid for entry in exported), key=str.lower))
+
+    def test_modules_without_cached_files_use_the_merge_header(self) -> None:
+        self.merger.clear_file_cache()
+
+        written = self.merger.export_modules(self.output, lang="fr_BE", compile_mo=True)
+
+        exported = polib.pofile(str(written["addon_2"]))
+        self.assertEqual(written["addon_2"].name, "fr_BE.po")
+        self.assertEqual(exported.metadata["Language"], "fr_BE")
+        self.assertEqual(exported.metadata["Project-Id-Version"], "Odoo Server 17.0")
+        # Occurrences narrowed to the module's own
+        self.assertTrue(all("addon_2" in occurrence for occurrence, _line in exported.find("addon_2 label 1").occurrences))
+        self.assertEqual(len(polib.mofile(str(written["addon_2"].with_suffix(".mo")))), len(exported))
+
+    def test_write_failure_is_reported(self) -> None:
+        self.output.write_text("not a directory", encoding="utf-8")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertIsNone(self.merger.export_modules(self.output))
+
+
+class POFormatTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp(prefix="po_translator_format_")
+        long_text = "A help text long enough to be wrapped over several lines by polib, with \"quotes\" and\ttabs"
+        self.samples = {path.name: path.read_bytes() for path in sorted(TEST_FILES.glob("*.po"))}
+        self.samples["edge.po"] = EDGE_CASE_PO.encode("utf-8")
+        self.samples["crlf.po"] = EDGE_CASE_PO.replace("\n", "\r\n").encode("utf-8")
+        self.samples["bom.po"] = ("\ufeff" + EDGE_CASE_PO).encode("utf-8")
+        self.samples["hand_wrapped.po"] = b'msgid ""\nmsgstr ""\n"Language: fr\\n"\n\nmsgid "Hello "\n"world"\nmsgstr  "Bonjour"\n'
+        self.samples["long.po"] = str(polib.POEntry(
+            msgid=long_text, msgstr=long_text, comment="module: sale " * 8, flags=["python-format"],
+            occurrences=[("model:ir.ui.view,arch_db:sale-management.view_order_form", "")] * 3,
+        )).encode("utf-8")
+        self.paths = {}
+        for name, data in self.samples.items():
+            path = Path(self.tmpdir) / name
+            path.write_bytes(data)
+            self.paths[name] = path
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_parse_matches_polib(self) -> None:
+        for name, path in self.paths.items():
+            with self.subTest(file=name):
+                po = polib.pofile(str(path))
+                catalog = po_format.read_po(path)
+                self.assertEqual(entry_fields(catalog), entry_fields(po))
+                self.assertEqual(catalog.metadata, po.metadata)
+                self.assertEqual(catalog.header, po.header)
+                # polib leaves 0 when there is no metadata entry
+                self.assertEqual(catalog.metadata_is_fuzzy, po.metadata_is_fuzzy or [])
+
+    def test_streamed_entries_match_polib(self) -> None:
+        for name, path in self.paths.items():
+            with self.subTest(file=name):
+                po = polib.pofile(str(path))
+                progress = []
+                reader = po_format.CatalogReader(path, on_progress=lambda done, size: progress.append(done),
+                                                 progress_step=1)
+                self.assertEqual(entry_fields(list(reader)), entry_fields(po))
+                self.assertEqual((reader.metadata, reader.header), (po.metadata, po.header))
+                self.assertEqual(progress[-1], path.stat().st_size)
+                self.assertEqual(progress, sorted(progress))
+
+    def test_small_read_blocks_match_whole_file(self) -> None:
+        # Entries, lines and multi-byte characters split across blocks
+        for name, path in self.paths.items():
+            with self.subTest(file=name):
+                catalog = po_format.read_po(path)
+                reader = po_format.CatalogReader(path, chunk_size=7)
+                self.assertEqual(entry_fields(list(reader)), entry_fields(catalog))
+                self.assertEqual((reader.metadata, reader.header), (catalog.metadata, catalog.header))
+        broken = Path(self.tmpdir) / "broken.po"
+        broken.write_text('msgid "é"\nmsgstr "a"\n\nmsgid "b"\nmsgstr "b" x\n', encoding="utf-8")
+        with self.assertRaisesRegex(IOError, r"\(line 5\)"):
+            list(po_format.CatalogReader(broken, chunk_size=3))
+
+    def test_round_trip_is_byte_identical(self) -> None:
+        for name, path in self.paths.items():
+            with self.subTest(file=name):
+                output = Path(self.tmpdir) / f"out_{name}"
+                po_format.write_po(po_format.read_po(path), output)
+                self.assertEqual(output.read_bytes(), self.samples[name])
+
+    def test_render_matches_polib_layout(self) -> None:
+        for name, path in self.paths.items():
+            with self.subTest(file=name):
+                po = polib.pofile(str(path))
+                self.assertEqual(po_format.render_po(po_format.Catalog.from_polib(po)), str(po))
+
+    def test_modified_entries_are_rendered(self) -> None:
+        catalog = po_format.read_po(self.paths["hand_wrapped.po"])
+        self.assertFalse(catalog.entries[0].modified())
+        catalog.entries[0].flags.append("fuzzy")
+        catalog.metadata["Language"] = "de"
+        self.assertTrue(catalog.entries[0].modified())
+        rendered = po_format.render_po(catalog)
+        self.assertIn('#, fuzzy\nmsgid "Hello world"\nmsgstr "Bonjour"\n', rendered)
+        self.assertIn('"Language: de\\n"', rendered)
+
+        catalog = po_format.read_po(self.paths["edge.po"])
+        catalog.entries[1].msgstr = "Valider"
+        rendered = po_format.render_po(catalog)
+        self.assertIn(catalog.entries[0].source, rendered)
+        self.assertEqual([entry.msgstr for entry in po_format.parse_po(rendered)][1], "Valider")
+
+    def test_syntax_errors_are_reported(self) -> None:
+        for content in ('msgid "a"\nmsgstr "b "c""\n', 'msgstr "orphan"\n', 'msgid "a"\nbogus\n'):
+            with self.subTest(content=content), self.assertRaises(IOError):
+                po_format.parse_po(content)
+
+    def test_benchmark_reports_throughput(self) -> None:
+        benchmark = load_benchmark_module()
+        report = benchmark.run_benchmark(list(self.paths.values()), repeat=1)
+        self.assertTrue(report["round_trip_identical"])
+        self.assertGreater(report["stages"]["read_fast"]["mb_per_second"], 0)
+        self.assertIn("write_polib", benchmark.format_report(report))
+
+
+if __name__ == '__main__':
+    unittest.main()
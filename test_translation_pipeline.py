@@ -0,0 +1,362 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from po_translator.core.indexer import ModuleIndexer  # noqa: E402
+from po_translator.core.journal import TranslationJournal  # noqa: E402
+from po_translator.core.mo_format import write_mo  # noqa: E402
+from po_translator.core.usage import TokenBudget, estimate_tokens  # noqa: E402
+from po_translator.translator import SOURCE_API, SOURCE_CACHE, SOURCE_MEMORY, CancelToken, Translator  # noqa: E402
+
+
+class FakeModel:
+    """Stand-in for the Gemini model answering batch and single prompts."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def generate_content(self, prompt, **_kwargs):
+        self.prompts.append(prompt)
+        usage = SimpleNamespace(prompt_token_count=100, candidates_token_count=10)
+        if prompt.rstrip().endswith("Translations:"):
+            items = json.loads(prompt.split("Texts:\n", 1)[1].rsplit("\nTranslations:", 1)[0])
+            return SimpleNamespace(text=json.dumps([f"FR {text}" for text in items]), usage_metadata=usage)
+        text = prompt.rsplit("Text: ", 1)[1].split("\nTranslation:", 1)[0]
+        return SimpleNamespace(text=f"FR {text}", usage_metadata=usage)
+
+
+def make_entry(msgid, msgstr="", msgctxt=None):
+    return SimpleNamespace(msgid=msgid, msgstr=msgstr, msgctxt=msgctxt)
+
+
+class TranslationPipelineTestCase(unittest.TestCase):
+    def setUp(self):
+        self.home = tempfile.mkdtemp(prefix="po_translator_home_")
+        self.env_patcher = mock.patch.dict(os.environ, {"HOME": self.home})
+        self.env_patcher.start()
+        self.detect_patchers = [
+            mock.patch("po_translator.translator.detect_language", return_value="en"),
+            mock.patch("po_translator.translator.is_french_text", return_value=False),
+            mock.patch(
+                "po_translator.translator.detect_languages",
+                side_effect=lambda texts, **_kwargs: [("en", 1.0)] * len(texts),
+            ),
+        ]
+        for patcher in self.detect_patchers:
+            patcher.start()
+
+        self.translator = Translator()
+        self.translator.rate_limit = 0
+        self.translator.model = FakeModel()
+
+    def tearDown(self):
+        for patcher in self.detect_patchers:
+            patcher.stop()
+        self.env_patcher.stop()
+        shutil.rmtree(self.home, ignore_errors=True)
+
+    def _indexer(self, modules):
+        indexer = ModuleIndexer()
+        for module, msgids in modules.items():
+            for msgid in msgids:
+                indexer.index_entry(msgid, f"addons/{module}/i18n/fr.po")
+        return indexer
+
+    def test_batch_translate_groups_entries_by_module(self):
+        entries = [make_entry(text) for text in ("Order", "Invoice", "Picking", "Route")]
+        indexer = self._indexer({"sale": ["Order", "Invoice"], "stock": ["Picking", "Route"]})
+
+        results = self.translator.batch_translate(entries, indexer=indexer)
+
+        self.assertEqual(results["translated"], 4)
+        self.assertEqual(len(self.translator.model.prompts), 2)
+        self.assertIn("Odoo module: sale", self.translator.model.prompts[0])
+        self.assertIn("Odoo module: stock", self.translator.model.prompts[1])
+        self.assertEqual([e.msgstr for e in entries], ["FR Order", "FR Invoice", "FR Picking", "FR Route"])
+
+    def test_group_by_module_matches_raw_and_cleaned_msgids(self):
+        indexer = self._indexer({"sale": [" Order "], "stock": ["Picking"]})
+        indexer.index_entry("Route", "custom/fr.po")
+        entries = [make_entry(text) for text in ("Order", "Picking ", "Route", "Unindexed")]
+
+        groups = indexer.group_by_module(entries)
+
+        self.assertEqual([(module, [entry.msgid for entry in group]) for module, group in groups], [
+            ("sale", ["Order"]), ("stock", ["Picking "]), ("unknown", ["Route", "Unindexed"]),
+        ])
+
+    def test_context_independent_strings_share_cache_across_modules(self):
+        self.translator.auto_translate_entry(make_entry("Customer"), module="sale")
+        entry = make_entry("Customer")
+        self.translator.auto_translate_entry(entry, module="account")
+
+        self.assertEqual(entry.msgstr, "FR Customer")
+        self.assertEqual(len(self.translator.model.prompts), 1)
+        self.assertEqual(self.translator.stats["cache_hits"], 1)
+
+    def test_msgctxt_keeps_cache_entries_separate(self):
+        self.translator.auto_translate_entry(make_entry("Open"), module="sale")
+        self.translator.auto_translate_entry(make_entry("Open", msgctxt="state"), module="sale")
+
+        self.assertEqual(len(self.translator.model.prompts), 2)
+
+    def test_legacy_module_cache_keys_are_reused(self):
+        self.translator.cache.set("Quotation", "Devis", "en→fr|Odoo module: sale")
+        entry = make_entry("Quotation")
+
+        self.translator.auto_translate_entry(entry, module="sale")
+
+        self.assertEqual(entry.msgstr, "Devis")
+        self.assertEqual(self.translator.model.prompts, [])
+
+    def test_compiled_catalog_answers_cache_misses(self):
+        memory = os.path.join(self.home, "fr.mo")
+        write_mo([
+            SimpleNamespace(msgid="Quotation", msgstr="Devis", msgctxt=None, msgid_plural="",
+                            translated=lambda: True),
+            SimpleNamespace(msgid="Open", msgstr="Ouvert", msgctxt="state", msgid_plural="",
+                            translated=lambda: True),
+        ], memory, {"Language": "fr_FR", "Content-Type": "text/plain; charset=UTF-8"})
+        self.assertEqual(self.translator.add_translation_memory(memory), "fr")
+
+        quotation, state, other = make_entry("Quotation"), make_entry("Open", msgctxt="state"), make_entry("Open")
+        for entry in (quotation, state, other):
+            self.translator.auto_translate_entry(entry, module="sale")
+
+        self.assertEqual((quotation.msgstr, state.msgstr, other.msgstr), ("Devis", "Ouvert", "FR Open"))
+        self.assertEqual(len(self.translator.model.prompts), 1)
+        self.assertEqual((self.translator.stats["memory_hits"], self.translator.stats["cache_hits"]), (2, 0))
+        results = list(self.translator.iter_translate([make_entry("Quotation"), make_entry("Open")]))
+        self.assertEqual([result.source for result in results], [SOURCE_MEMORY, SOURCE_CACHE])
+        # Read-only: nothing copied into the JSON cache
+        self.assertIsNone(self.translator.cache.get("Quotation", "en→fr|"))
+
+    def test_invalid_batch_answer_falls_back_to_single_requests(self):
+        self.translator.model.generate_content = mock.Mock(side_effect=[
+            SimpleNamespace(text="not json"),
+            SimpleNamespace(text="Bonjour"),
+            SimpleNamespace(text="Au revoir"),
+        ])
+
+        results = self.translator.translate_batch(["Hello", "Goodbye"], "en", "fr", context="base")
+
+        self.assertEqual(results, {"Hello": "Bonjour", "Goodbye": "Au revoir"})
+
+    def test_iter_translate_streams_per_entry_results(self):
+        self.translator.cache.set("Invoice", "Facture", "en→fr|")
+        entries = [make_entry("Invoice"), make_entry("Order"), make_entry("Done", msgstr="Fait")]
+
+        results = list(self.translator.iter_translate(entries))
+
+        by_msgid = {result.entry.msgid: result for result in results}
+        self.assertEqual(len(results), 3)
+        self.assertEqual(by_msgid["Done"].status, "skipped")
+        self.assertEqual(by_msgid["Invoice"].source, SOURCE_CACHE)
+        self.assertEqual(by_msgid["Order"].source, SOURCE_API)
+        self.assertEqual(by_msgid["Order"].translation, "FR Order")
+        self.assertGreaterEqual(by_msgid["Order"].latency, 0.0)
+        self.assertEqual(by_msgid["Order"].to_dict()["status"], "translated")
+
+    def test_iter_translate_with_workers_covers_every_entry(self):
+        self.translator.batch_size = 2
+        entries = [make_entry(f"Label {i}") for i in range(9)]
+
+        results = list(self.translator.iter_translate(entries, max_workers=3))
+
+        self.assertEqual(sorted(r.entry.msgid for r in results), sorted(e.msgid for e in entries))
+        self.assertTrue(all(r.status == "translated" for r in results))
+        self.assertEqual(self.translator.stats["batch_calls"], 4)
+
+    def test_journal_resumes_interrupted_job(self):
+        entries = [make_entry(f"Label {i}") for i in range(5)]
+        journal = TranslationJournal.for_job(["addons/sale/i18n/fr.po"], "en", "fr")
+        journal.start(entries, source="en", target="fr")
+        self.translator.batch_size = 1
+
+        for done, _result in enumerate(self.translator.iter_translate(entries, journal=journal), start=1):
+            if done == 2:
+                break  # simulated crash
+        journal.close()
+
+        reloaded = [make_entry(f"Label {i}") for i in range(5)]
+        journal = TranslationJournal.for_job(["addons/sale/i18n/fr.po"], "en", "fr")
+        self.assertTrue(journal.is_resumable())
+        restored, remaining = journal.resume(reloaded)
+
+        self.assertEqual(restored, 2)
+        self.assertEqual([e.msgstr for e in reloaded[:2]], ["FR Label 0", "FR Label 1"])
+        self.assertEqual([e.msgid for e in remaining], ["Label 2", "Label 3", "Label 4"])
+
+        list(self.translator.iter_translate(remaining, journal=journal))
+        journal.complete()
+        self.assertFalse(journal.is_resumable())
+
+    def test_api_failures_stay_pending_in_journal(self):
+        entries = [make_entry(f"Label {i}") for i in range(3)]
+        journal = TranslationJournal.for_job(["addons/sale/i18n/fr.po"], "en", "fr")
+        journal.start(entries, source="en", target="fr")
+        self.translator.model.generate_content = mock.Mock(side_effect=ConnectionError("network unreachable"))
+
+        with mock.patch("po_translator.translator.time.sleep"):
+            results = list(self.translator.iter_translate(entries, journal=journal))
+        journal.close()
+
+        self.assertEqual([r.status for r in results], ["failed"] * 3)
+        self.assertTrue(all("network unreachable" in r.error for r in results))
+        self.assertEqual([e.msgstr for e in entries], [""] * 3)
+
+        restored, remaining = journal.resume(entries)
+        self.assertEqual((restored, remaining), (0, entries))
+
+    def test_journal_ignores_truncated_last_line(self):
+        journal = TranslationJournal.for_job(["a.po"], "en", "fr")
+        entry = make_entry("Order")
+        journal.start([entry])
+        journal.close()
+        with open(journal.path, "a", encoding="utf-8") as f:
+            f.write('{"event": "entry", "msgid": "Ord')
+
+        restored, remaining = journal.resume([entry])
+
+        self.assertEqual((restored, remaining), (0, [entry]))
+
+    def test_usage_is_aggregated_per_module_and_language_pair(self):
+        entries = [make_entry(text) for text in ("Order", "Invoice", "Picking")]
+        indexer = self._indexer({"sale": ["Order", "Invoice"], "stock": ["Picking"]})
+
+        self.translator.batch_translate(entries, indexer=indexer)
+        report = self.translator.usage.report()
+
+        self.assertEqual(report["total"]["requests"], 2)
+        self.assertEqual(report["total"]["input_tokens"], 200)
+        self.assertEqual(report["total"]["output_tokens"], 20)
+        self.assertEqual(report["by_module"]["sale"]["requests"], 1)
+        self.assertEqual(report["by_module"]["stock"]["requests"], 1)
+        self.assertEqual(report["by_pair"]["en→fr"]["input_tokens"], 200)
+        self.assertEqual(self.translator.get_stats()["input_tokens"], 200)
+
+    def test_usage_is_estimated_without_metadata(self):
+        self.translator.model.generate_content = mock.Mock(return_value=SimpleNamespace(text="Bonjour"))
+
+        self.translator.translate("Hello", "en", "fr")
+        total = self.translator.usage.report()["total"]
+
+        prompt = self.translator.model.generate_content.call_args[0][0]
+        self.assertEqual(total["estimated_requests"], 1)
+        self.assertEqual(total["input_tokens"], estimate_tokens(prompt))
+        self.assertEqual(total["output_tokens"], estimate_tokens("Bonjour"))
+
+    def test_budget_cap_pauses_job_and_carries_over_on_resume(self):
+        entries = [make_entry(f"Label {i}") for i in range(5)]
+        journal = TranslationJournal.for_job(["a.po"], "en", "fr")
+        journal.start(entries)
+        self.translator.batch_size = 1
+        self.translator.budget = TokenBudget(max_tokens=220)
+
+        results = list(self.translator.iter_translate(entries, journal=journal))
+        journal.close()
+
+        self.assertTrue(self.translator.budget_paused)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(journal.read()["usage"]["input_tokens"], 200)
+        self.assertTrue(journal.is_resumable())
+
+        # Usage recorded before the pause still counts after a restart
+        restarted = Translator()
+        restarted.rate_limit = 0
+        restarted.model = FakeModel()
+        restarted.batch_size = 1
+        restarted.budget = TokenBudget(max_tokens=330)
+        _restored, remaining = journal.resume(entries)
+        results = list(restarted.iter_translate(remaining, journal=journal))
+
+        self.assertEqual(len(results), 1)
+        self.assertTrue(restarted.budget_paused)
+
+    def test_estimate_counts_unique_uncached_texts(self):
+        self.translator.cache.set("Invoice", "Facture", "en→fr|")
+        entries = [make_entry("Invoice"), make_entry("Order"), make_entry("Order"),
+                   make_entry("Route"), make_entry("Done", msgstr="Fait")]
+
+        estimate = self.translator.estimate_job(entries)
+
+        self.assertEqual(estimate["unique"], 3)
+        self.assertEqual(estimate["cached"], 1)
+        self.assertEqual(estimate["requests"], 1)
+        self.assertGreater(estimate["input_tokens"], 0)
+        self.assertGreater(estimate["cost"], 0)
+        self.assertGreater(estimate["seconds"], 0)
+        self.assertEqual(self.translator.model.prompts, [])
+
+    def test_cancel_stops_dispatch_sequentially(self):
+        self.translator.batch_size = 1
+        entries = [make_entry(f"Label {i}") for i in range(5)]
+        cancel = CancelToken()
+
+        results = []
+        for result in self.translator.iter_translate(entries, cancel=cancel):
+            results.append(result)
+            cancel.cancel()
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(len(self.translator.model.prompts), 1)
+        self.assertEqual([e.msgstr for e in entries[1:]], [""] * 4)
+
+    def test_cancel_with_workers_returns_consistent_partial_result(self):
+        model = self.translator.model
+        answer = model.generate_content
+
+        def slow_answer(prompt, **kwargs):
+            time.sleep(0.01)
+            return answer(prompt, **kwargs)
+
+        model.generate_content = slow_answer
+        self.translator.batch_size = 1
+        entries = [make_entry(f"Label {i}") for i in range(40)]
+        cancel = CancelToken()
+
+        results = []
+        for result in self.translator.iter_translate(entries, max_workers=2, cancel=cancel):
+            results.append(result)
+            cancel.cancel()
+        time.sleep(0.05)  # let in-flight requests finish
+
+        # Only a bounded number of batches were ever dispatched
+        self.assertLessEqual(len(model.prompts), 6)
+        # Every translated entry was reported; the others were left untouched
+        reported = {id(r.entry) for r in results if r.status == "translated"}
+        changed = {id(e) for e in entries if e.msgstr}
+        self.assertEqual(reported, changed)
+        self.assertLess(len(results), len(entries))
+
+    def test_cancel_skips_api_calls_of_queued_batches(self):
+        model = self.translator.model
+        answer = model.generate_content
+        cancel = CancelToken()
+
+        def cancelling_answer(prompt, **kwargs):
+            time.sleep(0.02)  # the job is now waiting on its queued batches
+            cancel.cancel()
+            return answer(prompt, **kwargs)
+
+        model.generate_content = cancelling_answer
+        self.translator.batch_size = 1
+        entries = [make_entry(f"Label {i}") for i in range(10)]
+
+        list(self.translator.iter_translate(entries, max_workers=2, cancel=cancel))
+        time.sleep(0.1)  # let in-flight requests finish
+
+        # Only the batches already in flight when the job was cancelled asked the API
+        self.assertLessEqual(len(model.prompts), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()